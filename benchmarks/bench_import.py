@@ -0,0 +1,70 @@
+"""
+Startup cost of importing the data modules in a fresh interpreter.
+
+Each import runs in a new process, so module caches never carry over. The
+script reports the median wall time per module next to a bare interpreter
+start, and the number of root logging handlers the import left behind
+(which must be zero since imports no longer configure logging).
+
+Usage:
+    python -m benchmarks.bench_import --repeats 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules timed by default, from cheapest to most expensive
+MODULES = (
+    "src.utils.log_config",
+    "src.data_understanding",
+    "src.data_understanding.schema",
+    "src.data_understanding.data_collection",
+    "src.data_understanding.batch_conversion",
+)
+
+_PROBE = (
+    "import logging, sys; __import__(sys.argv[1]); "
+    "print(len(logging.getLogger().handlers))"
+)
+
+
+def measure(module: str, repeats: int) -> dict:
+    """Time ``import module`` in ``repeats`` fresh interpreters."""
+    timings, handlers = [], 0
+    for _ in range(repeats):
+        command = [sys.executable, "-c", _PROBE, module]
+        if not module:
+            command = [sys.executable, "-c", "print(0)"]
+        start = time.perf_counter()
+        output = subprocess.run(command, capture_output=True, text=True, check=True)
+        timings.append(time.perf_counter() - start)
+        handlers = int(output.stdout.strip())
+    return {
+        "module": module or "(interpreter)",
+        "seconds": statistics.median(timings),
+        "root_handlers": handlers,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", default=list(MODULES))
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    baseline = measure("", args.repeats)
+    print(f"{baseline['module']:<42} {baseline['seconds'] * 1000:8.1f} ms")
+    for module in args.modules:
+        result = measure(module, args.repeats)
+        extra = (result["seconds"] - baseline["seconds"]) * 1000
+        print(
+            f"{result['module']:<42} {result['seconds'] * 1000:8.1f} ms "
+            f"(+{extra:.1f} ms, {result['root_handlers']} root handlers)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Benchmark the CSV to Parquet ingestion path and track regressions.
+
+Synthetic Porto Seguro-shaped CSVs (59 columns with -1 sentinels) are
+generated at each requested size. For every size the conversion and the read
+back of the Parquet output are measured in a fresh process, recording wall
+time, peak RSS, rows/s and file sizes. Those processes are started by a
+launcher spawned before any data is generated: on Linux a child inherits its
+parent's peak RSS across fork and exec, so spawning them from this process
+would report the size of the generated data instead of the benchmark's own. Results are written as JSON and, when a
+baseline exists, compared against it; the exit status is 1 if any metric
+regressed past the threshold. The baseline lives at a tracked path
+(``benchmarks/baseline.json``) so every clone and CI run checks against it,
+while per-run outputs go to the git-ignored ``benchmarks/results/``.
+
+Usage:
+    python -m benchmarks.bench_ingestion --sizes 10000,100000,1000000
+    python -m benchmarks.bench_ingestion --save-baseline
+    python -m benchmarks.bench_ingestion --baseline other/baseline.json
+"""
+
+import argparse
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Union
+import polars as pl
+from benchmarks import regression, synthetic
+from src.utils import metrics
+
+# Benchmarks run for every dataset size
+BENCHMARKS = ("convert", "read")
+
+DEFAULT_SIZES = "10000,100000,1000000"
+DEFAULT_OUTPUT = "benchmarks/results/ingestion.json"
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+
+
+def _measure(benchmark: str, source: str, output: str) -> dict:
+    """Run one benchmark. Executed in a fresh process so peak RSS is its own."""
+    from src.data_understanding import data_collection
+
+    start = time.perf_counter()
+    if benchmark == "convert":
+        data_collection.convert_data(source, output, force=True)
+        rows = pl.scan_parquet(output).select(pl.len()).collect().item()
+    else:
+        rows = len(pl.read_parquet(output))
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "peak_rss_mb": metrics.peak_rss_mb(), "rows": rows}
+
+
+def _spawn_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn"))
+
+
+def _run_isolated(benchmark: str, source: str, output: str) -> dict:
+    """Run one benchmark in a fresh process. Executed in the launcher."""
+    with _spawn_pool() as pool:
+        return pool.submit(_measure, benchmark, source, output).result()
+
+
+def start_launcher() -> tuple[ProcessPoolExecutor, float]:
+    """
+    Start the low-RSS process that spawns the measured workers.
+
+    Returns:
+        tuple[ProcessPoolExecutor, float]: The launcher and its peak RSS in MB,
+            the floor every measured worker inherits.
+    """
+    launcher = _spawn_pool()
+    # Workers start lazily; submit now, before this process grows
+    return launcher, launcher.submit(metrics.peak_rss_mb).result()
+
+
+def run(
+    sizes: list[int],
+    data_dir: Path,
+    repeat: int = 3,
+    launcher: Union[ProcessPoolExecutor, None] = None,
+) -> list[dict]:
+    """
+    Measure every benchmark at every size.
+
+    Args:
+        sizes (list[int]): Number of rows of each synthetic dataset.
+        data_dir (Path): Directory where generated CSVs are kept and reused.
+        repeat (int): Repetitions per measurement; the fastest one is kept.
+        launcher (Union[ProcessPoolExecutor, None]): Process started by
+            ``start_launcher``; one is started here if None, which is only
+            accurate if this process has not yet generated any data.
+
+    Returns:
+        list[dict]: One entry per benchmark and size.
+    """
+    if launcher is None:
+        launcher, _ = start_launcher()
+    results = []
+    for n_rows in sizes:
+        source = data_dir / f"porto_seguro_{n_rows}.csv"
+        if not source.exists():
+            synthetic.write_csv(source, n_rows)
+        output = data_dir / f"porto_seguro_{n_rows}.parquet"
+        for benchmark in BENCHMARKS:
+            runs = [
+                launcher.submit(
+                    _run_isolated, benchmark, str(source), str(output)
+                ).result()
+                for _ in range(repeat)
+            ]
+            best = min(runs, key=lambda measurement: measurement["seconds"])
+            result = {
+                "benchmark": benchmark,
+                "rows": n_rows,
+                "seconds": best["seconds"],
+                "peak_rss_mb": max(measurement["peak_rss_mb"] for measurement in runs),
+                "rows_per_second": best["rows"] / best["seconds"],
+                "input_mb": source.stat().st_size / 1_000_000,
+                "output_mb": output.stat().st_size / 1_000_000,
+            }
+            results.append(result)
+            print(
+                f"{benchmark:>8} {n_rows:>10,} rows: {result['seconds']:.3f}s, "
+                f"{result['rows_per_second']:,.0f} rows/s, "
+                f"peak RSS {result['peak_rss_mb']:.0f} MB, "
+                f"output {result['output_mb']:.1f} MB"
+            )
+    return results
+
+
+def _metadata() -> dict:
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "polars": pl.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", default=DEFAULT_SIZES, help="Comma-separated row counts."
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--data-dir", default=None, help="Where to keep generated CSVs for reuse."
+    )
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument(
+        "--baseline",
+        default=DEFAULT_BASELINE,
+        help="Results to compare to; skipped if the file does not exist.",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        default=None,
+        help=f"Also write the results here (default {DEFAULT_BASELINE}).",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed relative regression, e.g. 0.2 for 20%%.",
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    launcher, launcher_rss_mb = start_launcher()
+    with launcher, tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = Path(args.data_dir or temp_dir)
+        data_dir.mkdir(parents=True, exist_ok=True)
+        results = run(sizes, data_dir, args.repeat, launcher)
+
+    metadata = {**_metadata(), "launcher_rss_mb": launcher_rss_mb}
+    regression.save(args.output, results, **metadata)
+    if args.save_baseline:
+        regression.save(args.save_baseline, results, **metadata)
+        return 0
+
+    if not Path(args.baseline).is_file():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create it")
+        return 0
+    regressions = regression.compare(
+        results, regression.load(args.baseline), args.threshold
+    )
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        return 1
+    print(f"No regression above {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Micro-benchmark of ElegantFormatter against its previous implementation.
+
+The previous formatter built a new logging.Formatter for every record,
+lower-cased the message for every keyword and prepended the emoji to
+``record.msg``. Records are created up front so that only formatting is timed.
+Like every logger call in this repo, messages are pre-rendered f-strings, so
+each record carries a distinct message.
+
+Usage:
+    python -m benchmarks.bench_log_formatter --records 200000
+"""
+
+import argparse
+import logging
+import time
+from src.data_understanding.data_collection import CUSTOM_EMOJIS
+from src.utils.log_config import ElegantFormatter
+
+
+class LegacyElegantFormatter(logging.Formatter):
+    """The formatter as it was before precompilation, kept for comparison."""
+
+    def __init__(
+        self, info_fmt="%(message)s", other_fmt=None, datefmt=None, emoji_map=None
+    ):
+        super().__init__(datefmt=datefmt)
+        self.info_fmt = info_fmt
+        self.other_fmt = (
+            other_fmt or "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        )
+        self.emoji_map = emoji_map or {}
+
+    def _get_emoji(self, message):
+        for keyword, emoji in self.emoji_map.items():
+            if keyword.lower() in message.lower():
+                return f"{emoji} "
+        return ""
+
+    def format(self, record):
+        if record.levelno == logging.INFO:
+            emoji = self._get_emoji(record.getMessage())
+            record.msg = emoji + record.msg
+            formatter = logging.Formatter(self.info_fmt, datefmt=self.datefmt)
+        else:
+            formatter = logging.Formatter(self.other_fmt, datefmt=self.datefmt)
+        return formatter.format(record)
+
+
+# Messages resembling per-batch progress logging
+MESSAGES = [
+    (lambda index: f"Processed batch {index} of policies_2024_01.csv", logging.INFO),
+    (
+        lambda index: f"Starting data convertion of batch {index} to parquet",
+        logging.INFO,
+    ),
+    (lambda index: f"Batch {index} completed in {index / 1000:.2f}s", logging.INFO),
+    (lambda index: f"Batch {index} has an unexpected value", logging.WARNING),
+]
+
+
+def _records(n_records: int) -> list[logging.LogRecord]:
+    records = []
+    for index in range(n_records):
+        message, level = MESSAGES[index % len(MESSAGES)]
+        records.append(
+            logging.LogRecord(
+                "bench", level, __file__, 0, message(index), None, exc_info=None
+            )
+        )
+    return records
+
+
+def measure(formatter: logging.Formatter, n_records: int) -> float:
+    """Return the records formatted per second."""
+    records = _records(n_records)
+    start = time.perf_counter()
+    for record in records:
+        formatter.format(record)
+    return n_records / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    before = measure(LegacyElegantFormatter(emoji_map=CUSTOM_EMOJIS), args.records)
+    after = measure(ElegantFormatter(emoji_map=CUSTOM_EMOJIS), args.records)
+    print(f"before: {before:>12,.0f} records/s")
+    print(f"after:  {after:>12,.0f} records/s ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Compare Parquet write settings for convert_data on synthetic Porto Seguro data.
+
+For each setting this reports the output size, the conversion time, the time
+to scan the whole file and the time of a filtered, projected scan
+(``target == 1`` on a few columns) that benefits from statistics and
+partition pruning.
+
+Usage:
+    python -m benchmarks.bench_parquet_options --rows 500000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+import polars as pl
+from benchmarks import synthetic
+from src.data_understanding import data_collection
+
+# Name and convert_data keyword arguments of each benchmarked setting
+SETTINGS = [
+    ("zstd (default)", {}),
+    ("zstd level 10", {"compression_level": 10}),
+    ("lz4", {"compression": "lz4"}),
+    ("snappy", {"compression": "snappy"}),
+    ("uncompressed", {"compression": "uncompressed"}),
+    ("row groups 50k", {"row_group_size": 50_000}),
+    ("no statistics", {"statistics": False}),
+    ("partition by target", {"partition_by": "target"}),
+    ("partition by ps_ind_05_cat", {"partition_by": "ps_ind_05_cat"}),
+]
+
+# Columns read by the filtered scan
+PROJECTION = ["id", "ps_car_13", "ps_reg_03", "ps_ind_05_cat"]
+
+
+def _size(path: Path) -> int:
+    if path.is_dir():
+        return sum(part.stat().st_size for part in path.rglob("*.parquet"))
+    return path.stat().st_size
+
+
+def _timed(function, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(n_rows: int, repeat: int = 3) -> pl.DataFrame:
+    """
+    Benchmark every setting on a freshly generated dataset.
+
+    Args:
+        n_rows (int): Number of synthetic rows.
+        repeat (int): Number of timed repetitions (the best one is kept).
+
+    Returns:
+        pl.DataFrame: One row per setting.
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        csv_path = synthetic.write_csv(temp_dir / "train.csv", n_rows)
+        for index, (name, options) in enumerate(SETTINGS):
+            output = temp_dir / f"setting_{index}.parquet"
+            convert_seconds = _timed(
+                lambda: data_collection.convert_data(
+                    csv_path, output, force=True, **options
+                ),
+                1,
+            )
+            full_scan = _timed(lambda: pl.scan_parquet(output).collect(), repeat)
+            filtered_scan = _timed(
+                lambda: pl.scan_parquet(output)
+                .filter(pl.col("target") == 1)
+                .select(PROJECTION)
+                .collect(),
+                repeat,
+            )
+            rows.append(
+                {
+                    "setting": name,
+                    "size_mb": _size(output) / 1_000_000,
+                    "convert_s": convert_seconds,
+                    "full_scan_s": full_scan,
+                    "filtered_scan_s": filtered_scan,
+                }
+            )
+        csv_mb = csv_path.stat().st_size / 1_000_000
+    print(f"Source CSV: {n_rows:,} rows, {csv_mb:.1f} MB")
+    return pl.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with pl.Config(tbl_rows=-1, float_precision=3, tbl_hide_dataframe_shape=True):
+        print(run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
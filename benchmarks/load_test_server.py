@@ -0,0 +1,88 @@
+"""
+Load test of the scoring server on localhost.
+
+Concurrent clients each keep one HTTP/1.1 connection open and post single
+synthetic records to ``/score``. The script reports throughput and the
+client-side p50/p99 latency, then prints the server's own ``/metrics``,
+including how many rows the micro-batcher predicted per model call.
+
+Start the server first, e.g.:
+    python -m src.serve --plan data/processed --model models/logistic.json
+
+Usage:
+    python -m benchmarks.load_test_server --clients 8 --requests 2000
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+import numpy as np
+from benchmarks import synthetic
+
+
+def make_records(n_records: int, seed: int) -> list[dict]:
+    """Synthetic raw test records with -1 for missing values."""
+    frame = synthetic.make_frame(n_records, seed=seed, include_target=False)
+    return frame.fill_null(-1).to_dicts()
+
+
+def run_client(
+    host: str, port: int, bodies: list[bytes], latencies: list, errors: list
+) -> None:
+    """Post every body in turn over one connection, recording latencies."""
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    for body in bodies:
+        start = time.perf_counter()
+        connection.request("POST", "/score", body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            errors.append(response.status)
+    connection.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    url = urlsplit(args.url)
+    records = make_records(args.requests, args.seed)
+    bodies = [json.dumps(record).encode("utf-8") for record in records]
+
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(
+            target=run_client,
+            args=(url.hostname, url.port, bodies[i :: args.clients], latencies, errors),
+        )
+        for i in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(
+        f"{len(latencies):,} requests from {args.clients} clients in {seconds:.2f}s "
+        f"({len(latencies) / seconds:,.0f} req/s), client p50 {p50:.2f} ms, "
+        f"p99 {p99:.2f} ms, {len(errors)} errors"
+    )
+    connection = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+    connection.request("GET", "/metrics")
+    print(f"server metrics: {connection.getresponse().read().decode('utf-8')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Comparison of benchmark results against a stored baseline."""
+
+import json
+from pathlib import Path
+from typing import Union
+
+# Metrics where a larger value is a regression
+LOWER_IS_BETTER = ("seconds", "peak_rss_mb", "output_mb")
+
+# Metrics where a smaller value is a regression
+HIGHER_IS_BETTER = ("rows_per_second",)
+
+
+def _key(result: dict) -> tuple:
+    return (result["benchmark"], result["rows"])
+
+
+def compare(
+    results: list[dict], baseline: list[dict], threshold: float = 0.2
+) -> list[str]:
+    """
+    Find metrics that regressed past a relative threshold.
+
+    Results are matched to the baseline on their ``benchmark`` name and
+    ``rows``; entries without a counterpart are ignored.
+
+    Args:
+        results (list[dict]): Current measurements.
+        baseline (list[dict]): Reference measurements.
+        threshold (float): Allowed relative change, e.g. 0.2 for 20%.
+
+    Returns:
+        list[str]: One human-readable line per regression, empty if none.
+    """
+    reference = {_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        previous = reference.get(_key(result))
+        if previous is None:
+            continue
+        label = f"{result['benchmark']} ({result['rows']:,} rows)"
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > threshold:
+                regressions.append(
+                    f"{label}: {metric} regressed by {change:.0%} ({old:.4g} -> {new:.4g})"
+                )
+    return regressions
+
+
+def load(path: Union[str, Path]) -> list[dict]:
+    """Read results written by ``save``."""
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)["results"]
+
+
+def save(path: Union[str, Path], results: list[dict], **metadata) -> None:
+    """Write results and run metadata as JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump({**metadata, "results": results}, handle, indent=2)
@@ -0,0 +1,157 @@
+"""Synthetic Porto Seguro-shaped data for benchmarks."""
+
+from pathlib import Path
+from typing import Union
+import numpy as np
+import polars as pl
+from src.data_understanding import schema
+
+# Number of levels of each categorical feature (ps_car_11_cat starts at 1)
+CATEGORY_LEVELS = {
+    "ps_ind_02_cat": 4,
+    "ps_ind_04_cat": 2,
+    "ps_ind_05_cat": 7,
+    "ps_car_01_cat": 12,
+    "ps_car_02_cat": 2,
+    "ps_car_03_cat": 2,
+    "ps_car_04_cat": 10,
+    "ps_car_05_cat": 2,
+    "ps_car_06_cat": 18,
+    "ps_car_07_cat": 2,
+    "ps_car_08_cat": 2,
+    "ps_car_09_cat": 5,
+    "ps_car_10_cat": 3,
+    "ps_car_11_cat": 104,
+}
+
+# Inclusive value range of each ordinal feature
+ORDINAL_RANGES = {
+    "ps_ind_01": (0, 7),
+    "ps_ind_03": (0, 11),
+    "ps_ind_14": (0, 4),
+    "ps_ind_15": (0, 13),
+    "ps_car_11": (0, 3),
+    "ps_calc_04": (0, 5),
+    "ps_calc_05": (0, 6),
+    "ps_calc_06": (0, 10),
+    "ps_calc_07": (0, 9),
+    "ps_calc_08": (2, 12),
+    "ps_calc_09": (0, 7),
+    "ps_calc_10": (0, 25),
+    "ps_calc_11": (0, 19),
+    "ps_calc_12": (0, 10),
+    "ps_calc_13": (0, 13),
+    "ps_calc_14": (0, 28),
+}
+
+# Value range and rounding step of each continuous feature
+CONTINUOUS_RANGES = {
+    "ps_reg_01": (0.0, 0.9, 0.1),
+    "ps_reg_02": (0.0, 1.8, 0.1),
+    "ps_reg_03": (0.06, 4.04, None),
+    "ps_car_12": (0.1, 1.26, None),
+    "ps_car_13": (0.25, 3.72, None),
+    "ps_car_14": (0.11, 0.64, None),
+    "ps_car_15": (0.0, 3.74, None),
+    "ps_calc_01": (0.0, 0.9, 0.1),
+    "ps_calc_02": (0.0, 0.9, 0.1),
+    "ps_calc_03": (0.0, 0.9, 0.1),
+}
+
+# Share of -1 sentinels in the columns that have missing values
+MISSING_RATES = {
+    "ps_ind_02_cat": 0.0004,
+    "ps_ind_04_cat": 0.0001,
+    "ps_ind_05_cat": 0.01,
+    "ps_reg_03": 0.18,
+    "ps_car_01_cat": 0.0002,
+    "ps_car_02_cat": 0.00001,
+    "ps_car_03_cat": 0.69,
+    "ps_car_05_cat": 0.45,
+    "ps_car_07_cat": 0.02,
+    "ps_car_09_cat": 0.001,
+    "ps_car_11": 0.00001,
+    "ps_car_12": 0.00001,
+    "ps_car_14": 0.07,
+}
+
+# Share of positive labels in the competition train set
+POSITIVE_RATE = 0.0364
+
+
+def make_frame(
+    n_rows: int, seed: int = 0, include_target: bool = True, id_offset: int = 0
+) -> pl.DataFrame:
+    """
+    Generate a frame with the Porto Seguro layout and value domains.
+
+    Args:
+        n_rows (int): Number of rows.
+        seed (int): Random seed.
+        include_target (bool): Whether to add the label column.
+        id_offset (int): First policy id.
+
+    Returns:
+        pl.DataFrame: Frame whose columns follow ``schema.expected_columns``.
+    """
+    rng = np.random.default_rng(seed)
+    data = {schema.ID_COLUMN: np.arange(id_offset, id_offset + n_rows)}
+    if include_target:
+        data[schema.TARGET_COLUMN] = (rng.random(n_rows) < POSITIVE_RATE).astype(
+            np.int8
+        )
+
+    for name in schema.FEATURE_COLUMNS:
+        family = schema.column_family(name)
+        if family == "bin":
+            values = rng.integers(0, 2, n_rows)
+        elif family == "cat":
+            levels = CATEGORY_LEVELS[name]
+            start = 1 if name == "ps_car_11_cat" else 0
+            values = rng.integers(start, start + levels, n_rows)
+        elif family == "ordinal":
+            low, high = ORDINAL_RANGES[name]
+            values = rng.integers(low, high + 1, n_rows)
+        else:
+            low, high, step = CONTINUOUS_RANGES[name]
+            values = rng.uniform(low, high, n_rows)
+            values = np.round(values / step) * step if step else values
+            values = np.round(values, 6)
+
+        rate = MISSING_RATES.get(name)
+        if rate:
+            values = np.where(rng.random(n_rows) < rate, -1, values)
+        data[name] = values
+
+    return pl.DataFrame(data)
+
+
+def write_csv(
+    path: Union[str, Path],
+    n_rows: int,
+    seed: int = 0,
+    include_target: bool = True,
+    chunk_rows: int = 500_000,
+) -> Path:
+    """
+    Write a synthetic Porto Seguro CSV in chunks so that large sizes fit in memory.
+
+    Args:
+        path (Union[str, Path]): Destination CSV file.
+        n_rows (int): Number of rows.
+        seed (int): Random seed.
+        include_target (bool): Whether to add the label column.
+        chunk_rows (int): Rows generated per chunk.
+
+    Returns:
+        Path: The written file.
+    """
+    path = Path(path)
+    with open(path, "wb") as handle:
+        for index, start in enumerate(range(0, n_rows, chunk_rows)):
+            size = min(chunk_rows, n_rows - start)
+            frame = make_frame(
+                size, seed=seed + index, include_target=include_target, id_offset=start
+            )
+            frame.write_csv(handle, include_header=index == 0)
+    return path
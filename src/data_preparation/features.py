@@ -0,0 +1,361 @@
+import logging
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Union
+import polars as pl
+from src.data_preparation import target_encoding
+from src.data_understanding import schema
+from src.utils import file_cache, metrics
+
+logger = logging.getLogger(__name__)
+
+# Supported encodings of the categorical columns
+ENCODINGS = ("onehot", "target")
+
+# Name of the fitted plan written next to the processed files
+PLAN_FILE = "features.json"
+
+# Engineered columns added to every split
+MISSING_COUNT_COLUMN = "missing_count"
+IND_BIN_SUM_COLUMN = "ps_ind_bin_sum"
+
+
+@dataclass(frozen=True)
+class FeaturePlan:
+    """
+    Everything learned from the train split that the feature stage needs.
+
+    The same plan is applied to train and test, so both get the same columns
+    in the same order with the same encodings.
+    """
+
+    encoding: str
+    drop_calc: bool
+    feature_columns: list[str]
+    levels: dict[str, list[int]] = field(default_factory=dict)
+    encodings: dict[str, dict[int, float]] = field(default_factory=dict)
+    prior: Union[float, None] = None
+    smoothing: float = 20.0
+    noise: float = 0.0
+    n_folds: int = 5
+    seed: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, document: dict) -> "FeaturePlan":
+        # JSON object keys are strings; category levels are integers
+        encodings = {
+            name: {int(level): value for level, value in mapping.items()}
+            for name, mapping in document.get("encodings", {}).items()
+        }
+        return cls(**{**document, "encodings": encodings})
+
+
+def _scan(source: Union[str, Path, pl.LazyFrame]) -> pl.LazyFrame:
+    return source if isinstance(source, pl.LazyFrame) else pl.scan_parquet(source)
+
+
+def _input_columns(columns: Iterable[str], drop_calc: bool) -> list[str]:
+    """Porto Seguro feature columns of a file, without ``ps_calc_*`` if dropped."""
+    return [
+        name
+        for name in columns
+        if schema.column_family(name) not in (None, "id", "target")
+        and not (drop_calc and name.startswith("ps_calc_"))
+    ]
+
+
+def fit(
+    source: Union[str, Path, pl.LazyFrame],
+    encoding: str = "onehot",
+    drop_calc: bool = True,
+    smoothing: float = 20.0,
+    noise: float = 0.0,
+    n_folds: int = 5,
+    seed: int = 0,
+    fold_stats: Union[target_encoding.FoldStatistics, None] = None,
+) -> FeaturePlan:
+    """
+    Learn the feature plan from the train split in one streaming pass.
+
+    Args:
+        source (Union[str, Path, pl.LazyFrame]): Interim train Parquet file or
+            an existing LazyFrame.
+        encoding (str): "onehot" to add one indicator per category level seen
+            in train, or "target" to replace each categorical column by the
+            smoothed positive rate of its level.
+        drop_calc (bool): Whether to leave out the ``ps_calc_*`` block.
+        smoothing (float): Weight of the prior in the target encoding; levels
+            seen fewer times are pulled harder towards the overall rate.
+        noise (float): Relative noise of the out-of-fold train encodings.
+        n_folds (int): Number of folds of the out-of-fold train encodings.
+        seed (int): Seed of the fold assignment.
+        fold_stats (Union[target_encoding.FoldStatistics, None]): Statistics
+            already fitted on the source, e.g. loaded from the cache.
+
+    Returns:
+        FeaturePlan: Fitted plan.
+
+    Raises:
+        ValueError: If the encoding is unknown or target encoding is requested
+            on a frame without the target column.
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Encoding must be one of {ENCODINGS}, got: {encoding}")
+    lf = _scan(source)
+    columns = _input_columns(lf.collect_schema().names(), drop_calc)
+    categorical = schema.columns_by_family(columns, "cat")
+    if encoding == "target" and schema.TARGET_COLUMN not in lf.collect_schema():
+        raise ValueError("Target encoding needs the target column")
+
+    levels, encodings, prior = {}, {}, None
+    if encoding == "onehot":
+        seen = (
+            lf.select(target_encoding.category_levels(categorical))
+            .unpivot(variable_name="column", value_name="level")
+            .unique()
+            .collect(engine="streaming")
+        )
+        for name in categorical:
+            rows = seen.filter(pl.col("column") == name).sort("level")
+            levels[name] = rows["level"].to_list()
+    elif not categorical:
+        prior = lf.select(pl.col(schema.TARGET_COLUMN).mean()).collect().item()
+    else:
+        if fold_stats is None:
+            fold_stats = target_encoding.fit(lf, categorical, n_folds, seed)
+        encodings, prior = target_encoding.encodings(fold_stats, smoothing)
+        encodings = {name: encodings[name] for name in categorical}
+        n_folds, seed = fold_stats.n_folds, fold_stats.seed
+
+    plan = FeaturePlan(
+        encoding=encoding,
+        drop_calc=drop_calc,
+        feature_columns=columns,
+        levels=levels,
+        encodings=encodings,
+        prior=prior,
+        smoothing=smoothing,
+        noise=noise,
+        n_folds=n_folds,
+        seed=seed,
+    )
+    logger.info(
+        f"Fitted {encoding} features on {len(columns)} columns "
+        f"({len(categorical)} categorical)"
+    )
+    return plan
+
+
+def _is_missing(name: str) -> pl.Expr:
+    """Null, or the -1 sentinel in files converted with ``sentinel_to_null=False``."""
+    if schema.column_family(name) == "bin":
+        return pl.col(name).is_null()
+    return pl.col(name).is_null() | (pl.col(name) == schema.MISSING_SENTINEL)
+
+
+def feature_expressions(
+    plan: FeaturePlan,
+    columns: Iterable[str],
+    fold_stats: Union[target_encoding.FoldStatistics, None] = None,
+) -> list[pl.Expr]:
+    """
+    Build the output columns of a split according to a fitted plan.
+
+    Args:
+        plan (FeaturePlan): Plan returned by ``fit``.
+        columns (Iterable[str]): Columns of the split; the id and target are
+            passed through when present.
+        fold_stats (Union[target_encoding.FoldStatistics, None]): Statistics
+            of this split for out-of-fold target encoding. Only pass them for
+            the split the plan was fitted on.
+
+    Returns:
+        list[pl.Expr]: Expressions in output order.
+    """
+    columns = list(columns)
+    features = plan.feature_columns
+    missing = [_is_missing(name).cast(pl.Int8) for name in features]
+    ind_bins = [
+        pl.col(name).cast(pl.Int8)
+        for name in schema.columns_by_family(features, "bin")
+        if name.startswith("ps_ind_")
+    ]
+
+    expressions = [
+        pl.col(name)
+        for name in (schema.ID_COLUMN, schema.TARGET_COLUMN)
+        if name in columns
+    ]
+    out_of_fold = {}
+    if plan.encoding == "target" and fold_stats is not None:
+        categorical = schema.columns_by_family(features, "cat")
+        out_of_fold = dict(
+            zip(
+                categorical,
+                target_encoding.out_of_fold_expressions(
+                    fold_stats, plan.smoothing, plan.noise, categorical
+                ),
+            )
+        )
+    for name in features:
+        family = schema.column_family(name)
+        if family != "cat":
+            expressions.append(pl.col(name))
+            continue
+        level = pl.col(name).fill_null(schema.MISSING_SENTINEL)
+        if plan.encoding == "onehot":
+            expressions.extend(
+                (level == value).alias(f"{name}_{value}".replace("-", "m"))
+                for value in plan.levels[name]
+            )
+        elif name in out_of_fold:
+            expressions.append(out_of_fold[name])
+        else:
+            mapping = plan.encodings[name]
+            expressions.append(
+                level.replace_strict(
+                    list(mapping),
+                    list(mapping.values()),
+                    default=plan.prior,
+                    return_dtype=pl.Float32,
+                ).alias(f"{name}_te")
+            )
+    expressions.append(
+        pl.sum_horizontal(missing).cast(pl.Int8).alias(MISSING_COUNT_COLUMN)
+    )
+    if ind_bins:
+        expressions.append(
+            pl.sum_horizontal(ind_bins).cast(pl.Int8).alias(IND_BIN_SUM_COLUMN)
+        )
+    return expressions
+
+
+def transform(
+    source: Union[str, Path, pl.LazyFrame],
+    plan: FeaturePlan,
+    fold_stats: Union[target_encoding.FoldStatistics, None] = None,
+) -> pl.LazyFrame:
+    """
+    Apply a fitted plan to a split as a lazy query.
+
+    Args:
+        source (Union[str, Path, pl.LazyFrame]): Interim Parquet file or an
+            existing LazyFrame.
+        plan (FeaturePlan): Plan returned by ``fit``.
+        fold_stats (Union[target_encoding.FoldStatistics, None]): Statistics
+            of the train split, to target-encode it out of fold.
+
+    Returns:
+        pl.LazyFrame: Features of the split.
+
+    Raises:
+        ValueError: If a feature column of the plan is missing from the split.
+    """
+    lf = _scan(source)
+    columns = lf.collect_schema().names()
+    missing = [name for name in plan.feature_columns if name not in columns]
+    if missing:
+        raise ValueError(f"Missing feature columns: {missing}")
+    return lf.select(feature_expressions(plan, columns, fold_stats))
+
+
+def build_features(
+    train_path: Union[str, Path],
+    output_dir: Union[str, Path],
+    test_paths: Iterable[Union[str, Path]] = (),
+    encoding: str = "onehot",
+    drop_calc: bool = True,
+    smoothing: float = 20.0,
+    noise: float = 0.0,
+    n_folds: int = 5,
+    seed: int = 0,
+    cache_dir: Union[str, Path, None] = None,
+) -> dict[str, Path]:
+    """
+    Fit the feature plan on train and stream every split to ``output_dir``.
+
+    Each split is written to ``<output_dir>/<stem>.parquet`` by a streaming
+    sink, so memory stays bounded whatever the file size. The fitted plan is
+    saved as ``features.json`` in the same directory. With target encoding the
+    train split is encoded out of fold, while the other splits use encodings
+    fitted on all of train; the fold statistics are cached in ``cache_dir``.
+
+    Args:
+        train_path (Union[str, Path]): Interim train Parquet file.
+        output_dir (Union[str, Path]): Directory for processed files.
+        test_paths (Iterable[Union[str, Path]]): Other interim splits to
+            transform with the train plan.
+        encoding (str): "onehot" or "target".
+        drop_calc (bool): Whether to leave out the ``ps_calc_*`` block.
+        smoothing (float): Prior weight of the target encoding.
+        noise (float): Relative noise of the out-of-fold train encodings.
+        n_folds (int): Number of folds of the out-of-fold train encodings.
+        seed (int): Seed of the fold assignment.
+        cache_dir (Union[str, Path, None]): Directory of cached target
+            statistics. Defaults to ``output_dir``.
+
+    Returns:
+        dict[str, Path]: Output file per split stem.
+
+    Raises:
+        FileNotFoundError: If an input file does not exist.
+        ValueError: If the output directory does not exist.
+    """
+    output_dir = Path(output_dir)
+    if not output_dir.is_dir():
+        raise ValueError(f"Output directory does not exist: {output_dir}")
+    sources = [Path(train_path), *(Path(path) for path in test_paths)]
+    for source in sources:
+        if not source.is_file():
+            raise FileNotFoundError(f"Input file does not exist: {source}")
+
+    with metrics.stage("features.fit", source=sources[0].name):
+        fold_stats = None
+        if encoding == "target":
+            fold_stats = target_encoding.fit_file(
+                sources[0], cache_dir or output_dir, n_folds=n_folds, seed=seed
+            )
+        plan = fit(
+            sources[0],
+            encoding=encoding,
+            drop_calc=drop_calc,
+            smoothing=smoothing,
+            noise=noise,
+            fold_stats=fold_stats,
+        )
+    file_cache.write_json(output_dir / PLAN_FILE, plan.to_dict())
+
+    outputs = {}
+    for index, source in enumerate(sources):
+        output = output_dir / f"{source.stem}.parquet"
+        with metrics.stage("features.sink", source=source.name):
+            split_stats = fold_stats if index == 0 else None
+            transform(source, plan, split_stats).sink_parquet(output)
+        logger.info(f"Saving features of {source.name} to {output}")
+        outputs[source.stem] = output
+    return outputs
+
+
+def load_plan(path: Union[str, Path]) -> FeaturePlan:
+    """
+    Read a plan saved by ``build_features``.
+
+    Args:
+        path (Union[str, Path]): ``features.json`` file or its directory.
+
+    Returns:
+        FeaturePlan: The saved plan.
+
+    Raises:
+        FileNotFoundError: If no plan is found.
+    """
+    path = Path(path)
+    if path.is_dir():
+        path = path / PLAN_FILE
+    document = file_cache.read_json(path)
+    if document is None:
+        raise FileNotFoundError(f"Feature plan does not exist: {path}")
+    return FeaturePlan.from_dict(document)
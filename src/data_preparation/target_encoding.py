@@ -0,0 +1,324 @@
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Union
+import polars as pl
+from src.data_understanding import schema
+from src.utils import file_cache, hashing
+
+logger = logging.getLogger(__name__)
+
+# Column holding the fold of each train row
+FOLD_COLUMN = "fold"
+
+# Category levels are packed with their fold into one integer lookup key
+_FOLD_STRIDE = 1 << 16
+
+
+@dataclass(frozen=True, eq=False)
+class FoldStatistics:
+    """
+    Per-fold row and positive counts of every categorical level.
+
+    ``stats`` has the columns ``fold``, ``column``, ``level``, ``count`` and
+    ``positives``. The fold of a row is derived from its id, ``n_folds`` and
+    ``seed``, so the statistics can be matched to the rows again later.
+    """
+
+    stats: pl.DataFrame
+    n_folds: int
+    seed: int
+
+
+def category_levels(columns: Iterable[str]) -> list[pl.Expr]:
+    """Categorical columns with missing values folded into the -1 level."""
+    return [
+        pl.col(name).fill_null(schema.MISSING_SENTINEL).cast(pl.Int16)
+        for name in schema.columns_by_family(columns, "cat")
+    ]
+
+
+def fold_expression(n_folds: int = 5, seed: int = 0) -> pl.Expr:
+    """
+    Assign every row to a fold by hashing its id.
+
+    Args:
+        n_folds (int): Number of folds.
+        seed (int): Seed of the hash.
+
+    Returns:
+        pl.Expr: Int16 fold in ``[0, n_folds)``, aliased ``fold``.
+    """
+    return (
+        (hashing.row_hash(schema.ID_COLUMN, seed) % n_folds)
+        .cast(pl.Int16)
+        .alias(FOLD_COLUMN)
+    )
+
+
+def category_stats(
+    lf: pl.LazyFrame, columns: Iterable[str], by: Iterable[str] = ()
+) -> pl.LazyFrame:
+    """
+    Count rows and positives per level of every categorical column at once.
+
+    The categorical columns are unpivoted into (column, level) pairs so that a
+    single grouped aggregation covers all of them in one scan.
+
+    Args:
+        lf (pl.LazyFrame): Frame with the categorical columns and the target.
+        columns (Iterable[str]): Categorical columns to count.
+        by (Iterable[str]): Extra grouping columns, e.g. the fold.
+
+    Returns:
+        pl.LazyFrame: Columns ``*by``, ``column``, ``level``, ``count`` and
+            ``positives``.
+    """
+    by = list(by)
+    columns = list(columns)
+    return (
+        lf.select(*by, schema.TARGET_COLUMN, *category_levels(columns))
+        .unpivot(
+            index=[*by, schema.TARGET_COLUMN],
+            on=columns,
+            variable_name="column",
+            value_name="level",
+        )
+        .group_by(*by, "column", "level")
+        .agg(
+            count=pl.len(),
+            positives=pl.col(schema.TARGET_COLUMN).cast(pl.Int64).sum(),
+        )
+    )
+
+
+def fit(
+    source: Union[str, Path, pl.LazyFrame],
+    columns: Union[Iterable[str], None] = None,
+    n_folds: int = 5,
+    seed: int = 0,
+) -> FoldStatistics:
+    """
+    Count every level of every categorical column per fold in one grouped pass.
+
+    Args:
+        source (Union[str, Path, pl.LazyFrame]): Interim train Parquet file or
+            an existing LazyFrame with the id and target columns.
+        columns (Union[Iterable[str], None]): Categorical columns to encode.
+            Defaults to every ``_cat`` column of the source.
+        n_folds (int): Number of folds.
+        seed (int): Seed of the fold assignment.
+
+    Returns:
+        FoldStatistics: Per-fold counts.
+
+    Raises:
+        ValueError: If fewer than two folds are requested or the source has no
+            id or target column.
+    """
+    if n_folds < 2:
+        raise ValueError(f"At least two folds are needed, got: {n_folds}")
+    lf = source if isinstance(source, pl.LazyFrame) else pl.scan_parquet(source)
+    names = lf.collect_schema().names()
+    for required in (schema.ID_COLUMN, schema.TARGET_COLUMN):
+        if required not in names:
+            raise ValueError(f"Target encoding needs the {required} column")
+    columns = schema.columns_by_family(names if columns is None else columns, "cat")
+
+    stats = (
+        category_stats(
+            lf.with_columns(fold_expression(n_folds, seed)), columns, by=[FOLD_COLUMN]
+        )
+        .collect(engine="streaming")
+        .sort(FOLD_COLUMN, "column", "level")
+    )
+    return FoldStatistics(stats=stats, n_folds=n_folds, seed=seed)
+
+
+def fit_file(
+    path: Union[str, Path],
+    cache_dir: Union[str, Path, None] = None,
+    n_folds: int = 5,
+    seed: int = 0,
+) -> FoldStatistics:
+    """
+    Fit fold statistics of an interim file, reusing cached ones when possible.
+
+    Statistics of all categorical columns are cached as
+    ``<stem>-<content hash>-target-k<n_folds>-s<seed>.parquet`` in
+    ``cache_dir``, so refitting an unchanged train file, e.g. before scoring
+    the test split, costs a single small read.
+
+    Args:
+        path (Union[str, Path]): Interim train Parquet file.
+        cache_dir (Union[str, Path, None]): Directory for cached statistics, or
+            None to disable caching.
+        n_folds (int): Number of folds.
+        seed (int): Seed of the fold assignment.
+
+    Returns:
+        FoldStatistics: Per-fold counts.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    path = Path(path)
+    if not path.is_file():
+        raise FileNotFoundError(f"Input file does not exist: {path}")
+    if cache_dir is None:
+        return fit(path, n_folds=n_folds, seed=seed)
+
+    cached = Path(cache_dir) / (
+        f"{path.stem}-{file_cache.content_hash(path)}-target-k{n_folds}-s{seed}.parquet"
+    )
+    if cached.exists():
+        logger.info(f"Loading cached target statistics of {path.name}")
+        return FoldStatistics(pl.read_parquet(cached), n_folds=n_folds, seed=seed)
+
+    fold_stats = fit(path, n_folds=n_folds, seed=seed)
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    fold_stats.stats.write_parquet(cached)
+    return fold_stats
+
+
+def _smoothed(positives: pl.Expr, count: pl.Expr, prior: pl.Expr, smoothing: float):
+    """Blend the level's positive rate with the prior, weighted by its count."""
+    weight = count + smoothing
+    return (
+        pl.when(weight > 0)
+        .then((positives + prior * smoothing) / weight)
+        .otherwise(prior)
+    )
+
+
+def _fold_sizes(stats: pl.DataFrame) -> pl.DataFrame:
+    """Rows and positives per fold; every row is counted once per column."""
+    first = stats["column"].min()
+    return (
+        stats.filter(pl.col("column") == first)
+        .group_by(FOLD_COLUMN)
+        .agg(pl.col("count", "positives").sum())
+    )
+
+
+def encodings(
+    fold_stats: FoldStatistics, smoothing: float = 20.0
+) -> tuple[dict[str, dict[int, float]], float]:
+    """
+    Encode every level from all folds together, for splits without a target.
+
+    Args:
+        fold_stats (FoldStatistics): Statistics returned by ``fit``.
+        smoothing (float): Weight of the prior; levels seen fewer times are
+            pulled harder towards the overall positive rate.
+
+    Returns:
+        tuple[dict[str, dict[int, float]], float]: Encoded value per level of
+            each column, and the prior used for unseen levels.
+    """
+    sizes = _fold_sizes(fold_stats.stats)
+    prior = sizes["positives"].sum() / sizes["count"].sum()
+    totals = (
+        fold_stats.stats.group_by("column", "level")
+        .agg(pl.col("count", "positives").sum())
+        .with_columns(
+            encoded=_smoothed(
+                pl.col("positives"), pl.col("count"), pl.lit(prior), smoothing
+            )
+        )
+    )
+    result = {}
+    for (name,), rows in totals.sort("level").group_by("column", maintain_order=True):
+        result[name] = dict(zip(rows["level"], rows["encoded"]))
+    return result, prior
+
+
+def out_of_fold_table(
+    fold_stats: FoldStatistics, smoothing: float = 20.0
+) -> pl.DataFrame:
+    """
+    Derive the out-of-fold encoding of every (fold, column, level) by subtraction.
+
+    The statistics of fold ``k`` are subtracted from the totals, so each fold
+    is encoded from the other folds only without recounting them.
+
+    Args:
+        fold_stats (FoldStatistics): Statistics returned by ``fit``.
+        smoothing (float): Weight of the out-of-fold prior.
+
+    Returns:
+        pl.DataFrame: Columns ``fold``, ``column``, ``level`` and ``encoded``.
+    """
+    stats = fold_stats.stats
+    sizes = _fold_sizes(stats)
+    total_count, total_positives = sizes["count"].sum(), sizes["positives"].sum()
+    priors = sizes.select(
+        FOLD_COLUMN,
+        prior=(total_positives - pl.col("positives")) / (total_count - pl.col("count")),
+    )
+    totals = stats.group_by("column", "level").agg(
+        total_count=pl.col("count").sum(), total_positives=pl.col("positives").sum()
+    )
+    return (
+        stats.join(totals, on=["column", "level"])
+        .join(priors, on=FOLD_COLUMN)
+        .select(
+            FOLD_COLUMN,
+            "column",
+            "level",
+            encoded=_smoothed(
+                pl.col("total_positives") - pl.col("positives"),
+                pl.col("total_count") - pl.col("count"),
+                pl.col("prior"),
+                smoothing,
+            ),
+        )
+    )
+
+
+def out_of_fold_expressions(
+    fold_stats: FoldStatistics,
+    smoothing: float = 20.0,
+    noise: float = 0.0,
+    columns: Union[Iterable[str], None] = None,
+) -> list[pl.Expr]:
+    """
+    Build ``<column>_te`` expressions that encode train rows out of fold.
+
+    Each row's fold is recomputed from its id and looked up together with its
+    level in the out-of-fold table, so the expressions stream like any other
+    column. Optional multiplicative noise, uniform in ``[1 - noise, 1 + noise]``
+    and derived from the id, further blurs the encodings of rare levels.
+
+    Args:
+        fold_stats (FoldStatistics): Statistics returned by ``fit``.
+        smoothing (float): Weight of the out-of-fold prior.
+        noise (float): Relative noise amplitude; 0 disables it.
+        columns (Union[Iterable[str], None]): Columns to encode. Defaults to
+            every column of the statistics.
+
+    Returns:
+        list[pl.Expr]: One Float32 expression per column.
+    """
+    table = out_of_fold_table(fold_stats, smoothing).with_columns(
+        key=pl.col(FOLD_COLUMN).cast(pl.Int32) * _FOLD_STRIDE
+        + pl.col("level").cast(pl.Int32)
+    )
+    if columns is None:
+        columns = table["column"].unique().sort().to_list()
+    fold = fold_expression(fold_stats.n_folds, fold_stats.seed).cast(pl.Int32)
+
+    expressions = []
+    for index, name in enumerate(columns):
+        rows = table.filter(pl.col("column") == name)
+        level = pl.col(name).fill_null(schema.MISSING_SENTINEL).cast(pl.Int32)
+        encoded = (fold * _FOLD_STRIDE + level).replace_strict(
+            rows["key"], rows["encoded"], default=None, return_dtype=pl.Float64
+        )
+        if noise:
+            uniform = hashing.unit_interval(
+                hashing.row_hash(schema.ID_COLUMN, fold_stats.seed + 1 + index)
+            )
+            encoded = encoded * (1 + noise * (2 * uniform - 1))
+        expressions.append(encoded.cast(pl.Float32).alias(f"{name}_te"))
+    return expressions
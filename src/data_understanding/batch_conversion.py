@@ -0,0 +1,251 @@
+import glob
+import logging
+import os
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Iterable, Union
+import polars as pl
+from src.data_understanding import data_collection
+from src.utils import log_config
+
+logger = logging.getLogger(__name__)
+
+# Suffixes recognised as manifest files listing one CSV path per line
+MANIFEST_SUFFIXES = {".txt", ".lst", ".manifest"}
+
+
+@dataclass(frozen=True)
+class ConversionResult:
+    """Outcome of converting a single CSV file."""
+
+    source: Path
+    output: Path
+    rows: int
+    input_bytes: int
+    seconds: float
+    skipped: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        mb = self.input_bytes / 1_000_000
+        return mb / self.seconds if self.seconds > 0 else 0.0
+
+
+def resolve_sources(spec: Union[str, Path]) -> list[Path]:
+    """
+    Expand a source specification into a sorted list of CSV files.
+
+    Args:
+        spec (Union[str, Path]): A directory (all plain and compressed CSV
+            files inside it), a manifest file (``.txt``/``.lst``/``.manifest``,
+            one path per line, relative paths resolved against the manifest's
+            directory) or a glob pattern.
+
+    Returns:
+        list[Path]: Matching CSV files.
+
+    Raises:
+        FileNotFoundError: If the specification matches no file.
+    """
+    spec_path = Path(spec)
+    if spec_path.is_dir():
+        sources = sorted(
+            path for path in spec_path.iterdir() if data_collection.is_csv_path(path)
+        )
+    elif spec_path.is_file() and spec_path.suffix.lower() in MANIFEST_SUFFIXES:
+        sources = []
+        for line in spec_path.read_text().splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = Path(line)
+            if not path.is_absolute():
+                path = spec_path.parent / path
+            sources.append(path)
+    elif spec_path.is_file():
+        sources = [spec_path]
+    else:
+        sources = sorted(Path(match) for match in glob.glob(str(spec)))
+
+    if not sources:
+        raise FileNotFoundError(f"No CSV files found for: {spec}")
+    return sources
+
+
+def _convert_job(source: Path, output: Path, convert_kwargs: dict) -> ConversionResult:
+    """Convert one file and measure it. Runs inside a pool worker."""
+    start = time.perf_counter()
+    converted = data_collection.convert_data(source, output, **convert_kwargs)
+    seconds = time.perf_counter() - start
+    rows = pl.scan_parquet(output).select(pl.len()).collect().item()
+    return ConversionResult(
+        source=source,
+        output=output,
+        rows=rows,
+        input_bytes=source.stat().st_size,
+        seconds=seconds,
+        skipped=not converted,
+    )
+
+
+def _init_worker(polars_threads: int, log_queue) -> None:
+    """Size a spawned worker's Polars thread pool and forward its log records."""
+    # Polars reads the variable when its pool is first used, not on import
+    os.environ["POLARS_MAX_THREADS"] = str(polars_threads)
+    if log_queue is not None:
+        log_config.configure_worker_logging(log_queue)
+
+
+def _make_executor(executor: str, max_workers: int) -> Executor:
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if executor == "process":
+        # Each worker gets its share of the cores; the parent's environment
+        # is left alone. Records go to the parent when it logs asynchronously
+        threads = max(1, (os.cpu_count() or 1) // max_workers)
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(threads, log_config.worker_log_queue()),
+        )
+    raise ValueError(f"Executor must be 'thread' or 'process', got: {executor}")
+
+
+def convert_many(
+    sources: Iterable[Union[str, Path]],
+    output_dir: Union[str, Path],
+    max_workers: Union[int, None] = None,
+    executor: str = "thread",
+    memory_budget: Union[int, None] = None,
+    **convert_kwargs,
+) -> list[ConversionResult]:
+    """
+    Convert several CSV files to Parquet concurrently.
+
+    Each file is written to ``output_dir`` with the same stem and a
+    ``.parquet`` suffix (``policies.csv.gz`` becomes ``policies.parquet``).
+    Thread workers share the Polars thread pool, which is the right choice
+    for most runs since Polars releases the GIL. Process workers each get
+    ``cpu_count // max_workers`` Polars threads so that the pool does not
+    oversubscribe the cores.
+
+    Args:
+        sources (Iterable[Union[str, Path]]): CSV files to convert.
+        output_dir (Union[str, Path]): Directory for the Parquet files.
+        max_workers (Union[int, None]): Number of concurrent conversions.
+            Defaults to the number of CPUs.
+        executor (str): "thread" or "process".
+        memory_budget (Union[int, None]): Upper bound, in bytes, on the summed
+            decompressed size (see ``data_collection.estimate_size``) of the
+            files being converted at the same time. A file larger than the
+            budget still runs, but on its own.
+        **convert_kwargs: Extra keyword arguments passed to ``convert_data``.
+
+    Returns:
+        list[ConversionResult]: One result per source, in input order.
+
+    Raises:
+        ValueError: If ``output_dir`` does not exist, ``executor`` is unknown or
+            two sources share a stem and would overwrite each other's output.
+    """
+    output_dir = Path(output_dir)
+    if not output_dir.is_dir():
+        raise ValueError(f"Output directory does not exist: {output_dir}")
+
+    jobs = [Path(source) for source in sources]
+    outputs = [
+        output_dir / f"{data_collection.csv_stem(source)}.parquet" for source in jobs
+    ]
+    claimed: dict[Path, Path] = {}
+    for source, output in zip(jobs, outputs):
+        if output in claimed:
+            raise ValueError(
+                f"{claimed[output]} and {source} would both be written to {output}"
+            )
+        claimed[output] = source
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs) or 1))
+    # Compressed files take several times their size once decompressed
+    sizes = [
+        data_collection.estimate_size(source)
+        if memory_budget is not None and source.exists()
+        else 0
+        for source in jobs
+    ]
+
+    results: dict[int, ConversionResult] = {}
+    pending: dict[Future, tuple[int, int]] = {}
+    queue = list(enumerate(jobs))
+    in_flight_bytes = 0
+    start = time.perf_counter()
+    with _make_executor(executor, workers) as pool:
+        while queue or pending:
+            # Admit jobs while the pool has capacity and the budget allows it
+            while queue and len(pending) < workers:
+                index, source = queue[0]
+                size = sizes[index]
+                if (
+                    memory_budget is not None
+                    and pending
+                    and in_flight_bytes + size > memory_budget
+                ):
+                    break
+                queue.pop(0)
+                future = pool.submit(
+                    _convert_job, source, outputs[index], convert_kwargs
+                )
+                pending[future] = (index, size)
+                in_flight_bytes += size
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, size = pending.pop(future)
+                in_flight_bytes -= size
+                result = future.result()
+                results[index] = result
+                if result.skipped:
+                    continue
+                logger.info(
+                    f"Completed {result.source.name}: {result.rows:,} rows in "
+                    f"{result.seconds:.2f}s ({result.rows_per_second:,.0f} rows/s, "
+                    f"{result.mb_per_second:.1f} MB/s)"
+                )
+
+    ordered = [results[index] for index in range(len(jobs))]
+    log_summary(ordered, time.perf_counter() - start)
+    return ordered
+
+
+def log_summary(results: list[ConversionResult], seconds: float) -> None:
+    """
+    Log the aggregate throughput of a batch conversion.
+
+    Args:
+        results (list[ConversionResult]): Per-file results.
+        seconds (float): Wall-clock duration of the whole batch.
+    """
+    skipped = sum(result.skipped for result in results)
+    converted = [result for result in results if not result.skipped]
+    rows = sum(result.rows for result in converted)
+    mb = sum(result.input_bytes for result in converted) / 1_000_000
+    rows_per_second = rows / seconds if seconds > 0 else 0.0
+    mb_per_second = mb / seconds if seconds > 0 else 0.0
+    logger.info(
+        f"All files converted: {len(converted)} files, {rows:,} rows, {mb:.1f} MB "
+        f"in {seconds:.2f}s ({rows_per_second:,.0f} rows/s, {mb_per_second:.1f} MB/s), "
+        f"{skipped} up to date"
+    )
@@ -0,0 +1,234 @@
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Union
+import polars as pl
+from src.data_understanding import schema
+from src.utils import hashing
+
+logger = logging.getLogger(__name__)
+
+# Directory of the interim Parquet files written by ``dataset.py``
+DEFAULT_DATA_DIR = Path("data/interim")
+
+# Default bound on the bytes held by the in-process frame cache
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+
+# Offsets the hash seed so load samples are independent of folds and samples
+# drawn by other modules with the same seed
+_SEED_OFFSET = 2_000_003
+
+
+class FrameCache:
+    """
+    Least-recently-used cache of DataFrames bounded by their estimated size.
+
+    Frames larger than the whole budget are never cached. Entries are evicted
+    oldest first until a new frame fits.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def get(self, key) -> Union[pl.DataFrame, None]:
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is None:
+                self.misses += 1
+                return None
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return frame
+
+    def put(self, key, frame: pl.DataFrame) -> None:
+        size = frame.estimated_size()
+        with self._lock:
+            if key in self._frames:
+                self.bytes -= self._frames.pop(key).estimated_size()
+            if size > self.max_bytes:
+                return
+            while self._frames and self.bytes + size > self.max_bytes:
+                _, evicted = self._frames.popitem(last=False)
+                self.bytes -= evicted.estimated_size()
+            self._frames[key] = frame
+            self.bytes += size
+
+    def resize(self, max_bytes: int) -> None:
+        """Change the budget, evicting the oldest entries that no longer fit."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self._frames and self.bytes > max_bytes:
+                _, evicted = self._frames.popitem(last=False)
+                self.bytes -= evicted.estimated_size()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self.bytes = self.hits = self.misses = 0
+
+    def info(self) -> dict:
+        """Entries, bytes held, budget, hits and misses."""
+        return {
+            "entries": len(self._frames),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_cache = FrameCache()
+
+
+def cache() -> FrameCache:
+    """Return the frame cache shared by ``load`` calls in this process."""
+    return _cache
+
+
+def split_path(
+    split: Union[str, Path], data_dir: Union[str, Path] = DEFAULT_DATA_DIR
+) -> Path:
+    """
+    Resolve a split name or path to its Parquet file or partition directory.
+
+    ``"train"`` becomes ``<data_dir>/train.parquet``; anything containing a
+    path separator or ending in ``.parquet`` is taken as a path.
+
+    Raises:
+        FileNotFoundError: If the split does not exist.
+    """
+    path = Path(split)
+    if path.suffix != ".parquet" and len(path.parts) == 1:
+        path = Path(data_dir) / f"{split}.parquet"
+    if not path.exists():
+        raise FileNotFoundError(f"Split does not exist: {path}")
+    return path
+
+
+def scan(
+    split: Union[str, Path],
+    columns: Union[Iterable[str], None] = None,
+    filter: Union[pl.Expr, None] = None,
+    sample: Union[float, None] = None,
+    seed: int = 0,
+    data_dir: Union[str, Path] = DEFAULT_DATA_DIR,
+) -> pl.LazyFrame:
+    """
+    Build the lazy query behind ``load`` without executing it.
+
+    Args:
+        split (Union[str, Path]): Split name such as "train", or a path.
+        columns (Union[Iterable[str], None]): Columns to read, in order; None
+            reads all of them.
+        filter (Union[pl.Expr, None]): Row predicate pushed into the scan, so
+            row groups whose statistics rule it out are skipped.
+        sample (Union[float, None]): Share of rows to keep, chosen by a seeded
+            hash of the id, so the same rows come back on every call.
+        seed (int): Seed of the sample.
+        data_dir (Union[str, Path]): Directory of the split files.
+
+    Returns:
+        pl.LazyFrame: Query reading only the requested columns.
+
+    Raises:
+        FileNotFoundError: If the split does not exist.
+        ValueError: If a column is not in the split or ``sample`` is not in
+            (0, 1].
+    """
+    lf = pl.scan_parquet(split_path(split, data_dir))
+    if sample is not None:
+        if not 0 < sample <= 1:
+            raise ValueError(f"Sample must be in (0, 1], got: {sample}")
+        if sample < 1:
+            hashed = hashing.row_hash(schema.ID_COLUMN, seed + _SEED_OFFSET)
+            lf = lf.filter(hashing.unit_interval(hashed) < sample)
+    if filter is not None:
+        lf = lf.filter(filter)
+    if columns is not None:
+        columns = list(columns)
+        names = lf.collect_schema().names()
+        unknown = [name for name in columns if name not in names]
+        if unknown:
+            raise ValueError(f"Columns not found in {split}: {unknown}")
+        lf = lf.select(columns)
+    return lf
+
+
+def _cache_key(path: Path, columns, filter, sample, seed) -> tuple:
+    """Identify a materialised frame, including the file's current version."""
+    stat = path.stat()
+    predicate = None if filter is None else filter.meta.serialize(format="json")
+    columns = None if columns is None else tuple(columns)
+    return (
+        str(path.resolve()),
+        stat.st_size,
+        stat.st_mtime_ns,
+        columns,
+        predicate,
+        sample,
+        seed,
+    )
+
+
+def load(
+    split: Union[str, Path],
+    columns: Union[Iterable[str], None] = None,
+    filter: Union[pl.Expr, None] = None,
+    sample: Union[float, None] = None,
+    seed: int = 0,
+    data_dir: Union[str, Path] = DEFAULT_DATA_DIR,
+    use_cache: bool = True,
+) -> pl.DataFrame:
+    """
+    Read the columns and rows of an interim split that a caller actually needs.
+
+    The read always goes through ``scan_parquet``, so only the requested
+    columns are decoded and the filter and sample are pushed into the scan.
+    Results are kept in an in-process LRU cache bounded by bytes (see
+    ``cache``), keyed by the file's size and modification time and the
+    request, so repeated loads in a notebook or training job are free and a
+    rewritten file is never served stale. Cached frames are shared between
+    callers; Polars operations return new frames, so they are not modified.
+
+    Args:
+        split (Union[str, Path]): Split name such as "train", or a path.
+        columns (Union[Iterable[str], None]): Columns to read, in order.
+        filter (Union[pl.Expr, None]): Row predicate, e.g.
+            ``pl.col("target") == 1``.
+        sample (Union[float, None]): Share of rows to keep, by id hash.
+        seed (int): Seed of the sample.
+        data_dir (Union[str, Path]): Directory of the split files.
+        use_cache (bool): Whether to look up and store the result in the cache.
+
+    Returns:
+        pl.DataFrame: The requested data.
+
+    Raises:
+        FileNotFoundError: If the split does not exist.
+        ValueError: If a column is not in the split or the sample is invalid.
+    """
+    path = split_path(split, data_dir)
+    columns = None if columns is None else list(columns)
+    key = None
+    if use_cache:
+        key = _cache_key(path, columns, filter, sample, seed)
+        frame = _cache.get(key)
+        if frame is not None:
+            return frame
+    frame = scan(path, columns, filter, sample, seed).collect()
+    logger.debug(
+        f"Loaded {frame.height:,} x {frame.width} from {path.name} "
+        f"({frame.estimated_size() / 1e6:.1f} MB)"
+    )
+    if key is not None:
+        _cache.put(key, frame)
+    return frame
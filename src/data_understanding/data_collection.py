@@ -1,11 +1,21 @@
+import bz2
+import gzip
+import io
+import itertools
+import shutil
+import sys
+import zlib
+from contextlib import ExitStack, nullcontext
 from pathlib import Path
-from typing import Union
+from typing import BinaryIO, Callable, ContextManager, Iterator, Union
 import polars as pl
 import logging
 from polars.exceptions import PolarsError
-from src.utils.log_config import setup_logging
+from polars.io.plugins import register_io_source
+from src.data_understanding import matrix, schema
+from src.utils import file_cache, metrics
 
-# Custom emojis
+# Emojis for console logging, installed by entry points via setup_logging
 CUSTOM_EMOJIS = {
     "starting": "⏳",  # For "Starting data processing..."
     "loading": "📥",  # For "Loading data..."
@@ -17,35 +27,119 @@ CUSTOM_EMOJIS = {
     "config": "⚙️",  # For configuration messages
 }
 
+logger = logging.getLogger(__name__)
 
-# Initialize the logger for this specific module.
-setup_logging(console_level=logging.INFO, emoji_map=CUSTOM_EMOJIS)
+# Path that selects standard input as the CSV source
+STDIN = "-"
 
-logger = logging.getLogger(__name__)
+# Compression suffixes accepted after ".csv"
+COMPRESSED_SUFFIXES = {".gz", ".bz2", ".zst", ".zstd"}
+
+# Default number of decompressed bytes parsed per streamed batch
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Decompressed bytes sampled to estimate the size of a compressed CSV
+SIZE_SAMPLE_BYTES = 4 * 1024 * 1024
 
 
-def convert_data(path: Union[str, Path], output_path: Union[str, Path]) -> None:
+def convert_data(
+    path: Union[str, Path],
+    output_path: Union[str, Path],
+    strict: bool = False,
+    sentinel_to_null: bool = True,
+    force: bool = False,
+    compression: str = "zstd",
+    compression_level: Union[int, None] = None,
+    row_group_size: Union[int, None] = None,
+    statistics: bool = True,
+    partition_by: Union[str, list[str], None] = None,
+    streaming: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Union[Callable[[int, int], None], None] = None,
+    export_matrix: bool = False,
+    validate: bool = False,
+) -> bool:
     """
     Convert a CSV file to Parquet format using Polars in a lazy manner.
 
+    Porto Seguro columns are parsed with the dtypes declared in
+    ``schema`` instead of being inferred, so binary flags are stored as
+    Boolean, categoricals and ordinals as Int8 and continuous features as
+    Float32. Columns outside the registry are still inferred by Polars.
+
+    A manifest recording the source fingerprint and the conversion options is
+    written next to the output. The conversion is skipped when the manifest
+    shows that the output is already up to date.
+
+    With ``partition_by``, ``output_path`` becomes a directory holding a
+    hive-style layout (``<column>=<value>/0.parquet``) that
+    ``pl.scan_parquet(output_path)`` reads back with partition pruning.
+
+    Compressed inputs (``.csv.gz``, ``.csv.bz2``, ``.csv.zst``) and standard
+    input (``"-"``) are decompressed on the fly and parsed in batches of about
+    ``chunk_size`` bytes that are appended to the Parquet writer, so peak
+    memory does not grow with the input size. The same batched path is used
+    for plain CSV files when ``streaming`` is set or a ``progress`` callback
+    is given. Standard input is always converted, since it cannot be
+    fingerprinted.
+
     Args:
-        path (Union[str, Path]): Path to the input CSV file.
+        path (Union[str, Path]): Path to the input CSV file, or "-" for stdin.
         output_path (Union[str, Path]): Path where the Parquet file will be saved.
+        strict (bool): If True, fail when a Porto Seguro column is missing, an
+            unknown column is present, a binary flag holds a value other than
+            0, 1 or the missing sentinel, or a categorical level is unknown
+            (see ``schema.cast_expressions``). Otherwise out-of-domain flags
+            are stored as null and counted in a warning.
+        sentinel_to_null (bool): If True, the ``-1`` missing sentinel is read as
+            a null value. Binary flags are Boolean and store it as null either
+            way, in strict mode too.
+        force (bool): If True, convert even when the output is up to date.
+        compression (str): Parquet compression codec, e.g. "zstd", "lz4",
+            "snappy", "gzip" or "uncompressed".
+        compression_level (Union[int, None]): Codec level, None for the default.
+        row_group_size (Union[int, None]): Rows per row group, None for the
+            Polars default.
+        statistics (bool): Whether to write column statistics, which let
+            readers skip row groups on filtered scans.
+        partition_by (Union[str, list[str], None]): Column(s) to partition the
+            output by, e.g. "target" or a ``_cat`` column.
+        streaming (bool): If True, parse a plain CSV in bounded batches too.
+        chunk_size (int): Approximate number of decompressed bytes per batch.
+        progress (Union[Callable[[int, int], None], None]): Called after each
+            batch with the decompressed bytes and rows processed so far.
+        export_matrix (bool): Whether to also write the memory-mappable
+            float32 feature matrix, target and ids next to the Parquet file
+            (see ``matrix.export_matrix``). Not available with ``partition_by``.
+        validate (bool): Whether to check the header, value domains, row count
+            and id uniqueness before converting (see
+            ``validation.validate_file``). The report is cached next to the
+            output, so an unchanged input is only checked once. Not available
+            for standard input.
+
+    Returns:
+        bool: True if the Parquet file was written, False if it was skipped.
 
     Raises:
         FileNotFoundError: If the input file does not exist.
-        ValueError: If the input file is not a CSV or if the output directory is invalid.
+        ValueError: If the input file is not a CSV, if the output directory is
+            invalid, if a matrix export is combined with partitioning, if
+            validation fails or, in strict mode, if the header does not match
+            the schema.
+        ImportError: If a ``.zst`` input is given without ``zstandard`` installed.
         PolarsError: If Polars fails to read the CSV or write the Parquet file.
     """
+    from_stdin = str(path) == STDIN
     input_path = Path(path)
     output_path = Path(output_path)
 
-    if not input_path.exists():
-        raise FileNotFoundError(f"Input file does not exist: {input_path}")
-    if not input_path.is_file():
-        raise ValueError(f"Input path is not a file: {input_path}")
-    if input_path.suffix.lower() != ".csv":
-        raise ValueError(f"Input file must be a CSV, got: {input_path.suffix}")
+    if not from_stdin:
+        if not input_path.exists():
+            raise FileNotFoundError(f"Input file does not exist: {input_path}")
+        if not input_path.is_file():
+            raise ValueError(f"Input path is not a file: {input_path}")
+        if not is_csv_path(input_path):
+            raise ValueError(f"Input file must be a CSV, got: {input_path.suffix}")
 
     output_dir = output_path.parent
     if not output_dir.exists():
@@ -55,9 +149,583 @@ def convert_data(path: Union[str, Path], output_path: Union[str, Path]) -> None:
             f"Output file must have .parquet extension, got: {output_path.suffix}"
         )
 
+    if export_matrix and partition_by:
+        raise ValueError("Matrix export needs a single Parquet file, not partitions")
+    if validate and from_stdin:
+        raise ValueError("Validation needs an input file, not standard input")
+
+    source_name = "<stdin>" if from_stdin else input_path.name
+    batched = (
+        from_stdin
+        or input_path.suffix.lower() in COMPRESSED_SUFFIXES
+        or streaming
+        or progress is not None
+    )
+
+    with ExitStack() as stack:
+        run = stack.enter_context(metrics.stage("convert_data", source=source_name))
+        if not from_stdin:
+            run.count("input_bytes", input_path.stat().st_size)
+
+        with metrics.stage("convert_data.validation", source=source_name) as check:
+            if validate:
+                # Imported here: validation reads through this module's helpers
+                from src.data_understanding import validation
+
+                report = validation.validate_file(input_path, cache_dir=output_dir)
+                check.count("rows", report.rows)
+                check.count("violations", len(report.violations))
+                if not report.passed:
+                    raise ValueError(
+                        f"Validation of {source_name} failed: "
+                        + "; ".join(report.violations)
+                    )
+            if batched:
+                stream = stack.enter_context(open_input(path))
+                header = stream.readline()
+                columns = schema.parse_header(header.decode("utf-8"))
+            else:
+                columns = schema.read_header(input_path)
+            check.count("columns", len(columns))
+            if strict:
+                schema.check_columns(columns)
+
+            if isinstance(partition_by, str):
+                partition_by = [partition_by]
+            if partition_by:
+                unknown = [name for name in partition_by if name not in columns]
+                if unknown:
+                    raise ValueError(f"Partition columns not found in input: {unknown}")
+
+        options = conversion_options(
+            columns,
+            strict=strict,
+            sentinel_to_null=sentinel_to_null,
+            compression=compression,
+            compression_level=compression_level,
+            row_group_size=row_group_size,
+            statistics=statistics,
+            partition_by=partition_by,
+        )
+        if (
+            not from_stdin
+            and not force
+            and not _is_stale(input_path, output_path, options)
+        ):
+            logger.info(f"Skipping {source_name}: the parquet output is up to date")
+            run.set(skipped=True)
+            if export_matrix:
+                matrix.export_matrix(output_path)
+            return False
+
+        source_fingerprint = None
+        if not from_stdin:
+            source_fingerprint = file_cache.fingerprint(input_path)
+        _remove_output(output_path)
+        manifest_path(output_path).unlink(missing_ok=True)
+        target = output_path
+        if partition_by:
+            target = pl.PartitionByKey(output_path, by=partition_by)
+        try:
+            logger.info(f"Starting data convertion of {source_name} to parquet")
+            # Building the plan is nearly free; the scan runs inside the sink
+            with metrics.stage("convert_data.convert", source=source_name) as convert:
+                invalid_counts = None
+                if batched:
+                    lf = scan_csv_stream(
+                        stream,
+                        columns,
+                        strict=strict,
+                        sentinel_to_null=sentinel_to_null,
+                        chunk_size=chunk_size,
+                        progress=progress,
+                        offset=len(header),
+                    )
+                else:
+                    parsed = scan_raw_csv(
+                        input_path,
+                        columns,
+                        sentinel_to_null=sentinel_to_null,
+                        cast=False,
+                    )
+                    lf = parsed.with_columns(
+                        schema.cast_expressions(columns, strict=strict)
+                    )
+                    # Counted in the same pass: both queries share the scan
+                    if not strict and schema.columns_by_family(columns, "bin"):
+                        invalid_counts = parsed.select(
+                            schema.invalid_flag_counts(columns)
+                        )
+                sink = lf.sink_parquet(
+                    target,
+                    compression=compression,
+                    compression_level=compression_level,
+                    row_group_size=row_group_size,
+                    statistics=statistics,
+                    mkdir=bool(partition_by),
+                    lazy=invalid_counts is not None,
+                )
+                if invalid_counts is not None:
+                    _, invalid = pl.collect_all(
+                        [sink, invalid_counts], engine="streaming"
+                    )
+                    total = _warn_invalid_flags(invalid.row(0, named=True), source_name)
+                    convert.count("invalid_flags", total)
+                if metrics.logger.isEnabledFor(logging.DEBUG):
+                    # Row counts come from the Parquet footers, not the data
+                    rows = pl.scan_parquet(output_path).select(pl.len()).collect()
+                    convert.count("rows", rows.item())
+                    run.count("rows", rows.item())
+                output_size = _output_size(output_path)
+                convert.count("output_bytes", output_size)
+                run.count("output_bytes", output_size)
+            logger.info(f"The file {source_name} was successfully converted to parquet")
+        except PolarsError as e:
+            raise PolarsError(f"Failed to convert CSV to Parquet: {e}")
+
+    if source_fingerprint is not None:
+        file_cache.write_json(
+            manifest_path(output_path),
+            {
+                "source": str(input_path.resolve()),
+                "source_fingerprint": source_fingerprint,
+                "output_size": output_size,
+                "options": options,
+            },
+        )
+    if export_matrix:
+        with metrics.stage("convert_data.export_matrix", source=source_name):
+            matrix.export_matrix(output_path, force=True)
+    return True
+
+
+def is_csv_path(path: Union[str, Path]) -> bool:
+    """Check whether a path names a plain or compressed CSV file."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in COMPRESSED_SUFFIXES:
+        suffix = Path(path.stem).suffix.lower()
+    return suffix == ".csv"
+
+
+def csv_stem(path: Union[str, Path]) -> str:
+    """Return a CSV file name without its ``.csv`` and compression suffixes."""
+    path = Path(path)
+    if path.suffix.lower() in COMPRESSED_SUFFIXES:
+        path = Path(path.stem)
+    return path.stem
+
+
+def open_input(path: Union[str, Path]) -> ContextManager[BinaryIO]:
+    """
+    Open a CSV source as a binary stream, decompressing it if needed.
+
+    Args:
+        path (Union[str, Path]): Plain or compressed CSV file, or "-" for stdin.
+
+    Returns:
+        ContextManager[BinaryIO]: Stream of decompressed bytes. Standard input
+            is wrapped so that leaving the context leaves it open.
+
+    Raises:
+        ImportError: If a ``.zst`` file is given without ``zstandard`` installed.
+    """
+    if str(path) == STDIN:
+        return nullcontext(sys.stdin.buffer)
+    suffix = Path(path).suffix.lower()
+    if suffix == ".gz":
+        return gzip.open(path, "rb")
+    if suffix == ".bz2":
+        return bz2.open(path, "rb")
+    if suffix in (".zst", ".zstd"):
+        decompressor = _zstandard().ZstdDecompressor()
+        reader = decompressor.stream_reader(open(path, "rb"), closefd=True)
+        return io.BufferedReader(reader)
+    return open(path, "rb")
+
+
+def _zstandard():
+    """Import the optional zstd codec."""
     try:
-        logger.info(f"Starting data convertion of {input_path.name} to parquet")
-        pl.scan_csv(input_path).sink_parquet(output_path)
-        logger.info(f"The file {input_path.name} was successfully converted to parquet")
-    except PolarsError as e:
-        raise PolarsError(f"Failed to convert CSV to Parquet: {e}")
+        import zstandard
+    except ImportError as e:
+        raise ImportError("Reading .zst inputs requires the 'zstandard' package") from e
+    return zstandard
+
+
+def estimate_size(path: Union[str, Path]) -> int:
+    """
+    Estimate the number of bytes ``open_input`` yields for a CSV file.
+
+    A plain file reports its size. A compressed file is decompressed until
+    ``SIZE_SAMPLE_BYTES`` are produced and the ratio of bytes produced to
+    bytes fed is applied to the whole file; a file that fits in the sample is
+    measured exactly.
+
+    Args:
+        path (Union[str, Path]): Plain or compressed CSV file.
+
+    Returns:
+        int: Approximate decompressed size in bytes.
+
+    Raises:
+        ImportError: If a ``.zst`` file is given without ``zstandard`` installed.
+    """
+    path = Path(path)
+    size = path.stat().st_size
+    suffix = path.suffix.lower()
+    if suffix == ".gz":
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    elif suffix == ".bz2":
+        decompressor = bz2.BZ2Decompressor()
+    elif suffix in (".zst", ".zstd"):
+        decompressor = _zstandard().ZstdDecompressor().decompressobj()
+    else:
+        return size
+
+    produced = consumed = 0
+    with open(path, "rb") as handle:
+        while produced < SIZE_SAMPLE_BYTES and not decompressor.eof:
+            block = handle.read(file_cache.CHUNK_SIZE)
+            if not block:
+                break
+            produced += len(decompressor.decompress(block))
+            consumed += len(block)
+    if decompressor.eof:
+        # Only the first gzip member or zstd frame was read
+        consumed -= len(decompressor.unused_data)
+    if consumed in (0, size):
+        return produced
+    return round(size * produced / consumed)
+
+
+def _read_chunks(stream: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """Yield blocks of about ``chunk_size`` bytes that end on a line boundary."""
+    remainder = b""
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            if remainder.strip():
+                yield remainder
+            return
+        block = remainder + block
+        cut = block.rfind(b"\n")
+        if cut < 0:
+            remainder = block
+            continue
+        remainder = block[cut + 1 :]
+        yield block[: cut + 1]
+
+
+def iter_csv_batches(
+    stream: BinaryIO,
+    columns: list[str],
+    strict: bool = False,
+    sentinel_to_null: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    cast: bool = True,
+) -> Iterator[tuple[int, pl.DataFrame]]:
+    """
+    Parse a headerless CSV stream into DataFrames of about ``chunk_size`` bytes.
+
+    The first batch settles the dtypes of columns outside the registry and
+    later batches are parsed with the same schema. At least one batch is
+    yielded, empty if the stream is. Fields must not contain quoted line
+    breaks, which holds for the Porto Seguro extracts.
+
+    Args:
+        stream (BinaryIO): Stream positioned after the header line.
+        columns (list[str]): Column names from the CSV header.
+        strict (bool): Whether out-of-domain values should raise.
+        sentinel_to_null (bool): Whether the ``-1`` sentinel is read as null.
+        chunk_size (int): Approximate number of bytes per batch.
+        cast (bool): Whether binary flags are mapped to Boolean; if False the
+            batches keep the parsed integers, e.g. for validation.
+
+    Yields:
+        tuple[int, pl.DataFrame]: Bytes consumed and the batch with the
+            storage dtypes, or the parsing dtypes without ``cast``.
+    """
+    dtypes = schema.parse_schema(columns)
+    null_values = _null_values(sentinel_to_null)
+    casts = schema.cast_expressions(columns, strict=strict) if cast else []
+    counts = schema.invalid_flag_counts(columns) if cast and not strict else []
+    chunks = _read_chunks(stream, chunk_size)
+    rows = 0
+
+    def finish(frame: pl.DataFrame) -> pl.DataFrame:
+        nonlocal rows
+        start, rows = rows, rows + len(frame)
+        if counts and len(frame):
+            _warn_invalid_flags(
+                frame.select(counts).row(0, named=True), f"rows {start + 1:,}-{rows:,}"
+            )
+        return frame.with_columns(casts)
+
+    first_chunk = next(chunks, b"")
+    if first_chunk:
+        first = pl.read_csv(
+            first_chunk,
+            has_header=False,
+            new_columns=columns,
+            schema_overrides=dtypes,
+            null_values=null_values,
+        )
+    else:
+        first = pl.DataFrame(
+            schema={name: dtypes.get(name, pl.String) for name in columns}
+        )
+    parse_schema = first.schema
+    yield len(first_chunk), finish(first)
+
+    for chunk in chunks:
+        frame = pl.read_csv(
+            chunk, has_header=False, schema=parse_schema, null_values=null_values
+        )
+        yield len(chunk), finish(frame)
+
+
+def _warn_invalid_flags(counts: dict[str, int], where: str) -> int:
+    """Log the binary flag values read as null by non-strict casting."""
+    total = 0
+    for name, count in counts.items():
+        if count:
+            logger.warning(
+                f"{count:,} values of {name} outside {{0, 1}} read as null in {where}"
+            )
+            total += count
+    return total
+
+
+def scan_csv_stream(
+    stream: BinaryIO,
+    columns: list[str],
+    strict: bool = False,
+    sentinel_to_null: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Union[Callable[[int, int], None], None] = None,
+    offset: int = 0,
+) -> pl.LazyFrame:
+    """
+    Lazily parse a headerless CSV stream in bounded batches.
+
+    The first batch is parsed eagerly to settle the dtypes of columns outside
+    the registry; the rest is parsed as the returned LazyFrame is consumed
+    (see ``iter_csv_batches``). The LazyFrame consumes the stream and can
+    only be executed once.
+
+    Args:
+        stream (BinaryIO): Stream positioned after the header line.
+        columns (list[str]): Column names from the CSV header.
+        strict (bool): Whether out-of-domain values should raise.
+        sentinel_to_null (bool): Whether the ``-1`` sentinel is read as null.
+        chunk_size (int): Approximate number of bytes per batch.
+        progress (Union[Callable[[int, int], None], None]): Called after each
+            batch with the bytes and rows processed so far.
+        offset (int): Bytes already consumed from the stream (the header).
+
+    Returns:
+        pl.LazyFrame: Query plan producing the storage dtypes.
+    """
+    batches = iter_csv_batches(stream, columns, strict, sentinel_to_null, chunk_size)
+    first = next(batches)
+
+    def source(with_columns, predicate, n_rows, batch_size):
+        bytes_read, rows = offset, 0
+        for size, frame in itertools.chain([first], batches):
+            bytes_read += size
+            rows += len(frame)
+            if progress is not None:
+                progress(bytes_read, rows)
+            if predicate is not None:
+                frame = frame.filter(predicate)
+            if with_columns is not None:
+                frame = frame.select(with_columns)
+            if n_rows is not None:
+                frame = frame.head(n_rows)
+                n_rows -= len(frame)
+            yield frame
+            if n_rows == 0:
+                return
+
+    return register_io_source(source, schema=first[1].schema)
+
+
+def conversion_options(
+    columns: list[str],
+    strict: bool = False,
+    sentinel_to_null: bool = True,
+    compression: str = "zstd",
+    compression_level: Union[int, None] = None,
+    row_group_size: Union[int, None] = None,
+    statistics: bool = True,
+    partition_by: Union[str, list[str], None] = None,
+) -> dict:
+    """
+    Describe the settings that determine the content of a converted file.
+
+    Args:
+        columns (list[str]): Column names from the CSV header.
+        strict (bool): Strict mode flag passed to ``convert_data``.
+        sentinel_to_null (bool): Sentinel handling flag passed to ``convert_data``.
+        compression (str): Parquet compression codec.
+        compression_level (Union[int, None]): Parquet compression level.
+        row_group_size (Union[int, None]): Rows per row group.
+        statistics (bool): Whether column statistics are written.
+        partition_by (Union[str, list[str], None]): Partition column(s).
+
+    Returns:
+        dict: JSON-serialisable options recorded in the manifest.
+    """
+    if isinstance(partition_by, str):
+        partition_by = [partition_by]
+    return {
+        "strict": strict,
+        "sentinel_to_null": sentinel_to_null,
+        "compression": compression,
+        "compression_level": compression_level,
+        "row_group_size": row_group_size,
+        "statistics": statistics,
+        "partition_by": list(partition_by or []),
+        "schema": {
+            name: str(dtype) for name, dtype in schema.storage_schema(columns).items()
+        },
+    }
+
+
+def manifest_path(output_path: Union[str, Path]) -> Path:
+    """Return the path of the manifest kept next to a converted file."""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name + ".manifest.json")
+
+
+def _output_size(output_path: Path) -> Union[int, None]:
+    """Total size of a converted file or partitioned directory, None if absent."""
+    if output_path.is_file():
+        return output_path.stat().st_size
+    if output_path.is_dir():
+        return sum(part.stat().st_size for part in output_path.rglob("*.parquet"))
+    return None
+
+
+def _remove_output(output_path: Path) -> None:
+    """Delete a previous output so that stale partitions do not linger."""
+    if output_path.is_dir():
+        shutil.rmtree(output_path)
+    elif output_path.exists():
+        output_path.unlink()
+
+
+def _is_stale(input_path: Path, output_path: Path, options: dict) -> bool:
+    manifest = file_cache.read_json(manifest_path(output_path))
+    if manifest is None or manifest.get("options") != options:
+        return True
+    if manifest.get("source") != str(input_path.resolve()):
+        return True
+
+    size = _output_size(output_path)
+    if size is None or size != manifest.get("output_size"):
+        return True
+
+    recorded = manifest.get("source_fingerprint", {})
+    if not file_cache.matches(input_path, recorded):
+        return True
+
+    current = file_cache.fingerprint(input_path, with_hash=False)
+    if current["mtime_ns"] != recorded.get("mtime_ns"):
+        # Touched but unchanged: ``matches`` just hashed it equal to the record,
+        # so keep that hash and remember the new mtime to avoid rehashing
+        manifest["source_fingerprint"] = {**current, "hash": recorded["hash"]}
+        file_cache.write_json(manifest_path(output_path), manifest)
+    return False
+
+
+def is_stale(path: Union[str, Path], output_path: Union[str, Path], **options) -> bool:
+    """
+    Check whether ``convert_data`` would rewrite an output.
+
+    Args:
+        path (Union[str, Path]): Path to the input CSV file.
+        output_path (Union[str, Path]): Path of the Parquet file.
+        **options: Conversion options the rerun would use, as accepted by
+            ``conversion_options`` (e.g. ``strict`` or ``compression``).
+
+    Returns:
+        bool: True if the output is missing, the source changed or the
+            options differ from those recorded in the manifest.
+
+    Raises:
+        FileNotFoundError: If the input file does not exist.
+    """
+    input_path = Path(path)
+    if not input_path.is_file():
+        raise FileNotFoundError(f"Input file does not exist: {input_path}")
+    with open_input(input_path) as stream:
+        columns = schema.parse_header(stream.readline().decode("utf-8"))
+    return _is_stale(
+        input_path, Path(output_path), conversion_options(columns, **options)
+    )
+
+
+def stale_outputs(
+    pairs: list[tuple[Union[str, Path], Union[str, Path]]], **options
+) -> list[Path]:
+    """
+    Report which outputs of a set of conversions need to be rebuilt.
+
+    Args:
+        pairs (list[tuple[Union[str, Path], Union[str, Path]]]): Input CSV and
+            output Parquet paths.
+        **options: Conversion options passed to ``is_stale``.
+
+    Returns:
+        list[Path]: Output paths that are stale, in input order.
+    """
+    return [
+        Path(output_path)
+        for path, output_path in pairs
+        if is_stale(path, output_path, **options)
+    ]
+
+
+def scan_raw_csv(
+    path: Union[str, Path],
+    columns: list[str],
+    strict: bool = False,
+    sentinel_to_null: bool = True,
+    cast: bool = True,
+) -> pl.LazyFrame:
+    """
+    Lazily scan a Porto Seguro CSV with its declared schema.
+
+    Args:
+        path (Union[str, Path]): Path to the input CSV file.
+        columns (list[str]): Column names from the CSV header.
+        strict (bool): Whether out-of-domain values should raise.
+        sentinel_to_null (bool): Whether the ``-1`` sentinel is read as null.
+        cast (bool): Whether binary flags are mapped to Boolean; if False the
+            plan keeps the parsed integers.
+
+    Returns:
+        pl.LazyFrame: Query plan producing the storage dtypes, or the parsing
+            dtypes without ``cast``.
+    """
+    dtypes = schema.parse_schema(columns)
+    null_values = _null_values(sentinel_to_null)
+
+    if len(dtypes) == len(columns):
+        # Every column is declared, so schema inference is skipped entirely
+        lf = pl.scan_csv(path, schema=dtypes, null_values=null_values)
+    else:
+        lf = pl.scan_csv(path, schema_overrides=dtypes, null_values=null_values)
+
+    if not cast:
+        return lf
+    return lf.with_columns(schema.cast_expressions(columns, strict=strict))
+
+
+def _null_values(sentinel_to_null: bool) -> Union[list[str], None]:
+    """CSV spellings of the missing sentinel, or None to keep it as a value."""
+    if not sentinel_to_null:
+        return None
+    return [str(schema.MISSING_SENTINEL), f"{schema.MISSING_SENTINEL}.0"]
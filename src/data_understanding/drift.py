@@ -0,0 +1,407 @@
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Union
+import numpy as np
+import polars as pl
+from src.data_understanding import schema
+from src.utils import file_cache
+
+logger = logging.getLogger(__name__)
+
+# Columns with at most this many distinct values are sketched as exact
+# frequency tables; the others as quantile functions
+MAX_LEVELS = 256
+
+# Evenly spaced quantiles kept per continuous column (an equi-depth histogram)
+N_QUANTILES = 1001
+
+# Bins of the continuous PSI, cut at quantiles of the reference
+DEFAULT_PSI_BINS = 10
+
+# Floor on bin shares so empty bins do not make the PSI infinite
+PSI_EPSILON = 1e-4
+
+# PSI above which a shift is moderate and significant, by the usual convention
+PSI_THRESHOLDS = (0.1, 0.25)
+
+
+@dataclass(frozen=True)
+class ColumnSketch:
+    """
+    Compact summary of one column.
+
+    For ``kind == "levels"``, ``values`` holds the sorted distinct values and
+    ``counts`` their frequencies. For ``kind == "quantiles"``, ``values``
+    holds ``N_QUANTILES`` evenly spaced quantiles and ``counts`` is None.
+    Missing values (null or the -1 sentinel) are only counted in ``missing``.
+    """
+
+    kind: str
+    dtype: str
+    rows: int
+    missing: int
+    values: np.ndarray
+    counts: Union[np.ndarray, None] = None
+
+    @property
+    def missing_rate(self) -> float:
+        return self.missing / self.rows if self.rows else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "dtype": self.dtype,
+            "rows": self.rows,
+            "missing": self.missing,
+            "values": self.values.tolist(),
+            "counts": None if self.counts is None else self.counts.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, document: dict) -> "ColumnSketch":
+        counts = document.get("counts")
+        return cls(
+            kind=document["kind"],
+            dtype=document["dtype"],
+            rows=document["rows"],
+            missing=document["missing"],
+            values=np.asarray(document["values"], dtype=np.float64),
+            counts=None if counts is None else np.asarray(counts, dtype=np.int64),
+        )
+
+
+@dataclass(frozen=True)
+class FileSketch:
+    """Sketches of every column of one file."""
+
+    rows: int
+    columns: dict[str, ColumnSketch]
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "columns": {
+                name: sketch.to_dict() for name, sketch in self.columns.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, document: dict) -> "FileSketch":
+        columns = {
+            name: ColumnSketch.from_dict(sketch)
+            for name, sketch in document["columns"].items()
+        }
+        return cls(rows=document["rows"], columns=columns)
+
+
+def _observed(name: str, dtype: pl.DataType) -> pl.Expr:
+    """Column as Float64 with the -1 sentinel of numeric columns made null."""
+    column = pl.col(name)
+    if dtype.is_numeric():
+        column = pl.when(column != schema.MISSING_SENTINEL).then(column)
+    return column.cast(pl.Float64).alias(name)
+
+
+def sketch(
+    source: Union[str, Path, pl.LazyFrame],
+    columns: Union[Iterable[str], None] = None,
+    max_levels: int = MAX_LEVELS,
+    n_quantiles: int = N_QUANTILES,
+) -> FileSketch:
+    """
+    Summarise the distribution of every column of a converted file.
+
+    One streaming aggregation counts rows, missing and distinct values of
+    all columns. Low-cardinality columns (flags, categories, ordinals and
+    coarse continuous features) then get exact frequency tables from a single
+    long-format group-by. Each remaining continuous column is read on its own
+    and reduced to ``n_quantiles`` quantiles, so memory stays at one column.
+
+    Args:
+        source (Union[str, Path, pl.LazyFrame]): Interim Parquet file or an
+            existing LazyFrame.
+        columns (Union[Iterable[str], None]): Columns to sketch. Defaults to
+            every column except the id and target.
+        max_levels (int): Largest number of distinct values kept as a
+            frequency table.
+        n_quantiles (int): Quantiles kept for the other columns.
+
+    Returns:
+        FileSketch: Per-column sketches.
+    """
+    lf = source if isinstance(source, pl.LazyFrame) else pl.scan_parquet(source)
+    file_schema = lf.collect_schema()
+    if columns is None:
+        excluded = (schema.ID_COLUMN, schema.TARGET_COLUMN)
+        columns = [name for name in file_schema.names() if name not in excluded]
+    else:
+        columns = list(columns)
+
+    observed = lf.select(_observed(name, file_schema[name]) for name in columns)
+    summary = (
+        observed.select(
+            pl.len().alias("__rows"),
+            *(
+                expression
+                for name in columns
+                for expression in (
+                    pl.col(name).count().alias(f"{name}:present"),
+                    pl.col(name).drop_nulls().n_unique().alias(f"{name}:distinct"),
+                )
+            ),
+        )
+        .collect(engine="streaming")
+        .row(0, named=True)
+    )
+    rows = summary["__rows"]
+    few = [name for name in columns if summary[f"{name}:distinct"] <= max_levels]
+
+    tables = {}
+    if few:
+        counts = (
+            observed.select(few)
+            .unpivot(variable_name="column", value_name="value")
+            .drop_nulls("value")
+            .group_by("column", "value")
+            .len()
+            .sort("column", "value")
+            .collect(engine="streaming")
+        )
+        for (name,), table in counts.group_by("column", maintain_order=True):
+            tables[name] = table
+
+    levels = np.linspace(0, 1, n_quantiles)
+    sketches = {}
+    for name in columns:
+        present = summary[f"{name}:present"]
+        common = {
+            "dtype": str(file_schema[name]),
+            "rows": rows,
+            "missing": rows - present,
+        }
+        if name in few:
+            table = tables.get(name)
+            values = np.array([]) if table is None else table["value"].to_numpy()
+            counts = np.array([], dtype=np.int64)
+            if table is not None:
+                counts = table["len"].to_numpy().astype(np.int64)
+            sketches[name] = ColumnSketch(
+                kind="levels", values=values, counts=counts, **common
+            )
+        else:
+            values = observed.select(pl.col(name).drop_nulls()).collect()
+            values = values.to_series().to_numpy()
+            quantiles = np.quantile(values, levels) if len(values) else np.array([])
+            sketches[name] = ColumnSketch(kind="quantiles", values=quantiles, **common)
+    return FileSketch(rows=rows, columns=sketches)
+
+
+def sketch_file(
+    path: Union[str, Path], cache_dir: Union[str, Path, None] = None
+) -> FileSketch:
+    """
+    Sketch a converted file, reusing the cached sketch of identical content.
+
+    Sketches are cached as ``<stem>-<content hash>.sketch.json`` in
+    ``cache_dir``, so each extract is scanned once however many times it is
+    compared.
+
+    Args:
+        path (Union[str, Path]): Interim Parquet file.
+        cache_dir (Union[str, Path, None]): Directory of cached sketches, or
+            None to disable caching.
+
+    Returns:
+        FileSketch: Per-column sketches.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    path = Path(path)
+    if not path.is_file():
+        raise FileNotFoundError(f"Input file does not exist: {path}")
+    if cache_dir is None:
+        return sketch(path)
+
+    cached = (
+        Path(cache_dir) / f"{path.stem}-{file_cache.content_hash(path)}.sketch.json"
+    )
+    document = file_cache.read_json(cached)
+    if document is not None:
+        logger.info(f"Loading cached sketch of {path.name}")
+        return FileSketch.from_dict(document)
+
+    result = sketch(path)
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    file_cache.write_json(cached, result.to_dict())
+    return result
+
+
+def _quantile_function(column: ColumnSketch, n_quantiles: int) -> np.ndarray:
+    """Evenly spaced quantiles of a sketch, derived from its table if needed."""
+    if column.kind == "quantiles":
+        return column.values
+    if not column.counts.sum():
+        return np.array([])
+    cumulative = np.cumsum(column.counts) / column.counts.sum()
+    levels = np.linspace(0, 1, n_quantiles)
+    index = np.searchsorted(cumulative, levels, side="left")
+    return column.values[np.minimum(index, len(column.values) - 1)]
+
+
+def _cdf(quantiles: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Right-continuous CDF implied by evenly spaced quantiles.
+
+    Between quantiles the CDF is interpolated linearly; at tied quantiles it
+    jumps to the highest level sharing the value.
+    """
+    n = len(quantiles)
+    if n == 0:
+        return np.zeros(len(x))
+    levels = np.linspace(0, 1, n)
+    above = np.searchsorted(quantiles, x, side="right")
+    low = np.clip(above - 1, 0, n - 1)
+    high = np.clip(above, 0, n - 1)
+    span = quantiles[high] - quantiles[low]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fraction = np.where(span > 0, (x - quantiles[low]) / span, 0.0)
+    inside = levels[low] + fraction * (levels[high] - levels[low])
+    return np.where(above == 0, 0.0, np.where(above >= n, 1.0, inside))
+
+
+def psi(reference: np.ndarray, current: np.ndarray) -> float:
+    """
+    Population stability index between two binned distributions.
+
+    Args:
+        reference (np.ndarray): Share of the reference in each bin.
+        current (np.ndarray): Share of the current data in the same bins.
+
+    Returns:
+        float: ``sum((current - reference) * ln(current / reference))``, with
+            shares floored at ``PSI_EPSILON``.
+    """
+    reference = np.maximum(np.asarray(reference, dtype=np.float64), PSI_EPSILON)
+    current = np.maximum(np.asarray(current, dtype=np.float64), PSI_EPSILON)
+    return float(np.sum((current - reference) * np.log(current / reference)))
+
+
+def column_drift(
+    reference: ColumnSketch, current: ColumnSketch, n_bins: int = DEFAULT_PSI_BINS
+) -> tuple[float, float]:
+    """
+    PSI and Kolmogorov-Smirnov distance between two column sketches.
+
+    Frequency tables are compared level by level. Otherwise the PSI uses
+    ``n_bins`` bins cut at the reference quantiles and the KS distance is the
+    largest gap between the two sketched CDFs. Missing values form an extra
+    PSI bin and are left out of the KS distance.
+
+    Args:
+        reference (ColumnSketch): Sketch of the reference column.
+        current (ColumnSketch): Sketch of the same column in the new file.
+        n_bins (int): Bins of the continuous PSI.
+
+    Returns:
+        tuple[float, float]: PSI and KS distance.
+    """
+    if reference.kind == current.kind == "levels":
+        values = np.union1d(reference.values, current.values)
+        shares = []
+        for column in (reference, current):
+            counts = np.zeros(len(values))
+            counts[np.searchsorted(values, column.values)] = column.counts
+            present = counts.sum()
+            shares.append((counts, present))
+        (ref_counts, ref_present), (cur_counts, cur_present) = shares
+        ref_cdf = np.cumsum(ref_counts) / max(ref_present, 1)
+        cur_cdf = np.cumsum(cur_counts) / max(cur_present, 1)
+        ref_bins, cur_bins = ref_counts, cur_counts
+    else:
+        ref_quantiles = _quantile_function(reference, N_QUANTILES)
+        cur_quantiles = _quantile_function(current, N_QUANTILES)
+        points = np.union1d(ref_quantiles, cur_quantiles)
+        ref_cdf, cur_cdf = _cdf(ref_quantiles, points), _cdf(cur_quantiles, points)
+        edges = np.array([])
+        if len(ref_quantiles):
+            cuts = np.quantile(ref_quantiles, np.linspace(0, 1, n_bins + 1)[1:-1])
+            edges = np.unique(cuts)
+        ref_bins = np.diff(_cdf(ref_quantiles, edges), prepend=0.0, append=1.0)
+        cur_bins = np.diff(_cdf(cur_quantiles, edges), prepend=0.0, append=1.0)
+        ref_bins = ref_bins * (reference.rows - reference.missing)
+        cur_bins = cur_bins * (current.rows - current.missing)
+
+    ks = float(np.max(np.abs(ref_cdf - cur_cdf))) if len(ref_cdf) else 0.0
+    ref_shares = np.append(ref_bins, reference.missing) / max(reference.rows, 1)
+    cur_shares = np.append(cur_bins, current.missing) / max(current.rows, 1)
+    return psi(ref_shares, cur_shares), ks
+
+
+def schema_changes(reference: FileSketch, current: FileSketch) -> dict[str, list]:
+    """
+    Columns added, removed or stored with another dtype in the current file.
+
+    Returns:
+        dict[str, list]: Keys "added" and "removed" with column names, and
+            "retyped" with (column, reference dtype, current dtype) tuples.
+    """
+    added = [name for name in current.columns if name not in reference.columns]
+    removed = [name for name in reference.columns if name not in current.columns]
+    retyped = [
+        (name, sketch.dtype, current.columns[name].dtype)
+        for name, sketch in reference.columns.items()
+        if name in current.columns and sketch.dtype != current.columns[name].dtype
+    ]
+    return {"added": added, "removed": removed, "retyped": retyped}
+
+
+def compare(
+    reference: FileSketch, current: FileSketch, n_bins: int = DEFAULT_PSI_BINS
+) -> pl.DataFrame:
+    """
+    Drift of every column shared by two sketched files, from the sketches alone.
+
+    Args:
+        reference (FileSketch): Sketch of the reference file, e.g. train.
+        current (FileSketch): Sketch of the new extract.
+        n_bins (int): Bins of the continuous PSI.
+
+    Returns:
+        pl.DataFrame: One row per shared column with its PSI, KS distance,
+            missing rates and a status of "stable", "moderate" or
+            "significant" (see ``PSI_THRESHOLDS``), most drifted first.
+    """
+    moderate, significant = PSI_THRESHOLDS
+    rows = []
+    for name, ref in reference.columns.items():
+        cur = current.columns.get(name)
+        if cur is None:
+            continue
+        value, ks = column_drift(ref, cur, n_bins)
+        status = "stable"
+        if value >= significant:
+            status = "significant"
+        elif value >= moderate:
+            status = "moderate"
+        rows.append(
+            {
+                "column": name,
+                "psi": value,
+                "ks": ks,
+                "reference_missing_rate": ref.missing_rate,
+                "current_missing_rate": cur.missing_rate,
+                "status": status,
+            }
+        )
+    report_schema = {
+        "column": pl.String,
+        "psi": pl.Float64,
+        "ks": pl.Float64,
+        "reference_missing_rate": pl.Float64,
+        "current_missing_rate": pl.Float64,
+        "status": pl.String,
+    }
+    report = pl.DataFrame(rows, schema=report_schema, orient="row")
+    return report.sort("psi", descending=True)
@@ -0,0 +1,223 @@
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Union
+import numpy as np
+import polars as pl
+from src.data_understanding import schema
+from src.utils import file_cache
+
+logger = logging.getLogger(__name__)
+
+# Dtype of the exported feature matrix; missing values become NaN
+MATRIX_DTYPE = np.float32
+
+
+@dataclass(frozen=True)
+class MatrixFiles:
+    """Locations of the arrays exported next to an interim Parquet file."""
+
+    features: Path
+    target: Path
+    ids: Path
+    sidecar: Path
+
+
+@dataclass(frozen=True)
+class TrainingMatrix:
+    """Memory-mapped feature matrix with its target, ids and column names."""
+
+    features: np.ndarray
+    target: Union[np.ndarray, None]
+    ids: np.ndarray
+    columns: list[str]
+
+
+def matrix_files(parquet_path: Union[str, Path]) -> MatrixFiles:
+    """
+    Name the exported arrays of an interim file.
+
+    ``train.parquet`` gets ``train.features.npy``, ``train.target.npy``,
+    ``train.id.npy`` and the ``train.matrix.json`` sidecar.
+    """
+    parquet_path = Path(parquet_path)
+    base = parquet_path.with_suffix("")
+    return MatrixFiles(
+        features=base.with_name(f"{base.name}.features.npy"),
+        target=base.with_name(f"{base.name}.target.npy"),
+        ids=base.with_name(f"{base.name}.id.npy"),
+        sidecar=base.with_name(f"{base.name}.matrix.json"),
+    )
+
+
+def _is_current(files: MatrixFiles, parquet_path: Path, columns: list[str]) -> bool:
+    sidecar = file_cache.read_json(files.sidecar)
+    if sidecar is None or sidecar.get("columns") != columns:
+        return False
+    if not files.features.exists() or not files.ids.exists():
+        return False
+    return file_cache.matches(parquet_path, sidecar.get("source_fingerprint", {}))
+
+
+def _temp_path(path: Path) -> Path:
+    """Name a file is written under before being renamed into place."""
+    return path.with_name(path.name + ".tmp")
+
+
+def _save_array(path: Path, array: np.ndarray) -> None:
+    """Atomically write a ``.npy`` file; readers keep mapping the old one."""
+    temp_path = _temp_path(path)
+    # np.save would append ".npy" to a file name not ending with it
+    with open(temp_path, "wb") as handle:
+        np.save(handle, array)
+    temp_path.replace(path)
+
+
+def export_matrix(
+    parquet_path: Union[str, Path],
+    columns: Union[Iterable[str], None] = None,
+    force: bool = False,
+) -> MatrixFiles:
+    """
+    Write a column-major float32 feature matrix next to an interim Parquet file.
+
+    The matrix is a Fortran-ordered ``.npy`` file, so each feature occupies
+    one contiguous block. It is filled one column at a time straight from the
+    Parquet column chunks, which keeps memory at a single column. The target
+    (int8) and ids (int64) are written as separate ``.npy`` vectors and a JSON
+    sidecar records the columns, shape and a fingerprint of the source. Any
+    number of processes can then ``np.load(..., mmap_mode="r")`` the same
+    pages without copying them. An export matching the current source is
+    reused unless ``force`` is set.
+
+    The sidecar is removed first and written last, and the arrays are written
+    under temporary names and renamed into place. An interrupted export thus
+    leaves no sidecar to vouch for partial arrays, and processes that still
+    map the previous arrays keep reading them intact.
+
+    Args:
+        parquet_path (Union[str, Path]): Interim Parquet file.
+        columns (Union[Iterable[str], None]): Feature columns, in matrix order.
+            Defaults to every column of the file except the id and target, so
+            engineered columns of processed files are included.
+        force (bool): Whether to export even if the arrays are up to date.
+
+    Returns:
+        MatrixFiles: Locations of the exported arrays.
+
+    Raises:
+        FileNotFoundError: If the Parquet file does not exist.
+        ValueError: If a requested column is not in the file.
+    """
+    parquet_path = Path(parquet_path)
+    if not parquet_path.is_file():
+        raise FileNotFoundError(f"Input file does not exist: {parquet_path}")
+    lf = pl.scan_parquet(parquet_path)
+    names = lf.collect_schema().names()
+    if columns is None:
+        excluded = (schema.ID_COLUMN, schema.TARGET_COLUMN)
+        columns = [name for name in names if name not in excluded]
+    else:
+        columns = list(columns)
+        unknown = [name for name in columns if name not in names]
+        if unknown:
+            raise ValueError(f"Columns not found in {parquet_path.name}: {unknown}")
+
+    files = matrix_files(parquet_path)
+    if not force and _is_current(files, parquet_path, columns):
+        logger.info(f"Skipping {parquet_path.name}: the matrix export is up to date")
+        return files
+
+    files.sidecar.unlink(missing_ok=True)
+    n_rows = lf.select(pl.len()).collect().item()
+    temp_features = _temp_path(files.features)
+    features = np.lib.format.open_memmap(
+        temp_features,
+        mode="w+",
+        dtype=MATRIX_DTYPE,
+        shape=(n_rows, len(columns)),
+        fortran_order=True,
+    )
+    for index, name in enumerate(columns):
+        values = lf.select(pl.col(name).cast(pl.Float32)).collect()
+        features[:, index] = values.to_series().to_numpy()
+    features.flush()
+    del features
+    temp_features.replace(files.features)
+
+    has_target = write_labels(lf, files)
+
+    file_cache.write_json(
+        files.sidecar,
+        {
+            "source": str(parquet_path.resolve()),
+            "source_fingerprint": file_cache.fingerprint(parquet_path),
+            "columns": columns,
+            "shape": [n_rows, len(columns)],
+            "dtype": np.dtype(MATRIX_DTYPE).name,
+            "order": "F",
+            "has_target": has_target,
+        },
+    )
+    logger.info(
+        f"Saving {n_rows:,} x {len(columns)} matrix of {parquet_path.name} "
+        f"to {files.features.name}"
+    )
+    return files
+
+
+def write_labels(lf: pl.LazyFrame, files: MatrixFiles) -> bool:
+    """
+    Write the ids (int64) and, when present, the target (int8) as ``.npy`` files.
+
+    Args:
+        lf (pl.LazyFrame): Scan of the interim file.
+        files (MatrixFiles): Locations returned by ``matrix_files``.
+
+    Returns:
+        bool: Whether the file has a target column.
+    """
+    ids = lf.select(schema.ID_COLUMN).collect().to_series()
+    _save_array(files.ids, ids.cast(pl.Int64).to_numpy())
+    has_target = schema.TARGET_COLUMN in lf.collect_schema().names()
+    if has_target:
+        target = lf.select(schema.TARGET_COLUMN).collect().to_series()
+        _save_array(files.target, target.cast(pl.Int8).to_numpy())
+    else:
+        files.target.unlink(missing_ok=True)
+    return has_target
+
+
+def load_matrix(parquet_path: Union[str, Path], mmap_mode: str = "r") -> TrainingMatrix:
+    """
+    Memory-map the arrays exported for an interim Parquet file.
+
+    Args:
+        parquet_path (Union[str, Path]): Interim Parquet file whose matrix was
+            exported with ``export_matrix``.
+        mmap_mode (str): Mode passed to ``np.load``; "r" shares pages read-only.
+
+    Returns:
+        TrainingMatrix: Memory-mapped features, target (None for the test
+            split) and ids, with the feature names.
+
+    Raises:
+        FileNotFoundError: If no export exists for the file.
+        ValueError: If the file changed since it was exported, so the arrays
+            no longer describe it; call ``export_matrix`` again.
+    """
+    files = matrix_files(parquet_path)
+    sidecar = file_cache.read_json(files.sidecar)
+    if sidecar is None:
+        raise FileNotFoundError(f"No matrix export found for: {parquet_path}")
+    if not file_cache.matches(parquet_path, sidecar.get("source_fingerprint", {})):
+        raise ValueError(f"Matrix export is stale, re-export it: {parquet_path}")
+    target = None
+    if sidecar.get("has_target"):
+        target = np.load(files.target, mmap_mode=mmap_mode)
+    return TrainingMatrix(
+        features=np.load(files.features, mmap_mode=mmap_mode),
+        target=target,
+        ids=np.load(files.ids, mmap_mode=mmap_mode),
+        columns=sidecar["columns"],
+    )
@@ -0,0 +1,194 @@
+import logging
+from pathlib import Path
+from typing import Iterable, Union
+import polars as pl
+from src.data_understanding import schema
+from src.utils import file_cache
+
+logger = logging.getLogger(__name__)
+
+# Quantiles reported for every column
+QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.99)
+
+# Separator between column and statistic names in the wide aggregation
+_SEPARATOR = "::"
+
+# Per-column statistics, in report order
+STATISTICS = (
+    "count",
+    "missing",
+    "n_unique",
+    "min",
+    "max",
+    "mean",
+    *(f"p{round(q * 100):02d}" for q in QUANTILES),
+)
+
+
+def _stat_expressions(name: str, dtype: pl.DataType) -> list[pl.Expr]:
+    """Aggregations for one column, aliased as ``<column>::<statistic>``."""
+    column = pl.col(name)
+    values = column.cast(pl.Float64)
+    missing = column.null_count()
+    if dtype.is_numeric():
+        # Files converted with sentinel_to_null=False still hold -1 for missing
+        is_sentinel = column == schema.MISSING_SENTINEL
+        missing = missing + is_sentinel.sum()
+        values = values.filter(~is_sentinel)
+
+    expressions = {
+        "count": column.len(),
+        "missing": missing,
+        "n_unique": values.drop_nulls().n_unique(),
+        "min": values.min(),
+        "max": values.max(),
+        "mean": values.mean(),
+    }
+    for q, stat in zip(QUANTILES, STATISTICS[-len(QUANTILES) :]):
+        expressions[stat] = values.quantile(q, interpolation="nearest")
+    return [
+        expr.cast(pl.Float64).alias(f"{name}{_SEPARATOR}{stat}")
+        for stat, expr in expressions.items()
+    ]
+
+
+def _to_long(wide: pl.DataFrame, columns: list[str], by_target: bool) -> pl.DataFrame:
+    """Reshape one row per class of ``<column>::<statistic>`` into one row per column."""
+    rows = []
+    for record in wide.iter_rows(named=True):
+        target = record.get(schema.TARGET_COLUMN) if by_target else None
+        for name in columns:
+            row = {"column": name, "target": target}
+            for stat in STATISTICS:
+                row[stat] = record[f"{name}{_SEPARATOR}{stat}"]
+            rows.append(row)
+
+    report_schema = {"column": pl.String, "target": pl.Int8}
+    report_schema.update({stat: pl.Float64 for stat in STATISTICS})
+    report = pl.DataFrame(rows, schema=report_schema, orient="row")
+    return report.with_columns(
+        pl.col("count", "missing", "n_unique").cast(pl.Int64),
+        missing_rate=pl.col("missing") / pl.col("count"),
+    )
+
+
+def profile(
+    source: Union[str, Path, pl.LazyFrame],
+    columns: Union[Iterable[str], None] = None,
+    by_target: bool = True,
+) -> pl.DataFrame:
+    """
+    Profile missing rates, cardinalities and value distributions in one pass.
+
+    All statistics for all columns are expressed as a single aggregation. The
+    overall and per-class aggregations share one scan of the data through
+    ``pl.collect_all`` and run on the streaming engine, so no column is read
+    twice and the file is never fully materialised.
+
+    Args:
+        source (Union[str, Path, pl.LazyFrame]): Interim Parquet file (or
+            partitioned directory) or an existing LazyFrame.
+        columns (Union[Iterable[str], None]): Columns to profile. Defaults to
+            every column except the id and the target.
+        by_target (bool): Whether to add per-class rows when the target column
+            is present.
+
+    Returns:
+        pl.DataFrame: One row per column for the whole data (``target`` null)
+            and, if requested, one row per column and class, with the count,
+            missing count and rate, number of distinct values, min, max, mean
+            and quantiles. The ``-1`` sentinel counts as missing and is left
+            out of the other statistics.
+    """
+    lf = source if isinstance(source, pl.LazyFrame) else pl.scan_parquet(source)
+    file_schema = lf.collect_schema()
+    if columns is None:
+        columns = [
+            name
+            for name in file_schema.names()
+            if name not in (schema.ID_COLUMN, schema.TARGET_COLUMN)
+        ]
+    else:
+        columns = list(columns)
+
+    expressions = [
+        expr for name in columns for expr in _stat_expressions(name, file_schema[name])
+    ]
+    by_target = by_target and schema.TARGET_COLUMN in file_schema
+    queries = [lf.select(expressions)]
+    if by_target:
+        queries.append(
+            lf.group_by(schema.TARGET_COLUMN)
+            .agg(expressions)
+            .sort(schema.TARGET_COLUMN)
+        )
+    results = pl.collect_all(queries, engine="streaming")
+
+    report = _to_long(results[0], columns, by_target=False)
+    if by_target:
+        report = pl.concat([report, _to_long(results[1], columns, by_target=True)])
+    return report.select("column", "target", "missing_rate", *STATISTICS)
+
+
+def profile_file(
+    path: Union[str, Path],
+    cache_dir: Union[str, Path, None] = None,
+    by_target: bool = True,
+) -> pl.DataFrame:
+    """
+    Profile an interim Parquet file, reusing a cached report when possible.
+
+    Reports are cached as ``<stem>-<content hash>.parquet`` in ``cache_dir``,
+    so an unchanged file is profiled only once.
+
+    Args:
+        path (Union[str, Path]): Interim Parquet file.
+        cache_dir (Union[str, Path, None]): Directory for cached reports, or
+            None to disable caching.
+        by_target (bool): Whether to add per-class rows.
+
+    Returns:
+        pl.DataFrame: Report as returned by ``profile``.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    path = Path(path)
+    if not path.is_file():
+        raise FileNotFoundError(f"Input file does not exist: {path}")
+    if cache_dir is None:
+        return profile(path, by_target=by_target)
+
+    suffix = "" if by_target else "-overall"
+    cached = Path(cache_dir) / (
+        f"{path.stem}-{file_cache.content_hash(path)}{suffix}.parquet"
+    )
+    if cached.exists():
+        logger.info(f"Loading cached profile of {path.name}")
+        return pl.read_parquet(cached)
+
+    report = profile(path, by_target=by_target)
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    report.write_parquet(cached)
+    return report
+
+
+def write_report(report: pl.DataFrame, path: Union[str, Path]) -> None:
+    """
+    Save a profiling report as Parquet or JSON, depending on the suffix.
+
+    Args:
+        report (pl.DataFrame): Report returned by ``profile``.
+        path (Union[str, Path]): Destination ending in ``.parquet`` or ``.json``.
+
+    Raises:
+        ValueError: If the suffix is neither ``.parquet`` nor ``.json``.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        report.write_parquet(path)
+    elif suffix == ".json":
+        report.write_json(path)
+    else:
+        raise ValueError(f"Report must be .parquet or .json, got: {path.suffix}")
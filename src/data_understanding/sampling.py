@@ -0,0 +1,206 @@
+import logging
+from pathlib import Path
+from typing import Union
+import numpy as np
+import polars as pl
+from src.data_understanding import schema
+from src.utils import file_cache, hashing
+
+logger = logging.getLogger(__name__)
+
+# Sampling methods of sample_file
+METHODS = ("stratified", "downsample")
+
+# Inverse inclusion probability of each sampled row
+WEIGHT_COLUMN = "sample_weight"
+
+# Offsets the hash seed so samples are independent of the CV folds and noise
+# derived from the same seed
+_SEED_OFFSET = 1_000_003
+
+_HASH = "__sample_hash"
+
+
+def _sample_hash(seed: int) -> pl.Expr:
+    return hashing.row_hash(schema.ID_COLUMN, seed + _SEED_OFFSET)
+
+
+def stratified(lf: pl.LazyFrame, fraction: float, seed: int = 0) -> pl.LazyFrame:
+    """
+    Draw the same fraction of each class without loading the file.
+
+    Every row gets a seeded hash of its id and, within each class, the rows
+    with the ``round(fraction * class size)`` smallest hashes are kept. This
+    is bottom-k sampling: like reservoir sampling it draws a uniform sample of
+    fixed size in one streaming pass, but its result does not depend on row
+    order, and a larger fraction always contains a smaller one. Only the id
+    and target columns are read to find the per-class hash thresholds.
+
+    Args:
+        lf (pl.LazyFrame): Frame with the id and target columns.
+        fraction (float): Share of each class to keep, in (0, 1].
+        seed (int): Seed of the hash.
+
+    Returns:
+        pl.LazyFrame: Sampled rows with a ``sample_weight`` column holding the
+            class size divided by the sampled class size.
+
+    Raises:
+        ValueError: If the fraction is not in (0, 1].
+    """
+    if not 0 < fraction <= 1:
+        raise ValueError(f"Fraction must be in (0, 1], got: {fraction}")
+    target = pl.col(schema.TARGET_COLUMN)
+    hashed = lf.select(target, _sample_hash(seed).alias(_HASH))
+    sizes = hashed.group_by(schema.TARGET_COLUMN).len().collect(engine="streaming")
+
+    thresholds, weights = {}, {}
+    for label, size in sizes.iter_rows():
+        k = max(1, round(fraction * size))
+        threshold = (
+            hashed.filter(target == label)
+            .select(pl.col(_HASH).bottom_k(k).max())
+            .collect(engine="streaming")
+            .item()
+        )
+        thresholds[label] = threshold
+        weights[label] = size / k
+
+    return (
+        lf.with_columns(_sample_hash(seed).alias(_HASH))
+        .filter(
+            pl.col(_HASH) <= target.replace_strict(thresholds, return_dtype=pl.UInt64)
+        )
+        .drop(_HASH)
+        .with_columns(
+            target.replace_strict(weights, return_dtype=pl.Float32).alias(WEIGHT_COLUMN)
+        )
+    )
+
+
+def downsample_negatives(
+    lf: pl.LazyFrame, negative_rate: float, seed: int = 0
+) -> pl.LazyFrame:
+    """
+    Keep every positive and a seeded share of the negatives.
+
+    A negative is kept when the hash of its id, mapped to [0, 1), falls below
+    ``negative_rate``, so the decision is made row by row in a single
+    streaming pass.
+
+    Args:
+        lf (pl.LazyFrame): Frame with the id and target columns.
+        negative_rate (float): Share of negatives to keep, in (0, 1].
+        seed (int): Seed of the hash.
+
+    Returns:
+        pl.LazyFrame: Sampled rows with a ``sample_weight`` column, 1 for
+            positives and ``1 / negative_rate`` for negatives.
+
+    Raises:
+        ValueError: If the rate is not in (0, 1].
+    """
+    if not 0 < negative_rate <= 1:
+        raise ValueError(f"Negative rate must be in (0, 1], got: {negative_rate}")
+    positive = pl.col(schema.TARGET_COLUMN) == 1
+    kept = hashing.unit_interval(_sample_hash(seed)) < negative_rate
+    return lf.filter(positive | kept).with_columns(
+        pl.when(positive)
+        .then(1.0)
+        .otherwise(1.0 / negative_rate)
+        .cast(pl.Float32)
+        .alias(WEIGHT_COLUMN)
+    )
+
+
+def recalibrate(probability, negative_rate: float) -> np.ndarray:
+    """
+    Map probabilities of a model fit on downsampled negatives to the full data.
+
+    Downsampling negatives multiplies the odds by ``1 / negative_rate``, so
+    the odds are scaled back by ``negative_rate``.
+
+    Args:
+        probability: Predicted probabilities of the downsampled model.
+        negative_rate (float): Share of negatives kept when sampling.
+
+    Returns:
+        np.ndarray: Calibrated probabilities.
+    """
+    probability = np.asarray(probability, dtype=np.float64)
+    scaled = probability * negative_rate
+    return scaled / (scaled + 1.0 - probability)
+
+
+def sample_path(
+    path: Union[str, Path],
+    cache_dir: Union[str, Path],
+    method: str,
+    fraction: float,
+    seed: int,
+) -> Path:
+    """
+    Name the cached sample of a file.
+
+    The name holds the content hash of the source and every parameter, e.g.
+    ``train-<hash>-stratified-f0.1-s0.parquet``, so a changed file or
+    parameter never reuses a stale sample.
+    """
+    path = Path(path)
+    digest = file_cache.content_hash(path)
+    return (
+        Path(cache_dir) / f"{path.stem}-{digest}-{method}-f{fraction:g}-s{seed}.parquet"
+    )
+
+
+def sample_file(
+    path: Union[str, Path],
+    cache_dir: Union[str, Path],
+    method: str = "stratified",
+    fraction: float = 0.1,
+    seed: int = 0,
+) -> Path:
+    """
+    Write a sample of an interim train file, reusing a cached one when possible.
+
+    Args:
+        path (Union[str, Path]): Interim train Parquet file.
+        cache_dir (Union[str, Path]): Directory of the cached samples.
+        method (str): "stratified" for the same fraction of each class or
+            "downsample" for every positive and a fraction of the negatives.
+        fraction (float): Share of rows (stratified) or negatives (downsample)
+            to keep.
+        seed (int): Seed of the sample.
+
+    Returns:
+        Path: Parquet file of the sample, with a ``sample_weight`` column.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the method is unknown, the fraction is out of range or
+            the file has no target column.
+    """
+    path = Path(path)
+    if not path.is_file():
+        raise FileNotFoundError(f"Input file does not exist: {path}")
+    if method not in METHODS:
+        raise ValueError(f"Method must be one of {METHODS}, got: {method}")
+    lf = pl.scan_parquet(path)
+    if schema.TARGET_COLUMN not in lf.collect_schema().names():
+        raise ValueError(f"Sampling needs a target column: {path}")
+
+    output = sample_path(path, cache_dir, method, fraction, seed)
+    if output.exists():
+        logger.info(f"Loading cached {method} sample of {path.name}")
+        return output
+
+    if method == "stratified":
+        sampled = stratified(lf, fraction, seed)
+    else:
+        sampled = downsample_negatives(lf, fraction, seed)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    temp_output = output.with_name(output.name + ".tmp")
+    sampled.sink_parquet(temp_output)
+    temp_output.replace(output)
+    logger.info(f"Saving {method} sample of {path.name} to {output.name}")
+    return output
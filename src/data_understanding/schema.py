@@ -0,0 +1,305 @@
+from pathlib import Path
+from typing import Iterable, Union
+import polars as pl
+
+# Porto Seguro identifier and label columns
+ID_COLUMN = "id"
+TARGET_COLUMN = "target"
+
+# Value used by the raw extracts to flag a missing observation
+MISSING_SENTINEL = -1
+
+# Raw feature columns, in the order they appear in the competition extracts
+FEATURE_COLUMNS = (
+    "ps_ind_01",
+    "ps_ind_02_cat",
+    "ps_ind_03",
+    "ps_ind_04_cat",
+    "ps_ind_05_cat",
+    "ps_ind_06_bin",
+    "ps_ind_07_bin",
+    "ps_ind_08_bin",
+    "ps_ind_09_bin",
+    "ps_ind_10_bin",
+    "ps_ind_11_bin",
+    "ps_ind_12_bin",
+    "ps_ind_13_bin",
+    "ps_ind_14",
+    "ps_ind_15",
+    "ps_ind_16_bin",
+    "ps_ind_17_bin",
+    "ps_ind_18_bin",
+    "ps_reg_01",
+    "ps_reg_02",
+    "ps_reg_03",
+    "ps_car_01_cat",
+    "ps_car_02_cat",
+    "ps_car_03_cat",
+    "ps_car_04_cat",
+    "ps_car_05_cat",
+    "ps_car_06_cat",
+    "ps_car_07_cat",
+    "ps_car_08_cat",
+    "ps_car_09_cat",
+    "ps_car_10_cat",
+    "ps_car_11_cat",
+    "ps_car_11",
+    "ps_car_12",
+    "ps_car_13",
+    "ps_car_14",
+    "ps_car_15",
+    "ps_calc_01",
+    "ps_calc_02",
+    "ps_calc_03",
+    "ps_calc_04",
+    "ps_calc_05",
+    "ps_calc_06",
+    "ps_calc_07",
+    "ps_calc_08",
+    "ps_calc_09",
+    "ps_calc_10",
+    "ps_calc_11",
+    "ps_calc_12",
+    "ps_calc_13",
+    "ps_calc_14",
+    "ps_calc_15_bin",
+    "ps_calc_16_bin",
+    "ps_calc_17_bin",
+    "ps_calc_18_bin",
+    "ps_calc_19_bin",
+    "ps_calc_20_bin",
+)
+
+# Unsuffixed features that hold real-valued measurements rather than ordinals
+CONTINUOUS_COLUMNS = frozenset(
+    {
+        "ps_reg_01",
+        "ps_reg_02",
+        "ps_reg_03",
+        "ps_car_12",
+        "ps_car_13",
+        "ps_car_14",
+        "ps_car_15",
+        "ps_calc_01",
+        "ps_calc_02",
+        "ps_calc_03",
+    }
+)
+
+# Largest level of each categorical feature in the competition extracts; the
+# levels are non-negative codes, -1 aside
+CATEGORY_MAX_LEVELS = {
+    "ps_ind_02_cat": 4,
+    "ps_ind_04_cat": 1,
+    "ps_ind_05_cat": 6,
+    "ps_car_01_cat": 11,
+    "ps_car_02_cat": 1,
+    "ps_car_03_cat": 1,
+    "ps_car_04_cat": 9,
+    "ps_car_05_cat": 1,
+    "ps_car_06_cat": 17,
+    "ps_car_07_cat": 1,
+    "ps_car_08_cat": 1,
+    "ps_car_09_cat": 4,
+    "ps_car_10_cat": 2,
+    "ps_car_11_cat": 104,
+}
+
+# Storage dtype for each column family
+FAMILY_DTYPES = {
+    "id": pl.Int32,
+    "target": pl.Int8,
+    "bin": pl.Boolean,
+    "cat": pl.Int8,
+    "ordinal": pl.Int8,
+    "continuous": pl.Float32,
+}
+
+# Dtype used to parse each family from CSV text (binary flags are mapped afterwards)
+PARSE_DTYPES = {**FAMILY_DTYPES, "bin": pl.Int8}
+
+
+def column_family(name: str) -> Union[str, None]:
+    """
+    Classify a Porto Seguro column into its family.
+
+    Args:
+        name (str): Column name as it appears in the CSV header.
+
+    Returns:
+        Union[str, None]: One of "id", "target", "bin", "cat", "continuous" or
+            "ordinal", or None when the column is not a Porto Seguro column.
+    """
+    if name == ID_COLUMN:
+        return "id"
+    if name == TARGET_COLUMN:
+        return "target"
+    if not name.startswith("ps_"):
+        return None
+    if name.endswith("_bin"):
+        return "bin"
+    if name.endswith("_cat"):
+        return "cat"
+    if name in CONTINUOUS_COLUMNS:
+        return "continuous"
+    return "ordinal"
+
+
+def columns_by_family(columns: Iterable[str], family: str) -> list[str]:
+    """Return the columns of ``columns`` that belong to ``family``, in order."""
+    return [name for name in columns if column_family(name) == family]
+
+
+def expected_columns(include_target: bool = True) -> list[str]:
+    """
+    List the full Porto Seguro header.
+
+    Args:
+        include_target (bool): Whether to include the label column (train split).
+
+    Returns:
+        list[str]: Expected column names in file order.
+    """
+    head = [ID_COLUMN, TARGET_COLUMN] if include_target else [ID_COLUMN]
+    return head + list(FEATURE_COLUMNS)
+
+
+def read_header(path: Union[str, Path], separator: str = ",") -> list[str]:
+    """
+    Read the column names of a CSV file without scanning its body.
+
+    Args:
+        path (Union[str, Path]): Path to the CSV file.
+        separator (str): Field separator.
+
+    Returns:
+        list[str]: Column names from the first line.
+    """
+    with open(path, encoding="utf-8") as handle:
+        line = handle.readline()
+    return parse_header(line, separator)
+
+
+def parse_header(line: str, separator: str = ",") -> list[str]:
+    """Split a CSV header line into column names."""
+    return [name.strip().strip('"') for name in line.rstrip("\r\n").split(separator)]
+
+
+def check_columns(columns: Iterable[str]) -> None:
+    """
+    Verify that a header matches the Porto Seguro layout.
+
+    The target column is optional so that the test split passes as well.
+
+    Args:
+        columns (Iterable[str]): Column names to check.
+
+    Raises:
+        ValueError: If a Porto Seguro column is missing or an unknown column is present.
+    """
+    columns = list(columns)
+    present = set(columns)
+    missing = [
+        name for name in expected_columns(include_target=False) if name not in present
+    ]
+    if missing:
+        raise ValueError(f"Missing expected columns: {missing}")
+    unknown = [name for name in columns if column_family(name) is None]
+    if unknown:
+        raise ValueError(f"Unknown columns: {unknown}")
+
+
+def parse_schema(columns: Iterable[str]) -> dict[str, pl.DataType]:
+    """
+    Build the CSV parsing dtypes for the recognised columns of a header.
+
+    Args:
+        columns (Iterable[str]): Column names from the CSV header.
+
+    Returns:
+        dict[str, pl.DataType]: Parsing dtype per recognised column. Unknown
+            columns are left out so that Polars can infer them.
+    """
+    schema = {}
+    for name in columns:
+        family = column_family(name)
+        if family is not None:
+            schema[name] = PARSE_DTYPES[family]
+    return schema
+
+
+def storage_schema(columns: Iterable[str]) -> dict[str, pl.DataType]:
+    """Return the dtype each recognised column is stored with after conversion."""
+    schema = {}
+    for name in columns:
+        family = column_family(name)
+        if family is not None:
+            schema[name] = FAMILY_DTYPES[family]
+    return schema
+
+
+def cast_expressions(columns: Iterable[str], strict: bool = False) -> list[pl.Expr]:
+    """
+    Build the expressions that turn parsed columns into their storage dtypes.
+
+    Binary flags are mapped from {0, 1} to Boolean. A Boolean cannot hold the
+    -1 sentinel, so flags store it as null even when the sentinel is otherwise
+    kept (``sentinel_to_null=False``). In strict mode any other non-null value
+    raises during execution, and so does a categorical level
+    outside 0..``CATEGORY_MAX_LEVELS`` (or the -1 sentinel). Otherwise
+    out-of-domain flags become null (count them with ``invalid_flag_counts``)
+    and categorical levels are kept. Ordinal and continuous columns are only
+    checked against their parsing dtype, so e.g. an ordinal above 127 fails to
+    parse as Int8 but a negative ordinal is stored as is.
+
+    Args:
+        columns (Iterable[str]): Column names from the CSV header.
+        strict (bool): Whether out-of-domain values should raise.
+
+    Returns:
+        list[pl.Expr]: One expression per binary column and, in strict mode,
+            per categorical column with known levels.
+    """
+    columns = list(columns)
+    mapping = {0: False, 1: True}
+    expressions = []
+    for name in columns_by_family(columns, "bin"):
+        if strict:
+            expr = pl.col(name).replace_strict(
+                {**mapping, MISSING_SENTINEL: None}, return_dtype=pl.Boolean
+            )
+        else:
+            expr = pl.col(name).replace_strict(
+                mapping, default=None, return_dtype=pl.Boolean
+            )
+        expressions.append(expr)
+    if strict:
+        for name in columns_by_family(columns, "cat"):
+            high = CATEGORY_MAX_LEVELS.get(name)
+            if high is None:
+                continue
+            levels = [MISSING_SENTINEL, *range(high + 1)]
+            expressions.append(
+                pl.col(name).replace_strict(levels, levels, return_dtype=pl.Int8)
+            )
+    return expressions
+
+
+def invalid_flag_counts(columns: Iterable[str]) -> list[pl.Expr]:
+    """
+    Count the parsed binary flag values that non-strict casting turns to null.
+
+    Values other than 0, 1 and the -1 sentinel are counted, so corrupt flags
+    can be told apart from genuinely missing ones.
+
+    Args:
+        columns (Iterable[str]): Column names from the CSV header.
+
+    Returns:
+        list[pl.Expr]: One count per binary column, named after it.
+    """
+    valid = [0, 1, MISSING_SENTINEL]
+    return [
+        (pl.col(name).is_not_null() & ~pl.col(name).is_in(valid)).sum().alias(name)
+        for name in columns_by_family(columns, "bin")
+    ]
@@ -0,0 +1,267 @@
+import logging
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Union
+import numpy as np
+import polars as pl
+from polars.exceptions import PolarsError
+from src.data_understanding import data_collection, schema
+from src.utils import file_cache
+
+logger = logging.getLogger(__name__)
+
+# Duplicate ids quoted in a violation message
+MAX_EXAMPLES = 5
+
+
+@dataclass(frozen=True)
+class ValidationReport:
+    """
+    Outcome of validating a raw extract.
+
+    ``complete`` is False when the scan stopped at the first failing batch,
+    in which case ``rows`` only counts the rows read so far.
+    """
+
+    rows: int
+    columns: list[str]
+    violations: list[str]
+    complete: bool
+
+    @property
+    def passed(self) -> bool:
+        return not self.violations
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, document: dict) -> "ValidationReport":
+        return cls(**document)
+
+
+def validation_path(
+    path: Union[str, Path], cache_dir: Union[str, Path, None] = None
+) -> Path:
+    """Cached report of a file: ``<cache_dir>/<file name>.validation.json``."""
+    path = Path(path)
+    directory = Path(cache_dir) if cache_dir is not None else path.parent
+    return directory / f"{path.name}.validation.json"
+
+
+def header_violations(columns: list[str]) -> list[str]:
+    """
+    Compare a header with the Porto Seguro layout.
+
+    The target column is optional so that the test split passes as well.
+
+    Args:
+        columns (list[str]): Column names from the CSV header.
+
+    Returns:
+        list[str]: One message per problem; empty if the header is valid.
+    """
+    violations = []
+    present = set(columns)
+    missing = [
+        name
+        for name in schema.expected_columns(include_target=False)
+        if name not in present
+    ]
+    if missing:
+        violations.append(f"Missing expected columns: {missing}")
+    unknown = [name for name in columns if schema.column_family(name) is None]
+    if unknown:
+        violations.append(f"Unknown columns: {unknown}")
+    duplicated = sorted({name for name in columns if columns.count(name) > 1})
+    if duplicated:
+        violations.append(f"Duplicated columns: {duplicated}")
+    return violations
+
+
+def _domain(name: str) -> tuple[pl.Expr, str]:
+    """Expression flagging out-of-domain values of a raw column, and the domain."""
+    value = pl.col(name)
+    family = schema.column_family(name)
+    sentinel = value == schema.MISSING_SENTINEL
+    if family == "id":
+        return value < 0, "non-negative integers"
+    if family == "target":
+        return ~value.is_in([0, 1]), "{0, 1}"
+    if family == "bin":
+        return ~value.is_in([0, 1, schema.MISSING_SENTINEL]), "{0, 1, -1}"
+    if family == "cat":
+        high = schema.CATEGORY_MAX_LEVELS.get(name)
+        if high is None:
+            return (value < 0) & ~sentinel, "non-negative levels or -1"
+        return ((value < 0) | (value > high)) & ~sentinel, f"0..{high} or -1"
+    if family == "continuous":
+        return ((value < 0) | value.is_nan()) & ~sentinel, "non-negative or -1"
+    return (value < 0) & ~sentinel, "non-negative integers or -1"
+
+
+def _batch_counts(frame: pl.DataFrame, domains: dict) -> dict[str, tuple[int, int]]:
+    """Empty and out-of-domain value counts of each Porto Seguro column."""
+    counts = frame.select(
+        expression
+        for name, (outside, _) in domains.items()
+        for expression in (
+            pl.col(name).null_count().alias(f"{name}:null"),
+            outside.sum().alias(f"{name}:domain"),
+        )
+    ).row(0, named=True)
+    return {
+        name: (counts[f"{name}:null"], counts[f"{name}:domain"] or 0)
+        for name in domains
+    }
+
+
+def validate(
+    path: Union[str, Path],
+    expected_rows: Union[int, None] = None,
+    fail_fast: bool = True,
+    chunk_size: Union[int, None] = None,
+) -> ValidationReport:
+    """
+    Check a raw CSV extract in a single streaming pass.
+
+    The header is checked first and a bad header stops the validation before
+    any data is read. The body is then parsed in bounded batches with the
+    declared dtypes, keeping the ``-1`` sentinel, and each batch is checked in
+    one aggregation: no empty fields, ``_bin`` in {0, 1, -1}, ``_cat`` within
+    the known levels, ordinals and continuous features non-negative (or -1),
+    the target in {0, 1} and ids unique. With ``fail_fast`` the pass stops at
+    the first failing batch. Values that cannot be parsed as their declared
+    dtype are reported as a violation too.
+
+    Args:
+        path (Union[str, Path]): Plain or compressed CSV file.
+        expected_rows (Union[int, None]): Number of data rows the file must
+            have, or None to only require at least one.
+        fail_fast (bool): Whether to stop at the first failing batch.
+        chunk_size (Union[int, None]): Approximate bytes parsed per batch,
+            None for the conversion default.
+
+    Returns:
+        ValidationReport: Rows, header and violations found.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    path = Path(path)
+    if not path.is_file():
+        raise FileNotFoundError(f"Input file does not exist: {path}")
+    chunk_size = chunk_size or data_collection.DEFAULT_CHUNK_SIZE
+
+    with data_collection.open_input(path) as stream:
+        columns = schema.parse_header(stream.readline().decode("utf-8"))
+        violations = header_violations(columns)
+        if violations:
+            return ValidationReport(0, columns, violations, complete=False)
+
+        domains = {name: _domain(name) for name in columns}
+        batches = data_collection.iter_csv_batches(
+            stream, columns, sentinel_to_null=False, chunk_size=chunk_size, cast=False
+        )
+        rows, ids, complete = 0, [], True
+        try:
+            for _, frame in batches:
+                start = rows
+                rows += len(frame)
+                batch_ids = frame[schema.ID_COLUMN]
+                ids.append(batch_ids.drop_nulls().to_numpy())
+                for name, (empty, outside) in _batch_counts(frame, domains).items():
+                    if empty:
+                        violations.append(
+                            f"{empty:,} empty values of {name} in rows {start + 1:,}-{rows:,}"
+                        )
+                    if outside:
+                        violations.append(
+                            f"{outside:,} values of {name} outside "
+                            f"{domains[name][1]} in rows {start + 1:,}-{rows:,}"
+                        )
+                if batch_ids.is_duplicated().any():
+                    violations.append(f"Duplicate ids in rows {start + 1:,}-{rows:,}")
+                if violations and fail_fast:
+                    complete = False
+                    break
+        except PolarsError as e:
+            violations.append(f"Unparseable values after row {rows:,}: {e}")
+            complete = False
+
+    if complete:
+        all_ids = np.sort(np.concatenate(ids)) if ids else np.array([])
+        repeated = np.unique(all_ids[1:][all_ids[1:] == all_ids[:-1]])
+        if len(repeated) and not any(v.startswith("Duplicate ids") for v in violations):
+            examples = repeated[:MAX_EXAMPLES].tolist()
+            violations.append(f"{len(repeated):,} duplicate ids, e.g. {examples}")
+        if rows == 0:
+            violations.append("No data rows")
+        elif expected_rows is not None and rows != expected_rows:
+            violations.append(f"Expected {expected_rows:,} rows, found {rows:,}")
+    return ValidationReport(rows, columns, violations, complete)
+
+
+def validate_file(
+    path: Union[str, Path],
+    cache_dir: Union[str, Path, None] = None,
+    expected_rows: Union[int, None] = None,
+    fail_fast: bool = True,
+    force: bool = False,
+) -> ValidationReport:
+    """
+    Validate a raw extract, reusing the cached report of an unchanged file.
+
+    The report is cached as JSON with the file's fingerprint and the
+    validation options. The content hash is only recomputed when the file's
+    modification time changed (see ``file_cache.matches``), so revalidating an
+    unchanged file costs a ``stat``.
+
+    Args:
+        path (Union[str, Path]): Plain or compressed CSV file.
+        cache_dir (Union[str, Path, None]): Directory of the cached report.
+            Defaults to the file's directory.
+        expected_rows (Union[int, None]): See ``validate``.
+        fail_fast (bool): See ``validate``.
+        force (bool): Whether to validate even if a cached report matches.
+
+    Returns:
+        ValidationReport: Cached or fresh report.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    path = Path(path)
+    if not path.is_file():
+        raise FileNotFoundError(f"Input file does not exist: {path}")
+    options = {"expected_rows": expected_rows, "fail_fast": fail_fast}
+    cached = validation_path(path, cache_dir)
+    document = file_cache.read_json(cached)
+    if (
+        not force
+        and document is not None
+        and document.get("options") == options
+        and file_cache.matches(path, document.get("source_fingerprint", {}))
+    ):
+        logger.info(f"Skipping validation of {path.name}: the cached report is current")
+        return ValidationReport.from_dict(document["report"])
+
+    fingerprint = file_cache.fingerprint(path)
+    report = validate(path, expected_rows=expected_rows, fail_fast=fail_fast)
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    file_cache.write_json(
+        cached,
+        {
+            "source": str(path.resolve()),
+            "source_fingerprint": fingerprint,
+            "options": options,
+            "report": report.to_dict(),
+        },
+    )
+    if report.passed:
+        logger.info(f"Validated {report.rows:,} rows of {path.name}")
+    else:
+        logger.warning(
+            f"Validation of {path.name} found {len(report.violations)} problems"
+        )
+    return report
@@ -1,18 +1,90 @@
-from data_understanding import data_collection
+import argparse
+import logging
+from src.utils.log_config import setup_logging
 
 
-def main():
-    # Specify raw data paths
-    train_raw_data_path = "data/raw/train.csv"
-    test_raw_data_path = "data/raw/test.csv"
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert raw Porto Seguro CSV extracts to Parquet."
+    )
+    parser.add_argument(
+        "sources",
+        nargs="?",
+        default="data/raw",
+        help="Directory, glob pattern or manifest file of CSVs to convert.",
+    )
+    parser.add_argument(
+        "--output-dir", default="data/interim", help="Directory for Parquet files."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Number of concurrent conversions."
+    )
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=int,
+        default=None,
+        help="Upper bound on the summed size of files converted at once.",
+    )
+    parser.add_argument(
+        "--strict", action="store_true", help="Fail on schema violations."
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Reconvert files that are up to date."
+    )
+    parser.add_argument(
+        "--export-matrix",
+        action="store_true",
+        help="Also write memory-mappable float32 .npy matrices next to the Parquet.",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Check headers, value domains and ids before converting.",
+    )
+    parser.add_argument("--log-file", default=None, help="Also write debug logs here.")
+    parser.add_argument(
+        "--metrics-file",
+        default=None,
+        help="Append per-stage timings and counters here as JSON lines.",
+    )
+    return parser.parse_args(argv)
 
-    # Specify converted data paths
-    train_parquet_data_path = "data/interim/train.parquet"
-    test_parquet_data_path = "data/interim/test.parquet"
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Heavy imports are deferred until the arguments are known to be valid
+    from src.data_understanding import batch_conversion
+    from src.data_understanding.data_collection import CUSTOM_EMOJIS
+
+    # Process workers forward their records to this process through a queue
+    forward_workers = args.executor == "process"
+    setup_logging(
+        console_level=logging.INFO,
+        log_file=args.log_file,
+        metrics_file=args.metrics_file,
+        emoji_map=CUSTOM_EMOJIS,
+        asynchronous=forward_workers,
+        multiprocess=forward_workers,
+    )
 
     # Convert raw data to parquet format
-    data_collection.convert_data(train_raw_data_path, train_parquet_data_path)
-    data_collection.convert_data(test_raw_data_path, test_parquet_data_path)
+    sources = batch_conversion.resolve_sources(args.sources)
+    memory_budget = None
+    if args.memory_budget_mb is not None:
+        memory_budget = args.memory_budget_mb * 1_000_000
+    batch_conversion.convert_many(
+        sources,
+        args.output_dir,
+        max_workers=args.workers,
+        executor=args.executor,
+        memory_budget=memory_budget,
+        strict=args.strict,
+        force=args.force,
+        export_matrix=args.export_matrix,
+        validate=args.validate,
+    )
 
 
 if __name__ == "__main__":
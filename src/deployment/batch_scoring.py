@@ -0,0 +1,226 @@
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Union
+import numpy as np
+import polars as pl
+from src.data_preparation import features
+from src.data_understanding import data_collection, schema
+from src.modeling import logistic
+from src.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Rows scored per batch; bounds the memory of each in-flight batch
+DEFAULT_BATCH_SIZE = 100_000
+
+
+@dataclass(frozen=True)
+class Scorer:
+    """A fitted feature plan and the model trained on its output columns."""
+
+    plan: features.FeaturePlan
+    model: logistic.LogisticModel
+
+    @classmethod
+    def load(
+        cls, plan_path: Union[str, Path], model_path: Union[str, Path]
+    ) -> "Scorer":
+        """
+        Load a saved feature plan and model.
+
+        Args:
+            plan_path (Union[str, Path]): ``features.json`` or its directory.
+            model_path (Union[str, Path]): Model saved by ``LogisticModel.save``.
+
+        Returns:
+            Scorer: The loaded plan and model.
+
+        Raises:
+            FileNotFoundError: If either file does not exist.
+            ValueError: If the model does not record its feature columns.
+        """
+        plan = features.load_plan(plan_path)
+        if not Path(model_path).is_file():
+            raise FileNotFoundError(f"Model does not exist: {model_path}")
+        model = logistic.LogisticModel.load(model_path)
+        if not model.columns:
+            raise ValueError(f"Model does not record its feature columns: {model_path}")
+        return cls(plan=plan, model=model)
+
+    def score(self, frame: pl.DataFrame) -> pl.DataFrame:
+        """
+        Score a batch of interim rows.
+
+        Args:
+            frame (pl.DataFrame): Rows with the interim (storage) dtypes.
+
+        Returns:
+            pl.DataFrame: The ``id`` and predicted ``target`` of each row.
+        """
+        matrix = (
+            features.transform(frame.lazy(), self.plan)
+            .select(pl.col(name).cast(pl.Float32) for name in self.model.columns)
+            .collect()
+            .to_numpy()
+        )
+        return pl.DataFrame(
+            {
+                schema.ID_COLUMN: frame[schema.ID_COLUMN],
+                schema.TARGET_COLUMN: self.model.predict(matrix).astype(np.float32),
+            }
+        )
+
+
+@dataclass(frozen=True)
+class ScoringReport:
+    """Size and throughput of a batch scoring run."""
+
+    rows: int
+    batches: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+def iter_batches(
+    path: Union[str, Path],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    chunk_size: int = data_collection.DEFAULT_CHUNK_SIZE,
+) -> Iterator[pl.DataFrame]:
+    """
+    Read an interim Parquet file or a raw CSV in bounded row batches.
+
+    Parquet batches are row slices of a lazy scan, so only the row groups
+    covering each slice are read. CSV files, compressed or not, and standard
+    input are parsed in blocks of about ``chunk_size`` bytes with the declared
+    schema, as ``convert_data`` does, and the blocks are cut into batches.
+
+    Args:
+        path (Union[str, Path]): Parquet file, CSV file or "-" for stdin.
+        batch_size (int): Maximum rows per batch.
+        chunk_size (int): Approximate bytes parsed at once from a CSV.
+
+    Yields:
+        pl.DataFrame: Batches with the interim dtypes.
+
+    Raises:
+        ValueError: If the input is neither Parquet nor CSV.
+    """
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be positive, got: {batch_size}")
+    if str(path) != data_collection.STDIN and Path(path).suffix.lower() == ".parquet":
+        lf = pl.scan_parquet(path)
+        n_rows = lf.select(pl.len()).collect().item()
+        for offset in range(0, n_rows, batch_size):
+            yield lf.slice(offset, batch_size).collect()
+        return
+    if not data_collection.is_csv_path(path):
+        raise ValueError(f"Input must be a Parquet or CSV file: {path}")
+
+    with data_collection.open_input(path) as stream:
+        columns = schema.parse_header(stream.readline().decode("utf-8"))
+        chunks = data_collection.iter_csv_batches(
+            stream, columns, chunk_size=chunk_size
+        )
+        for _, frame in chunks:
+            yield from frame.iter_slices(batch_size)
+
+
+def score_file(
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    scorer: Scorer,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = 1,
+    chunk_size: int = data_collection.DEFAULT_CHUNK_SIZE,
+) -> ScoringReport:
+    """
+    Stream a policy file through the feature plan and model to an id,target CSV.
+
+    Batches are scored on a thread pool (Polars and NumPy release the GIL)
+    while at most ``2 * max_workers`` batches are in flight, and predictions
+    are appended to the output in input order as soon as each batch is done.
+    Memory therefore depends on the batch size and worker count, not on the
+    file size. The output is written to a temporary file and renamed when
+    complete, so an interrupted run never leaves a truncated submission.
+
+    Args:
+        input_path (Union[str, Path]): Interim Parquet file, raw CSV file or
+            "-" for stdin.
+        output_path (Union[str, Path]): Output CSV with the ``id`` and
+            ``target`` columns.
+        scorer (Scorer): Loaded feature plan and model.
+        batch_size (int): Maximum rows per batch.
+        max_workers (int): Threads scoring batches concurrently.
+        chunk_size (int): Approximate bytes parsed at once from a CSV.
+
+    Returns:
+        ScoringReport: Rows, batches and elapsed seconds.
+
+    Raises:
+        FileNotFoundError: If the input file does not exist.
+        ValueError: If the input type, batch size, worker count or output
+            directory is invalid.
+    """
+    source_name = str(input_path)
+    if source_name != data_collection.STDIN and not Path(input_path).is_file():
+        raise FileNotFoundError(f"Input file does not exist: {input_path}")
+    if max_workers < 1:
+        raise ValueError(f"Worker count must be positive, got: {max_workers}")
+    output_path = Path(output_path)
+    if not output_path.parent.is_dir():
+        raise ValueError(f"Output directory does not exist: {output_path.parent}")
+
+    temp_output = output_path.with_name(output_path.name + ".tmp")
+    start = time.perf_counter()
+    rows = batches = 0
+    with (
+        metrics.stage("batch_scoring", source=Path(source_name).name) as scoring,
+        ThreadPoolExecutor(max_workers=max_workers) as pool,
+        open(temp_output, "w", encoding="utf-8", newline="") as handle,
+    ):
+        handle.write(f"{schema.ID_COLUMN},{schema.TARGET_COLUMN}\n")
+        pending = deque()
+
+        def write(future) -> None:
+            nonlocal rows, batches
+            scored = future.result()
+            scored.write_csv(handle, include_header=False)
+            rows += len(scored)
+            batches += 1
+            elapsed = time.perf_counter() - start
+            logger.debug(
+                f"Scored batch {batches} ({rows:,} rows, {rows / elapsed:,.0f} rows/s)"
+            )
+
+        try:
+            for batch in iter_batches(input_path, batch_size, chunk_size):
+                pending.append(pool.submit(scorer.score, batch))
+                if len(pending) >= 2 * max_workers:
+                    write(pending.popleft())
+            while pending:
+                write(pending.popleft())
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            handle.close()
+            temp_output.unlink(missing_ok=True)
+            raise
+        scoring.count("rows", rows)
+        scoring.count("batches", batches)
+    temp_output.replace(output_path)
+
+    report = ScoringReport(
+        rows=rows, batches=batches, seconds=time.perf_counter() - start
+    )
+    logger.info(
+        f"Saving {rows:,} predictions to {output_path} in {report.seconds:.2f}s "
+        f"({report.rows_per_second:,.0f} rows/s)"
+    )
+    return report
@@ -0,0 +1,457 @@
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Union
+import numpy as np
+import polars as pl
+from src.data_preparation import features
+from src.data_understanding import schema
+from src.deployment import batch_scoring
+from src.modeling import logistic
+
+logger = logging.getLogger(__name__)
+
+# Rows predicted together at most by the micro-batcher
+DEFAULT_MAX_BATCH_SIZE = 64
+
+# How long the micro-batcher waits for more requests after the first one
+DEFAULT_MAX_WAIT_MS = 2.0
+
+# Most recent request latencies kept for the percentile report
+LATENCY_WINDOW = 10_000
+
+# Largest accepted request body
+MAX_BODY_BYTES = 1 << 20
+
+
+class RecordEncoder:
+    """
+    Turn JSON records into model rows without building a DataFrame.
+
+    Everything ``features.feature_expressions`` derives from the plan is
+    compiled once into index arrays and lookup tables, so encoding a request
+    is a handful of NumPy operations on one small array. Records hold raw
+    values as in the CSV files: ``-1`` or null marks a missing value and
+    binary flags outside {0, 1} are treated as missing, as in ``convert_data``.
+    Values are checked against the dtypes the batch path parses them with
+    (``schema.PARSE_DTYPES``), so a record ``batch_scoring`` would reject is
+    rejected here too. The result matches the batch pipeline for the same rows.
+    """
+
+    def __init__(self, plan: features.FeaturePlan, columns: list[str]):
+        inputs = list(plan.feature_columns)
+        position = {name: index for index, name in enumerate(inputs)}
+        self.inputs = inputs
+        self.columns = list(columns)
+        self._required = frozenset(inputs)
+        # Flags, categories and ordinals parse as integers; record each bound
+        parse_dtypes = [
+            schema.PARSE_DTYPES.get(schema.column_family(name), pl.Float32)
+            for name in inputs
+        ]
+        self._integer = [dtype.is_integer() for dtype in parse_dtypes]
+        bounds = [
+            np.iinfo(pl.Series(dtype=dtype).to_numpy().dtype)
+            if dtype.is_integer()
+            else np.finfo(np.float64)
+            for dtype in parse_dtypes
+        ]
+        self._low = np.array([bound.min for bound in bounds], dtype=np.float64)
+        self._high = np.array([bound.max for bound in bounds], dtype=np.float64)
+        self._binary = np.array(
+            [schema.column_family(name) == "bin" for name in inputs], dtype=bool
+        )
+        ind_bins = [
+            position[name]
+            for name in schema.columns_by_family(inputs, "bin")
+            if name.startswith("ps_ind_")
+        ]
+
+        # Every output column the plan can produce, as (kind, input, argument)
+        specs = {}
+        for name in inputs:
+            if schema.column_family(name) != "cat":
+                specs[name] = ("value", position[name], None)
+            elif plan.encoding == "onehot":
+                for level in plan.levels[name]:
+                    encoded = f"{name}_{level}".replace("-", "m")
+                    specs[encoded] = ("onehot", position[name], level)
+            else:
+                specs[f"{name}_te"] = ("target", position[name], plan.encodings[name])
+        specs[features.MISSING_COUNT_COLUMN] = ("missing", None, None)
+        if ind_bins:
+            specs[features.IND_BIN_SUM_COLUMN] = ("ind_bins", None, None)
+        unknown = [name for name in self.columns if name not in specs]
+        if unknown:
+            raise ValueError(f"Model columns not produced by the plan: {unknown}")
+
+        def select(kind):
+            outputs = [
+                i for i, name in enumerate(self.columns) if specs[name][0] == kind
+            ]
+            return np.array(outputs, dtype=np.intp), [
+                specs[self.columns[i]] for i in outputs
+            ]
+
+        self._value_out, value_specs = select("value")
+        self._value_in = np.array([spec[1] for spec in value_specs], dtype=np.intp)
+        self._onehot_out, onehot_specs = select("onehot")
+        self._onehot_in = np.array([spec[1] for spec in onehot_specs], dtype=np.intp)
+        self._onehot_level = np.array(
+            [spec[2] for spec in onehot_specs], dtype=np.float32
+        )
+        self._target_out, target_specs = select("target")
+        self._target_lookups = [(spec[1], spec[2]) for spec in target_specs]
+        self._prior = plan.prior
+        self._missing_out, _ = select("missing")
+        self._ind_bins_out, _ = select("ind_bins")
+        self._ind_bins_in = np.array(ind_bins, dtype=np.intp)
+
+    def raw_values(self, records: list[dict]) -> np.ndarray:
+        """
+        Read the plan's input columns of each record, with NaN for missing.
+
+        Raises:
+            ValueError: If a record is not an object or lacks an input column,
+                or a value is not a number (an integer for flags, categories
+                and ordinals) within the range of its parsing dtype.
+        """
+        rows = []
+        for record in records:
+            if not isinstance(record, dict):
+                raise ValueError("Each record must be a JSON object")
+            missing = self._required.difference(record)
+            if missing:
+                raise ValueError(f"Missing feature columns: {sorted(missing)}")
+            row = [record[name] for name in self.inputs]
+            for name, value, integer in zip(self.inputs, row, self._integer):
+                # bool is a subclass of int; numeric strings are not numbers
+                kind = type(value)
+                if value is None or kind is int or (kind is float and not integer):
+                    continue
+                expected = "an integer" if integer else "a number"
+                raise ValueError(f"{name} must be {expected} or null, got: {value!r}")
+            rows.append(row)
+        raw = np.array(rows, dtype=np.float64).reshape(len(rows), len(self.inputs))
+        outside = (raw < self._low) | (raw > self._high)
+        if outside.any():
+            names = sorted(
+                {self.inputs[i] for i in np.flatnonzero(outside.any(axis=0))}
+            )
+            raise ValueError(f"Values out of range for: {names}")
+        raw[raw == schema.MISSING_SENTINEL] = np.nan
+        flags = raw[:, self._binary]
+        flags[(flags != 0) & (flags != 1)] = np.nan
+        raw[:, self._binary] = flags
+        # Interim files store continuous features as float32
+        return raw.astype(np.float32)
+
+    def encode(self, records: list[dict]) -> np.ndarray:
+        """
+        Encode records into a (records, model columns) float32 matrix.
+
+        Args:
+            records (list[dict]): Raw records keyed by column name.
+
+        Returns:
+            np.ndarray: Rows in the model's column order.
+
+        Raises:
+            ValueError: If a record is invalid, see ``raw_values``.
+        """
+        raw = self.raw_values(records)
+        encoded = np.empty((len(raw), len(self.columns)), dtype=np.float32)
+        encoded[:, self._value_out] = raw[:, self._value_in]
+
+        levels = np.where(np.isnan(raw), schema.MISSING_SENTINEL, raw)
+        encoded[:, self._onehot_out] = levels[:, self._onehot_in] == self._onehot_level
+        for out, (index, mapping) in zip(self._target_out, self._target_lookups):
+            encoded[:, out] = [
+                mapping.get(int(level), self._prior) for level in levels[:, index]
+            ]
+
+        if len(self._missing_out):
+            encoded[:, self._missing_out[0]] = np.isnan(raw).sum(axis=1)
+        if len(self._ind_bins_out):
+            encoded[:, self._ind_bins_out[0]] = np.nansum(
+                raw[:, self._ind_bins_in], axis=1
+            )
+        return encoded
+
+
+class LatencyTracker:
+    """Thread-safe window of recent latencies with percentile summaries."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+            self.count += 1
+
+    def summary(self) -> dict:
+        """Request count and p50/p99/max latency in milliseconds of the window."""
+        with self._lock:
+            latencies = np.array(self._latencies)
+            count = self.count
+        if not len(latencies):
+            return {"requests": count, "p50_ms": None, "p99_ms": None, "max_ms": None}
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        return {
+            "requests": count,
+            "p50_ms": round(float(p50), 3),
+            "p99_ms": round(float(p99), 3),
+            "max_ms": round(float(latencies.max() * 1000), 3),
+        }
+
+
+class MicroBatcher:
+    """
+    Predict concurrent requests together on one background thread.
+
+    The first waiting request opens a batch; more are added until
+    ``max_batch_size`` rows are collected or ``max_wait_ms`` has passed, and
+    the model then scores the stacked rows in a single call. Under light load
+    a request waits at most ``max_wait_ms``; under heavy load the per-row cost
+    drops because the NumPy overhead is shared by the whole batch.
+    """
+
+    def __init__(
+        self,
+        model: logistic.LogisticModel,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"Batch size must be positive, got: {max_batch_size}")
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="micro-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, rows: np.ndarray) -> Future:
+        """Queue encoded rows; the future resolves to their probabilities."""
+        future = Future()
+        self._queue.put((rows, future))
+        return future
+
+    def close(self) -> None:
+        """Stop the background thread after the queued requests."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            size = len(item[0])
+            deadline = time.perf_counter() + self.max_wait
+            stop = False
+            while size < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=max(remaining, 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self._predict(batch)
+            if stop:
+                return
+
+    def _predict(self, batch: list[tuple[np.ndarray, Future]]) -> None:
+        try:
+            probabilities = self.model.predict(np.vstack([rows for rows, _ in batch]))
+        except Exception as error:
+            for _, future in batch:
+                future.set_exception(error)
+            return
+        self.batches += 1
+        self.rows += len(probabilities)
+        start = 0
+        for rows, future in batch:
+            future.set_result(probabilities[start : start + len(rows)])
+            start += len(rows)
+
+
+class ScoringService:
+    """A warm feature encoder, model and micro-batcher shared by all requests."""
+
+    def __init__(
+        self,
+        plan: features.FeaturePlan,
+        model: logistic.LogisticModel,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ):
+        if not model.columns:
+            raise ValueError("Model does not record its feature columns")
+        self.encoder = RecordEncoder(plan, model.columns)
+        self.batcher = MicroBatcher(model, max_batch_size, max_wait_ms)
+        self.latency = LatencyTracker()
+
+    @classmethod
+    def load(
+        cls, plan_path: Union[str, Path], model_path: Union[str, Path], **options
+    ) -> "ScoringService":
+        """Load the feature plan and model once; see ``batch_scoring.Scorer``."""
+        scorer = batch_scoring.Scorer.load(plan_path, model_path)
+        return cls(scorer.plan, scorer.model, **options)
+
+    def score(self, records: list[dict]) -> np.ndarray:
+        """
+        Score raw records through the micro-batcher.
+
+        Raises:
+            ValueError: If a record is invalid.
+        """
+        rows = self.encoder.encode(records)
+        return self.batcher.submit(rows).result()
+
+    def metrics(self) -> dict:
+        """Latency percentiles and micro-batching counters."""
+        batches = self.batcher.batches
+        return {
+            **self.latency.summary(),
+            "batches": batches,
+            "mean_batch_rows": round(self.batcher.rows / batches, 2)
+            if batches
+            else None,
+        }
+
+    def close(self) -> None:
+        self.batcher.close()
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    """
+    JSON endpoints of the scoring server.
+
+    - ``POST /score``: a record object, or a list of them, returns
+      ``{"id": ..., "target": ...}`` or a list of those.
+    - ``GET /metrics``: latency percentiles and batching counters.
+    - ``GET /health``: liveness check.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; with Nagle's algorithm the body
+    # waits for the client's delayed ACK, adding ~40 ms to every response
+    disable_nagle_algorithm = True
+    server: "ScoringServer"
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send(HTTPStatus.OK, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._send(HTTPStatus.OK, self.server.service.metrics())
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_BODY_BYTES:
+            # A negative length would block on read(-1) until the client hangs
+            # up, and the unread body would be parsed as the next request
+            self.close_connection = True
+            self._send(
+                HTTPStatus.BAD_REQUEST,
+                {"error": f"Content-Length must be between 0 and {MAX_BODY_BYTES}"},
+            )
+            return
+        body = self.rfile.read(length)
+        if self.path != "/score":
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            payload = json.loads(body)
+            single = isinstance(payload, dict)
+            records = [payload] if single else payload
+            if not isinstance(records, list):
+                raise ValueError("Body must be a record object or a list of records")
+            probabilities = self.server.service.score(records)
+        except ValueError as error:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": str(error)})
+            return
+        except Exception:
+            logger.exception(f"Scoring failed for {self.address_string()}")
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Scoring failed"})
+            return
+        predictions = [
+            {
+                schema.ID_COLUMN: record.get(schema.ID_COLUMN),
+                schema.TARGET_COLUMN: float(p),
+            }
+            for record, p in zip(records, probabilities)
+        ]
+        self._send(HTTPStatus.OK, predictions[0] if single else predictions)
+        self.server.service.latency.record(time.perf_counter() - start)
+
+    def _send(self, status: HTTPStatus, document: Union[dict, list]) -> None:
+        body = json.dumps(document).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class ScoringServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the shared ``ScoringService``."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: ScoringService):
+        super().__init__(address, ScoringHandler)
+        self.service = service
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.service.close()
+
+
+def make_server(
+    service: ScoringService, host: str = "127.0.0.1", port: int = 8000
+) -> ScoringServer:
+    """
+    Bind a scoring server; call ``serve_forever`` to start handling requests.
+
+    Args:
+        service (ScoringService): Loaded encoder, model and batcher.
+        host (str): Interface to listen on.
+        port (int): Port to listen on, 0 for any free port.
+
+    Returns:
+        ScoringServer: The bound server.
+    """
+    server = ScoringServer((host, port), service)
+    host, port = server.server_address[:2]
+    logger.info(f"Serving predictions on http://{host}:{port}/score")
+    return server
@@ -0,0 +1,74 @@
+import argparse
+import logging
+from src.utils.log_config import setup_logging
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build model features from the interim Parquet files."
+    )
+    parser.add_argument(
+        "--train", default="data/interim/train.parquet", help="Interim train file."
+    )
+    parser.add_argument(
+        "--test",
+        nargs="*",
+        default=["data/interim/test.parquet"],
+        help="Interim files transformed with the train plan.",
+    )
+    parser.add_argument(
+        "--output-dir", default="data/processed", help="Directory for feature files."
+    )
+    parser.add_argument("--encoding", choices=["onehot", "target"], default="onehot")
+    parser.add_argument(
+        "--keep-calc", action="store_true", help="Keep the ps_calc_* columns."
+    )
+    parser.add_argument(
+        "--smoothing", type=float, default=20.0, help="Target encoding prior weight."
+    )
+    parser.add_argument(
+        "--noise", type=float, default=0.0, help="Out-of-fold encoding noise."
+    )
+    parser.add_argument(
+        "--folds", type=int, default=5, help="Folds of the train target encoding."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Fold assignment seed.")
+    parser.add_argument("--log-file", default=None, help="Also write debug logs here.")
+    parser.add_argument(
+        "--metrics-file",
+        default=None,
+        help="Append per-stage timings and counters here as JSON lines.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Heavy imports are deferred until the arguments are known to be valid
+    from src.data_preparation import features
+    from src.data_understanding.data_collection import CUSTOM_EMOJIS
+
+    setup_logging(
+        console_level=logging.INFO,
+        log_file=args.log_file,
+        emoji_map=CUSTOM_EMOJIS,
+        metrics_file=args.metrics_file,
+    )
+
+    # Fit on train and stream every split to the processed directory
+    features.build_features(
+        args.train,
+        args.output_dir,
+        test_paths=args.test,
+        encoding=args.encoding,
+        drop_calc=not args.keep_calc,
+        smoothing=args.smoothing,
+        noise=args.noise,
+        n_folds=args.folds,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
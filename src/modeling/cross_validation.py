@@ -0,0 +1,245 @@
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Callable, Union
+import numpy as np
+from src.data_understanding import matrix
+from src.evaluation import gini
+from src.modeling import logistic
+from src.utils import log_config
+
+logger = logging.getLogger(__name__)
+
+# Signature of the model: (features, target, train rows, valid rows) -> scores,
+# where features and target are the shared memmaps and the rows are indices
+FitPredict = Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+# Arrays opened by each worker process, keyed by name
+_worker_state = {}
+
+
+@dataclass(frozen=True)
+class FoldResult:
+    """Timing and score of one fold of one repeat."""
+
+    repeat: int
+    fold: int
+    n_train: int
+    n_valid: int
+    seconds: float
+    gini: float
+
+
+@dataclass(frozen=True)
+class CVResult:
+    """Out-of-fold predictions and per-fold results of a cross-validation run."""
+
+    oof: np.ndarray
+    folds: list[FoldResult]
+    repeat_gini: np.ndarray
+    seconds: float
+
+    @property
+    def mean_oof(self) -> np.ndarray:
+        """Out-of-fold prediction of each row averaged over the repeats."""
+        return self.oof.mean(axis=0)
+
+    @property
+    def fold_seconds(self) -> float:
+        """Summed time of the folds, i.e. the cost of running them one by one."""
+        return sum(result.seconds for result in self.folds)
+
+
+def stratified_folds(
+    target: np.ndarray, n_folds: int = 5, n_repeats: int = 1, seed: int = 0
+) -> np.ndarray:
+    """
+    Assign rows to folds, keeping the positive rate equal across folds.
+
+    Positives and negatives are shuffled separately and dealt round-robin, so
+    every fold gets the same number of each class, give or take one.
+
+    Args:
+        target (np.ndarray): Binary labels, shape (rows,).
+        n_folds (int): Number of folds.
+        n_repeats (int): Number of independent shuffles.
+        seed (int): Seed of the shuffles.
+
+    Returns:
+        np.ndarray: int8 array of shape (n_repeats, rows) with the fold of
+            each row in each repeat.
+
+    Raises:
+        ValueError: If fewer than two folds are requested or a class has
+            fewer rows than there are folds.
+    """
+    if n_folds < 2:
+        raise ValueError(f"At least two folds are needed, got: {n_folds}")
+    target = np.asarray(target)
+    rng = np.random.default_rng(seed)
+    folds = np.empty((n_repeats, len(target)), dtype=np.int8)
+    classes = [np.flatnonzero(target == label) for label in (0, 1)]
+    for rows in classes:
+        if len(rows) < n_folds:
+            raise ValueError(
+                f"Each class needs at least {n_folds} rows, got {len(rows)}"
+            )
+    for repeat in range(n_repeats):
+        for rows in classes:
+            shuffled = rng.permutation(rows)
+            folds[repeat, shuffled] = np.arange(len(rows)) % n_folds
+    return folds
+
+
+def _open_worker_arrays(
+    features_path: str,
+    target_path: str,
+    folds_path: str,
+    oof_path: str,
+    fit_predict: FitPredict,
+    log_queue=None,
+) -> None:
+    """Memory-map the shared arrays once per worker process."""
+    if log_queue is not None:
+        log_config.configure_worker_logging(log_queue)
+    _worker_state.update(
+        features=np.load(features_path, mmap_mode="r"),
+        target=np.load(target_path, mmap_mode="r"),
+        folds=np.load(folds_path, mmap_mode="r"),
+        oof=np.load(oof_path, mmap_mode="r+"),
+        fit_predict=fit_predict,
+    )
+
+
+def _run_fold(repeat: int, fold: int) -> FoldResult:
+    """Fit on the other folds, write this fold's predictions to the shared array."""
+    start = time.perf_counter()
+    features, target = _worker_state["features"], _worker_state["target"]
+    assignment = _worker_state["folds"][repeat]
+    valid = np.flatnonzero(assignment == fold)
+    train = np.flatnonzero(assignment != fold)
+
+    # Indices rather than fancy-indexed copies keep the memmap shared
+    scores = _worker_state["fit_predict"](features, target, train, valid)
+    oof = _worker_state["oof"]
+    oof[repeat, valid] = scores
+    oof.flush()
+    return FoldResult(
+        repeat=repeat,
+        fold=fold,
+        n_train=len(train),
+        n_valid=len(valid),
+        seconds=time.perf_counter() - start,
+        gini=gini.normalized_gini(target[valid], scores),
+    )
+
+
+def cross_validate(
+    parquet_path: Union[str, Path],
+    fit_predict: FitPredict = logistic.fit_predict,
+    n_folds: int = 5,
+    n_repeats: int = 5,
+    seed: int = 0,
+    max_workers: Union[int, None] = None,
+    executor: str = "process",
+) -> CVResult:
+    """
+    Run repeated stratified K-fold cross-validation on a process pool.
+
+    The data is exported once as memory-mapped ``.npy`` arrays next to the
+    Parquet file (reused when current, see ``matrix.export_matrix``). Workers
+    map those files instead of receiving pickled copies, and each fold writes
+    its predictions straight into a preallocated, memory-mapped out-of-fold
+    array, so only (repeat, fold) ids and small results cross process
+    boundaries.
+
+    Args:
+        parquet_path (Union[str, Path]): Interim or processed train Parquet
+            file with the id and target columns.
+        fit_predict (FitPredict): Top-level (picklable) function receiving the
+            shared features and target with the training and validation row
+            indices, fitting on the former and scoring the latter. Reading
+            the rows in place rather than copying them keeps the memory of
+            N workers close to that of one.
+        n_folds (int): Number of folds.
+        n_repeats (int): Number of repeats with different shuffles.
+        seed (int): Seed of the fold assignment.
+        max_workers (Union[int, None]): Worker processes; defaults to the CPU
+            count, capped at the number of folds to run.
+        executor (str): "process" for a spawned process pool or "serial" to run
+            every fold in this process.
+
+    Returns:
+        CVResult: Out-of-fold predictions of shape (n_repeats, rows), per-fold
+            timings and scores, and the Gini of each repeat.
+
+    Raises:
+        ValueError: If the executor is unknown, the file has no target or the
+            folds cannot be stratified.
+    """
+    if executor not in ("process", "serial"):
+        raise ValueError(f"Executor must be 'process' or 'serial', got: {executor}")
+    start = time.perf_counter()
+    files = matrix.export_matrix(parquet_path)
+    data = matrix.load_matrix(parquet_path)
+    if data.target is None:
+        raise ValueError(f"Cross-validation needs a target column: {parquet_path}")
+    folds = stratified_folds(data.target, n_folds, n_repeats, seed)
+    tasks = [(repeat, fold) for repeat in range(n_repeats) for fold in range(n_folds)]
+
+    with tempfile.TemporaryDirectory(prefix="cv-") as scratch:
+        folds_path = os.path.join(scratch, "folds.npy")
+        oof_path = os.path.join(scratch, "oof.npy")
+        np.save(folds_path, folds)
+        oof = np.lib.format.open_memmap(
+            oof_path, mode="w+", dtype=np.float32, shape=folds.shape
+        )
+        arrays = (str(files.features), str(files.target), folds_path, oof_path)
+
+        results = []
+        if executor == "serial":
+            _open_worker_arrays(*arrays, fit_predict)
+            for task in tasks:
+                results.append(_run_fold(*task))
+                _log_fold(results[-1])
+        else:
+            workers = max(1, min(max_workers or os.cpu_count() or 1, len(tasks)))
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=get_context("spawn"),
+                initializer=_open_worker_arrays,
+                initargs=(*arrays, fit_predict, log_config.worker_log_queue()),
+            )
+            with pool:
+                futures = [pool.submit(_run_fold, *task) for task in tasks]
+                for future in as_completed(futures):
+                    results.append(future.result())
+                    _log_fold(results[-1])
+
+        oof_predictions = np.array(oof)
+        del oof
+        _worker_state.clear()
+
+    results.sort(key=lambda result: (result.repeat, result.fold))
+    repeat_gini = np.atleast_1d(gini.normalized_gini(data.target, oof_predictions))
+    seconds = time.perf_counter() - start
+    logger.info(
+        f"Completed {n_repeats}x{n_folds} CV in {seconds:.2f}s "
+        f"({sum(r.seconds for r in results):.2f}s of fold time): "
+        f"OOF Gini {repeat_gini.mean():.4f} +/- {repeat_gini.std():.4f}"
+    )
+    return CVResult(
+        oof=oof_predictions, folds=results, repeat_gini=repeat_gini, seconds=seconds
+    )
+
+
+def _log_fold(result: FoldResult) -> None:
+    logger.info(
+        f"Fold {result.fold} of repeat {result.repeat}: Gini {result.gini:.4f} "
+        f"in {result.seconds:.2f}s ({result.n_train:,} train, {result.n_valid:,} valid)"
+    )
@@ -0,0 +1,254 @@
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Union
+import numpy as np
+from src.data_understanding import matrix
+
+logger = logging.getLogger(__name__)
+
+# Rows standardised at once while fitting or scoring; bounds the float64 copies
+DEFAULT_CHUNK_ROWS = 65_536
+
+
+@dataclass(frozen=True)
+class LogisticModel:
+    """
+    L2-regularised logistic regression on standardised, mean-imputed features.
+
+    Missing values (NaN) are replaced by the training mean of their column
+    before standardisation, so the model scores the float32 matrices exported
+    by ``matrix.export_matrix`` directly.
+    """
+
+    columns: list[str]
+    mean: np.ndarray
+    scale: np.ndarray
+    coef: np.ndarray
+    intercept: float
+
+    def decision_function(self, features: np.ndarray) -> np.ndarray:
+        """Linear scores of a (rows, columns) matrix."""
+        features = np.asarray(features, dtype=np.float64)
+        standardised = (features - self.mean) / self.scale
+        standardised = np.nan_to_num(standardised, nan=0.0)
+        return standardised @ self.coef + self.intercept
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Probability of a claim for each row of a (rows, columns) matrix."""
+        return 1.0 / (1.0 + np.exp(-self.decision_function(features)))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the model as JSON, creating its directory if needed."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        document = {
+            "columns": self.columns,
+            "mean": self.mean.tolist(),
+            "scale": self.scale.tolist(),
+            "coef": self.coef.tolist(),
+            "intercept": self.intercept,
+        }
+        path.write_text(json.dumps(document), encoding="utf-8")
+        logger.info(f"Saving model with {len(self.columns)} columns to {path}")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "LogisticModel":
+        """Read a model written by ``save``."""
+        document = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(
+            columns=document["columns"],
+            mean=np.asarray(document["mean"]),
+            scale=np.asarray(document["scale"]),
+            coef=np.asarray(document["coef"]),
+            intercept=float(document["intercept"]),
+        )
+
+
+def _chunks(
+    features: np.ndarray,
+    target: Union[np.ndarray, None],
+    rows: Union[np.ndarray, None],
+    chunk_rows: int,
+):
+    """Yield float64 copies of bounded row blocks, with their labels."""
+    n_rows = len(features) if rows is None else len(rows)
+    for start in range(0, n_rows, chunk_rows):
+        if rows is None:
+            index = slice(start, start + chunk_rows)
+        else:
+            index = rows[start : start + chunk_rows]
+        labels = None if target is None else np.asarray(target[index], np.float64)
+        yield np.asarray(features[index], dtype=np.float64), labels
+
+
+def _moments(
+    features: np.ndarray, rows: Union[np.ndarray, None], chunk_rows: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """NaN-aware column means and standard deviations, one block at a time."""
+    n_columns = features.shape[1]
+    shift = count = total = squares = None
+    for block, _ in _chunks(features, None, rows, chunk_rows):
+        present = ~np.isnan(block)
+        if shift is None:
+            # Sums are taken around the first block's mean for accuracy
+            with np.errstate(invalid="ignore", divide="ignore"):
+                shift = np.nan_to_num(np.nansum(block, axis=0) / present.sum(axis=0))
+            count, total, squares = (np.zeros(n_columns) for _ in range(3))
+        centred = np.where(present, block - shift, 0.0)
+        count += present.sum(axis=0)
+        total += centred.sum(axis=0)
+        squares += (centred**2).sum(axis=0)
+    if count is None:
+        raise ValueError("Cannot fit a model on zero rows")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        offset = total / count
+        variance = squares / count - offset**2
+    mean = np.where(count > 0, shift + offset, 0.0)
+    scale = np.sqrt(np.maximum(variance, 0.0))
+    scale = np.where(~np.isfinite(scale) | (scale == 0), 1.0, scale)
+    return mean, scale
+
+
+def fit(
+    features: np.ndarray,
+    target: np.ndarray,
+    columns: Union[list[str], None] = None,
+    l2: float = 1.0,
+    max_iter: int = 50,
+    tol: float = 1e-6,
+    rows: Union[np.ndarray, None] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> LogisticModel:
+    """
+    Fit a logistic regression with Newton's method.
+
+    The gradient and Hessian are accumulated over blocks of ``chunk_rows``
+    rows, standardised on the fly, so only one float64 block is held besides
+    the (columns + 1)² Hessian. ``features`` can be a read-only memmap shared
+    between processes: the rows to fit on are selected with ``rows`` and read
+    in place, without copying the training set.
+
+    Args:
+        features (np.ndarray): (rows, columns) matrix; NaN marks missing.
+        target (np.ndarray): Binary labels, shape (rows,).
+        columns (Union[list[str], None]): Feature names stored with the model.
+        l2 (float): Ridge penalty on the coefficients (not the intercept).
+        max_iter (int): Maximum number of Newton steps, at least 1.
+        tol (float): Stop when no coefficient moves more than this.
+        rows (Union[np.ndarray, None]): Indices of the rows to fit on; None
+            uses every row.
+        chunk_rows (int): Rows processed at once.
+
+    Returns:
+        LogisticModel: Fitted model.
+
+    Raises:
+        ValueError: If ``max_iter`` is below 1 or no row is selected.
+    """
+    if max_iter < 1:
+        raise ValueError(f"max_iter must be at least 1, got: {max_iter}")
+    n_columns = features.shape[1]
+    mean, scale = _moments(features, rows, chunk_rows)
+    penalty = np.full(n_columns + 1, l2)
+    penalty[-1] = 0.0
+
+    weights = np.zeros(n_columns + 1)
+    for iteration in range(max_iter):
+        gradient = penalty * weights
+        hessian = np.diag(penalty)
+        for block, labels in _chunks(features, target, rows, chunk_rows):
+            design = np.nan_to_num((block - mean) / scale, nan=0.0)
+            probability = 1.0 / (1.0 + np.exp(-(design @ weights[:-1] + weights[-1])))
+            residual = probability - labels
+            curvature = probability * (1.0 - probability)
+            weighted = design * curvature[:, None]
+            gradient[:-1] += design.T @ residual
+            gradient[-1] += residual.sum()
+            hessian[:-1, :-1] += weighted.T @ design
+            hessian[:-1, -1] += weighted.sum(axis=0)
+            hessian[-1, -1] += curvature.sum()
+        hessian[-1, :-1] = hessian[:-1, -1]
+        step = np.linalg.solve(hessian, gradient)
+        weights -= step
+        if np.abs(step).max() < tol:
+            break
+    logger.debug(f"Logistic regression converged after {iteration + 1} steps")
+
+    return LogisticModel(
+        columns=list(columns) if columns is not None else [],
+        mean=mean,
+        scale=scale,
+        coef=weights[:-1],
+        intercept=float(weights[-1]),
+    )
+
+
+def fit_predict(
+    features: np.ndarray,
+    target: np.ndarray,
+    train: np.ndarray,
+    valid: np.ndarray,
+) -> np.ndarray:
+    """
+    Fit on one fold and score another; the default model of cross-validation.
+
+    Both folds are read from the shared arrays block by block (see ``fit``),
+    so a worker never copies the training rows.
+
+    Args:
+        features (np.ndarray): Shared (rows, columns) matrix.
+        target (np.ndarray): Shared labels.
+        train (np.ndarray): Indices of the training rows.
+        valid (np.ndarray): Indices of the rows to score.
+
+    Returns:
+        np.ndarray: One score per validation row.
+    """
+    model = fit(features, target, rows=train)
+    return np.concatenate(
+        [
+            model.predict(block)
+            for block, _ in _chunks(features, None, valid, DEFAULT_CHUNK_ROWS)
+        ]
+        or [np.empty(0)]
+    )
+
+
+def fit_file(
+    parquet_path: Union[str, Path],
+    l2: float = 1.0,
+    max_iter: int = 50,
+    tol: float = 1e-6,
+) -> LogisticModel:
+    """
+    Fit a model on every feature column of a processed train file.
+
+    The file is exported once as a memory-mapped matrix (reused when current,
+    see ``matrix.export_matrix``) and the model records the matrix columns, so
+    ``Scorer.load`` can rebuild the same matrix from interim rows.
+
+    Args:
+        parquet_path (Union[str, Path]): Processed train Parquet file.
+        l2 (float): See ``fit``.
+        max_iter (int): See ``fit``.
+        tol (float): See ``fit``.
+
+    Returns:
+        LogisticModel: Model fitted on all rows.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file has no target column.
+    """
+    matrix.export_matrix(parquet_path)
+    data = matrix.load_matrix(parquet_path)
+    if data.target is None:
+        raise ValueError(f"Training needs a target column: {parquet_path}")
+    model = fit(data.features, data.target, data.columns, l2, max_iter, tol)
+    logger.info(
+        f"Fitted logistic regression on {len(data.target):,} x "
+        f"{len(data.columns)} from {Path(parquet_path).name}"
+    )
+    return model
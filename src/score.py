@@ -0,0 +1,64 @@
+import argparse
+import logging
+from src.utils.log_config import setup_logging
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Score a policy file with a saved feature plan and model."
+    )
+    parser.add_argument(
+        "--input",
+        default="data/interim/test.parquet",
+        help="Interim Parquet file, raw CSV (optionally compressed) or '-' for stdin.",
+    )
+    parser.add_argument(
+        "--output", default="data/predictions.csv", help="Output id,target CSV."
+    )
+    parser.add_argument(
+        "--plan", default="data/processed", help="Feature plan or its directory."
+    )
+    parser.add_argument(
+        "--model", default="models/logistic.json", help="Saved model JSON file."
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=100_000, help="Rows scored per batch."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Batches scored concurrently."
+    )
+    parser.add_argument("--log-file", default=None, help="Also write debug logs here.")
+    parser.add_argument(
+        "--metrics-file",
+        default=None,
+        help="Append per-stage timings and counters here as JSON lines.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Heavy imports are deferred until the arguments are known to be valid
+    from src.data_understanding.data_collection import CUSTOM_EMOJIS
+    from src.deployment import batch_scoring
+
+    setup_logging(
+        console_level=logging.INFO,
+        log_file=args.log_file,
+        emoji_map=CUSTOM_EMOJIS,
+        metrics_file=args.metrics_file,
+    )
+
+    scorer = batch_scoring.Scorer.load(args.plan, args.model)
+    batch_scoring.score_file(
+        args.input,
+        args.output,
+        scorer,
+        batch_size=args.batch_size,
+        max_workers=args.workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
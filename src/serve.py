@@ -0,0 +1,62 @@
+import argparse
+import logging
+from src.utils.log_config import setup_logging
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Serve real-time predictions from a saved feature plan and model."
+    )
+    parser.add_argument(
+        "--plan", default="data/processed", help="Feature plan or its directory."
+    )
+    parser.add_argument(
+        "--model", default="models/logistic.json", help="Saved model JSON file."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind.")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind.")
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=64,
+        help="Rows predicted together by the micro-batcher.",
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=2.0,
+        help="How long a batch waits for more requests.",
+    )
+    parser.add_argument("--log-file", default=None, help="Also write debug logs here.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Heavy imports are deferred until the arguments are known to be valid
+    from src.data_understanding.data_collection import CUSTOM_EMOJIS
+    from src.deployment import server
+
+    setup_logging(
+        console_level=logging.INFO, log_file=args.log_file, emoji_map=CUSTOM_EMOJIS
+    )
+
+    # Everything is loaded once, before the first request
+    service = server.ScoringService.load(
+        args.plan,
+        args.model,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    )
+    httpd = server.make_server(service, args.host, args.port)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import logging
+from src.utils.log_config import setup_logging
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Fit a logistic regression on processed train and save it."
+    )
+    parser.add_argument(
+        "--train",
+        default="data/processed/train.parquet",
+        help="Processed train file written by features.py.",
+    )
+    parser.add_argument(
+        "--model", default="models/logistic.json", help="Output model JSON file."
+    )
+    parser.add_argument(
+        "--l2", type=float, default=1.0, help="Ridge penalty on the coefficients."
+    )
+    parser.add_argument(
+        "--cv-folds",
+        type=int,
+        default=0,
+        help="Cross-validate with this many folds before fitting; 0 skips it.",
+    )
+    parser.add_argument(
+        "--cv-repeats", type=int, default=1, help="Repeats of the cross-validation."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Cross-validation processes."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Fold assignment seed.")
+    parser.add_argument("--log-file", default=None, help="Also write debug logs here.")
+    parser.add_argument(
+        "--metrics-file",
+        default=None,
+        help="Append per-stage timings and counters here as JSON lines.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Heavy imports are deferred until the arguments are known to be valid
+    from src.data_understanding.data_collection import CUSTOM_EMOJIS
+    from src.modeling import cross_validation, logistic
+
+    setup_logging(
+        console_level=logging.INFO,
+        log_file=args.log_file,
+        emoji_map=CUSTOM_EMOJIS,
+        metrics_file=args.metrics_file,
+    )
+
+    if args.cv_folds:
+        cross_validation.cross_validate(
+            args.train,
+            n_folds=args.cv_folds,
+            n_repeats=args.cv_repeats,
+            seed=args.seed,
+            max_workers=args.workers,
+        )
+
+    # Fit on every row and save the model that score.py and serve.py load
+    model = logistic.fit_file(args.train, l2=args.l2)
+    model.save(args.model)
+
+
+if __name__ == "__main__":
+    main()
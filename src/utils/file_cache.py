@@ -0,0 +1,86 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Union
+
+# Bytes read per call while hashing
+CHUNK_SIZE = 1 << 20
+
+
+def content_hash(path: Union[str, Path]) -> str:
+    """
+    Compute a fast content hash of a file.
+
+    Args:
+        path (Union[str, Path]): File to hash.
+
+    Returns:
+        str: Hex digest of the file's BLAKE2b-128 hash.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        while chunk := handle.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(path: Union[str, Path], with_hash: bool = True) -> dict:
+    """
+    Describe a file by its size, modification time and content hash.
+
+    Args:
+        path (Union[str, Path]): File to describe.
+        with_hash (bool): Whether to compute the content hash.
+
+    Returns:
+        dict: Keys "size", "mtime_ns" and, if requested, "hash".
+    """
+    stat = Path(path).stat()
+    result = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        result["hash"] = content_hash(path)
+    return result
+
+
+def matches(path: Union[str, Path], recorded: dict) -> bool:
+    """
+    Check whether a file still matches a recorded fingerprint.
+
+    The size and modification time are compared first. The content is only
+    hashed when the size matches but the modification time differs, so that a
+    touched but unchanged file is still recognised.
+
+    Args:
+        path (Union[str, Path]): File to check.
+        recorded (dict): Fingerprint previously returned by ``fingerprint``.
+
+    Returns:
+        bool: True if the file content is unchanged.
+    """
+    path = Path(path)
+    if not path.is_file():
+        return False
+    current = fingerprint(path, with_hash=False)
+    if current["size"] != recorded.get("size"):
+        return False
+    if current["mtime_ns"] == recorded.get("mtime_ns"):
+        return True
+    return content_hash(path) == recorded.get("hash")
+
+
+def read_json(path: Union[str, Path]) -> Union[dict, None]:
+    """Read a JSON document, returning None if it is missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path: Union[str, Path], document: dict) -> None:
+    """Atomically write a JSON document next to its final location."""
+    path = Path(path)
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(document, handle, indent=2, sort_keys=True)
+    temp_path.replace(path)
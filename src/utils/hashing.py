@@ -0,0 +1,39 @@
+from typing import Union
+import polars as pl
+
+# SplitMix64 constants
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+_MIX_1 = 0xBF58476D1CE4E5B9
+_MIX_2 = 0x94D049BB133111EB
+
+
+def _u64(value: int) -> pl.Expr:
+    return pl.lit(value, dtype=pl.UInt64)
+
+
+def row_hash(column: Union[str, pl.Expr], seed: int = 0) -> pl.Expr:
+    """
+    Hash an integer column with SplitMix64.
+
+    Unlike ``pl.Expr.hash``, the result only depends on the value and the seed,
+    not on the Polars version, so folds and samples derived from it are
+    reproducible across environments. UInt64 arithmetic wraps around, which is
+    what the mixing steps rely on.
+
+    Args:
+        column (Union[str, pl.Expr]): Integer column, usually the policy id.
+        seed (int): Seed selecting an independent hash function.
+
+    Returns:
+        pl.Expr: UInt64 hash per row.
+    """
+    expr = pl.col(column) if isinstance(column, str) else column
+    z = expr.cast(pl.UInt64) + _u64((seed + 1) * _GOLDEN_GAMMA % 2**64)
+    z = z.xor(z // 2**30) * _u64(_MIX_1)
+    z = z.xor(z // 2**27) * _u64(_MIX_2)
+    return z.xor(z // 2**31)
+
+
+def unit_interval(hashed: pl.Expr) -> pl.Expr:
+    """Map a UInt64 hash to a float uniformly distributed in [0, 1)."""
+    return (hashed // 2**11).cast(pl.Float64) / float(2**53)
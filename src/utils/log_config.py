@@ -1,8 +1,22 @@
+import atexit
+import json
 import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# What a queue handler does with a record when its queue is full
+OVERFLOW_POLICIES = ("block", "drop", "drop_oldest")
 
 
 class ElegantFormatter(logging.Formatter):
-    """Custom formatter: elegant INFO with dynamic emojis, detailed other levels."""
+    """Custom formatter: elegant INFO with dynamic emojis, detailed other levels.
+
+    Both underlying formatters are built once and the keywords are
+    lower-cased once, so each INFO record costs one ``lower()`` and a scan of
+    the keywords. Records are never modified, so several handlers can format
+    the same record.
+    """
 
     def __init__(
         self, info_fmt="%(message)s", other_fmt=None, datefmt=None, emoji_map=None
@@ -13,33 +27,215 @@ class ElegantFormatter(logging.Formatter):
             other_fmt or "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
         self.emoji_map = emoji_map or {}  # Maps keywords to emojis
+        self._info_formatter = logging.Formatter(self.info_fmt, datefmt=datefmt)
+        self._other_formatter = logging.Formatter(self.other_fmt, datefmt=datefmt)
+        # A bare message format lets the emoji be prepended to the output
+        self._message_only = self.info_fmt == "%(message)s"
+
+        # Keywords are tried in the order of emoji_map; the first match wins
+        self._keywords = [
+            (keyword.lower(), f"{emoji} ") for keyword, emoji in self.emoji_map.items()
+        ]
 
     def _get_emoji(self, message):
         """Find first matching emoji based on message keywords."""
-        for keyword, emoji in self.emoji_map.items():
-            if keyword.lower() in message.lower():
-                return f"{emoji} "
+        if not self._keywords:
+            return ""
+        lowered = message.lower()
+        for keyword, emoji in self._keywords:
+            if keyword in lowered:
+                return emoji
         return ""
 
     def format(self, record):
-        if record.levelno == logging.INFO:
-            # Add dynamic emoji to INFO messages
-            emoji = self._get_emoji(record.getMessage())
-            record.msg = emoji + record.msg
-            formatter = logging.Formatter(self.info_fmt, datefmt=self.datefmt)
-        else:
-            formatter = logging.Formatter(self.other_fmt, datefmt=self.datefmt)
-        return formatter.format(record)
+        if record.levelno != logging.INFO:
+            return self._other_formatter.format(record)
+
+        # Add dynamic emoji to INFO messages, chosen from the message template
+        emoji = self._get_emoji(str(record.msg))
+        if not emoji:
+            return self._info_formatter.format(record)
+        if self._message_only:
+            return emoji + self._info_formatter.format(record)
+        decorated = logging.makeLogRecord(record.__dict__)
+        decorated.msg = emoji + str(record.msg)
+        return self._info_formatter.format(decorated)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format metric records as one JSON object per line.
+
+    The object holds the record's UTC timestamp and logger name followed by
+    the ``metrics`` mapping attached by ``src.utils.metrics``.
+    """
+
+    def format(self, record):
+        document = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "logger": record.name,
+            **getattr(record, "metrics", {}),
+        }
+        return json.dumps(document, default=str)
+
+
+def has_metrics(record):
+    """Filter that keeps only the records carrying a ``metrics`` mapping."""
+    return hasattr(record, "metrics")
+
+
+def without_metrics(record):
+    """Filter that drops the records carrying a ``metrics`` mapping."""
+    return not hasattr(record, "metrics")
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Queue handler that applies an overflow policy when the queue is full.
+
+    Policies are "block" (wait for room), "drop" (discard the new record) and
+    "drop_oldest" (discard the oldest queued record). Discarded records are
+    counted in ``dropped``.
+    """
+
+    def __init__(self, log_queue, overflow="block"):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Overflow must be one of {OVERFLOW_POLICIES}, got: {overflow}"
+            )
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+
+    def enqueue(self, record):
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.overflow == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+
+
+class _BlockingSentinelListener(QueueListener):
+    """Queue listener whose stop waits for room instead of failing on a full queue."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+# Key of the configuration used when setup_logging is called without one
+DEFAULT_KEY = "default"
+
+# Listener and queue of the asynchronous mode, if enabled
+_async_state = {"listener": None, "queue": None, "multiprocess": False, "key": None}
+
+# Handlers attached to the root logger by each setup_logging key
+_installed = {}
+
+
+def _stop_listener():
+    listener = _async_state["listener"]
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+    _async_state.update(listener=None, queue=None, multiprocess=False, key=None)
+
+
+def _remove_handlers(key):
+    """Detach and close the handlers a previous setup_logging call installed."""
+    logger = logging.getLogger()
+    for handler in _installed.pop(key, []):
+        logger.removeHandler(handler)
+        handler.close()
+    if _async_state["key"] == key:
+        _stop_listener()
+
+
+def worker_log_queue():
+    """Return the queue that worker processes should log to, or None.
+
+    Only available after ``setup_logging(asynchronous=True, multiprocess=True)``.
+    """
+    if _async_state["multiprocess"]:
+        return _async_state["queue"]
+    return None
+
+
+def configure_worker_logging(log_queue, level=logging.DEBUG, overflow="block"):
+    """Send every record of a worker process to the parent's logging queue.
+
+    Intended as a process pool initializer, e.g.
+    ``ProcessPoolExecutor(initializer=configure_worker_logging,
+    initargs=(worker_log_queue(),))``.
+
+    Args:
+        log_queue: Queue returned by ``worker_log_queue``.
+        level (int): Minimum level forwarded by the worker.
+        overflow (str): Overflow policy of the worker's queue handler.
+    """
+    logger = logging.getLogger()
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    logger.setLevel(level)
+    logger.addHandler(BoundedQueueHandler(log_queue, overflow=overflow))
 
 
 # Configure logging with custom emojis
-def setup_logging(console_level=logging.INFO, log_file=None, emoji_map=None):
+def setup_logging(
+    console_level=logging.INFO,
+    log_file=None,
+    emoji_map=None,
+    asynchronous=False,
+    queue_size=10_000,
+    overflow="block",
+    multiprocess=False,
+    key=DEFAULT_KEY,
+    metrics_file=None,
+):
+    """Attach console and optional file handlers to the root logger.
+
+    Calls are idempotent per ``key``: the handlers installed by a previous call
+    with the same key are removed first, so calling this again reconfigures
+    logging instead of stacking duplicate handlers. Handlers added by other
+    keys or by other code are left alone.
+
+    In asynchronous mode the handlers are driven by a ``QueueListener`` thread
+    and the root logger only gets a ``BoundedQueueHandler``, so logging calls
+    never wait on console or disk I/O unless the queue is full and the
+    overflow policy is "block".
+
+    Args:
+        console_level (int): Minimum level shown on the console.
+        log_file (str): Optional path of a detailed log file.
+        emoji_map (dict): Keywords mapped to the emojis of INFO messages.
+        asynchronous (bool): Whether to write records from a background thread.
+        queue_size (int): Capacity of the queue in asynchronous mode.
+        overflow (str): "block", "drop" or "drop_oldest" when the queue is full.
+        multiprocess (bool): Whether to use a multiprocessing queue that worker
+            processes can share through ``worker_log_queue``.
+        key (str): Name of this configuration.
+        metrics_file (str): Optional path where metric records are appended
+            as JSON lines, next to the human-readable output.
+
+    Returns:
+        QueueListener: The running listener in asynchronous mode, else None.
+    """
+    _remove_handlers(key)
     logger = logging.getLogger()
     logger.setLevel(logging.DEBUG)
 
     # Console handler with dynamic emojis
     console_handler = logging.StreamHandler()
     console_handler.setLevel(console_level)
+    console_handler.addFilter(without_metrics)
     console_handler.setFormatter(
         ElegantFormatter(
             info_fmt="%(message)s",
@@ -47,14 +243,53 @@ def setup_logging(console_level=logging.INFO, log_file=None, emoji_map=None):
             emoji_map=emoji_map,
         )
     )
+    handlers = [console_handler]
 
     # File handler (detailed logs)
     if log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(logging.DEBUG)
+        file_handler.addFilter(without_metrics)
         file_handler.setFormatter(
             logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
         )
-        logger.addHandler(file_handler)
+        handlers.insert(0, file_handler)
 
-    logger.addHandler(console_handler)
+    # Metrics handler (machine-readable stage timings and counters)
+    if metrics_file:
+        metrics_handler = logging.FileHandler(metrics_file)
+        metrics_handler.setLevel(logging.DEBUG)
+        metrics_handler.addFilter(has_metrics)
+        metrics_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(metrics_handler)
+
+    if not asynchronous:
+        for handler in handlers:
+            logger.addHandler(handler)
+        _installed[key] = handlers
+        return None
+
+    # Only one listener runs at a time
+    if _async_state["key"] is not None:
+        _remove_handlers(_async_state["key"])
+    if multiprocess:
+        # Imported here since multiprocessing is slow to import and rarely needed
+        import multiprocessing
+
+        log_queue = multiprocessing.get_context("spawn").Queue(queue_size)
+    else:
+        log_queue = queue.Queue(queue_size)
+    queue_handler = BoundedQueueHandler(log_queue, overflow=overflow)
+    listener = _BlockingSentinelListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    # Registered last so that it runs before multiprocessing closes its queues
+    atexit.unregister(_stop_listener)
+    atexit.register(_stop_listener)
+    _async_state.update(
+        listener=listener, queue=log_queue, multiprocess=multiprocess, key=key
+    )
+    logger.addHandler(queue_handler)
+    _installed[key] = [queue_handler]
+    return listener
@@ -0,0 +1,136 @@
+import functools
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Union
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+# Logger that carries metric records, written as JSON lines by the handler
+# that ``log_config.setup_logging(metrics_file=...)`` installs
+METRICS_LOGGER = "metrics"
+
+logger = logging.getLogger(METRICS_LOGGER)
+
+
+def peak_rss_mb() -> Union[float, None]:
+    """
+    Return the peak resident set size of the current process.
+
+    Returns:
+        Union[float, None]: Peak RSS in MB, or None where the platform does not
+            report it.
+    """
+    if resource is None:  # pragma: no cover
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    scale = 1 if sys.platform == "darwin" else 1024
+    return peak * scale / 1e6
+
+
+def emit(event: str, **values) -> None:
+    """
+    Emit one metric record at DEBUG level on the metrics logger.
+
+    Args:
+        event (str): Name of the measured event, e.g. "convert_data.convert".
+        **values: JSON-serialisable measurements and labels.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    summary = ", ".join(f"{key}={value}" for key, value in values.items())
+    logger.debug(f"{event}: {summary}", extra={"metrics": {"event": event, **values}})
+
+
+class Stage:
+    """Counters and labels collected while a ``stage`` block runs."""
+
+    def __init__(self, name: str, **fields):
+        self.name = name
+        self.fields = dict(fields)
+        self.counters = {}
+
+    def count(self, counter: str, value: Union[int, float] = 1) -> None:
+        """Add ``value`` to a counter."""
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def set(self, **fields) -> None:
+        """Attach labels or final values to the stage record."""
+        self.fields.update(fields)
+
+
+@contextmanager
+def stage(name: str, **fields) -> Iterator[Stage]:
+    """
+    Time a block and emit its duration, memory and counters as one record.
+
+    The record holds the wall and CPU seconds, the process peak RSS at the end
+    of the block and how much the block raised it, every counter and label set
+    on the yielded ``Stage`` and a ``status`` of "ok" or "error". When a
+    ``rows`` counter is set, ``rows_per_second`` is added.
+
+    Args:
+        name (str): Event name of the record.
+        **fields: Labels attached to the record, e.g. the source file.
+
+    Yields:
+        Stage: Collector for counters and labels.
+    """
+    current = Stage(name, **fields)
+    start_rss = peak_rss_mb()
+    start_cpu = time.process_time()
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield current
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        end_rss = peak_rss_mb()
+        values = {
+            "status": status,
+            "seconds": round(seconds, 6),
+            "cpu_seconds": round(time.process_time() - start_cpu, 6),
+            "peak_rss_mb": end_rss,
+            "peak_rss_growth_mb": (
+                None if end_rss is None else round(end_rss - start_rss, 3)
+            ),
+            **current.counters,
+            **current.fields,
+        }
+        rows = current.counters.get("rows")
+        if rows is not None and seconds > 0:
+            values["rows_per_second"] = round(rows / seconds, 1)
+        emit(name, **values)
+
+
+def timed(name: Union[str, None] = None) -> Callable:
+    """
+    Decorate a function so that every call is measured as a ``stage``.
+
+    Args:
+        name (Union[str, None]): Event name. Defaults to the function's
+            qualified name.
+
+    Returns:
+        Callable: Decorator.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        event = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(event):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
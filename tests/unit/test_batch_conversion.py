@@ -0,0 +1,212 @@
+import gzip
+import os
+import threading
+from pathlib import Path
+import pytest
+import polars as pl
+import tempfile
+import shutil
+from src.data_understanding import batch_conversion, data_collection
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def raw_dir(temp_dir):
+    """Create a directory of small Porto Seguro-like monthly extracts."""
+    raw_dir = temp_dir / "raw"
+    raw_dir.mkdir()
+    for month in range(3):
+        n_rows = 10 * (month + 1)
+        pl.DataFrame(
+            {
+                "id": range(n_rows),
+                "target": [i % 2 for i in range(n_rows)],
+                "ps_ind_01": [i % 7 for i in range(n_rows)],
+                "ps_car_13": [0.5 + i / 100 for i in range(n_rows)],
+            }
+        ).write_csv(raw_dir / f"policies_2024_0{month + 1}.csv")
+    return raw_dir
+
+
+@pytest.fixture
+def output_dir(temp_dir):
+    """Create the output directory for converted files."""
+    output_dir = temp_dir / "interim"
+    output_dir.mkdir()
+    return output_dir
+
+
+def test_resolve_sources_directory(raw_dir):
+    """Test that a directory expands to its CSV files in sorted order."""
+    (raw_dir / "notes.txt").write_text("not a csv")
+    sources = batch_conversion.resolve_sources(raw_dir)
+    assert [path.name for path in sources] == [
+        "policies_2024_01.csv",
+        "policies_2024_02.csv",
+        "policies_2024_03.csv",
+    ]
+
+
+def test_resolve_sources_glob(raw_dir):
+    """Test that a glob pattern is expanded."""
+    sources = batch_conversion.resolve_sources(str(raw_dir / "*_0[12].csv"))
+    assert len(sources) == 2
+
+
+def test_resolve_sources_manifest(raw_dir):
+    """Test that a manifest lists files relative to its own directory."""
+    manifest = raw_dir / "batch.txt"
+    manifest.write_text("# monthly extracts\npolicies_2024_03.csv\n\n")
+    assert batch_conversion.resolve_sources(manifest) == [
+        raw_dir / "policies_2024_03.csv"
+    ]
+
+
+def test_resolve_sources_single_file(raw_dir):
+    """Test that a single CSV path is returned as is."""
+    path = raw_dir / "policies_2024_01.csv"
+    assert batch_conversion.resolve_sources(path) == [path]
+
+
+def test_resolve_sources_no_match(temp_dir):
+    """Test error when nothing matches."""
+    with pytest.raises(FileNotFoundError, match="No CSV files found"):
+        batch_conversion.resolve_sources(temp_dir / "*.csv")
+
+
+@pytest.mark.parametrize("memory_budget", [None, 1])
+def test_convert_many_threads(raw_dir, output_dir, memory_budget):
+    """Test concurrent conversion with and without a memory budget."""
+    sources = batch_conversion.resolve_sources(raw_dir)
+    results = batch_conversion.convert_many(
+        sources, output_dir, max_workers=2, memory_budget=memory_budget
+    )
+    assert [result.source for result in results] == sources
+    assert [result.rows for result in results] == [10, 20, 30]
+    for result in results:
+        assert result.output == output_dir / f"{result.source.stem}.parquet"
+        assert result.output.exists()
+        assert result.rows_per_second > 0
+        assert result.mb_per_second > 0
+
+
+def test_memory_budget_counts_decompressed_bytes(temp_dir, output_dir, monkeypatch):
+    """Test that compressed files are budgeted by their decompressed size."""
+    sources = []
+    for month in range(3):
+        source = temp_dir / f"policies_2024_0{month + 1}.csv.gz"
+        frame = pl.DataFrame(
+            {"id": range(5_000), "ps_ind_01": [month] * 5_000, "ps_car_13": 0.75}
+        )
+        with gzip.open(source, "wb") as handle:
+            frame.write_csv(handle)
+        sources.append(source)
+    decompressed = data_collection.estimate_size(sources[0])
+    assert sum(source.stat().st_size for source in sources) < decompressed
+
+    running, peak = [0], [0]
+    lock = threading.Lock()
+    convert_job = batch_conversion._convert_job
+
+    def tracked(*args):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        try:
+            return convert_job(*args)
+        finally:
+            with lock:
+                running[0] -= 1
+
+    monkeypatch.setattr(batch_conversion, "_convert_job", tracked)
+    batch_conversion.convert_many(
+        sources, output_dir, max_workers=3, memory_budget=decompressed + 1
+    )
+    assert peak[0] == 1
+
+
+def test_worker_threads_stay_in_workers(monkeypatch):
+    """Test that the Polars thread count is set in workers, not the caller."""
+    monkeypatch.delenv("POLARS_MAX_THREADS", raising=False)
+    batch_conversion._make_executor("process", 2).shutdown()
+    assert "POLARS_MAX_THREADS" not in os.environ
+    batch_conversion._init_worker(3, None)
+    assert os.environ["POLARS_MAX_THREADS"] == "3"
+
+
+def test_convert_many_processes(raw_dir, output_dir):
+    """Test conversion on a process pool."""
+    sources = batch_conversion.resolve_sources(raw_dir)
+    results = batch_conversion.convert_many(
+        sources, output_dir, max_workers=2, executor="process"
+    )
+    assert sum(result.rows for result in results) == 60
+
+
+def test_convert_many_passes_convert_options(raw_dir, output_dir):
+    """Test that extra keyword arguments reach convert_data."""
+    sources = batch_conversion.resolve_sources(raw_dir)
+    with pytest.raises(ValueError, match="Missing expected columns"):
+        batch_conversion.convert_many(sources, output_dir, strict=True)
+
+
+def test_convert_many_invalid_executor(raw_dir, output_dir):
+    """Test error for an unknown executor kind."""
+    with pytest.raises(ValueError, match="Executor must be"):
+        batch_conversion.convert_many([], output_dir, executor="fiber")
+
+
+def test_convert_many_missing_output_dir(raw_dir, temp_dir):
+    """Test error when the output directory does not exist."""
+    with pytest.raises(ValueError, match="Output directory does not exist"):
+        batch_conversion.convert_many([], temp_dir / "missing")
+
+
+def test_convert_many_rejects_colliding_outputs(raw_dir, output_dir):
+    """Test that sources sharing a stem are refused before any conversion."""
+    other = raw_dir / "2024-02"
+    other.mkdir()
+    first = raw_dir / "policies_2024_01.csv"
+    second = other / "policies_2024_01.csv.gz"
+    with open(first, "rb") as source, gzip.open(second, "wb") as target:
+        shutil.copyfileobj(source, target)
+    with pytest.raises(ValueError, match="would both be written to"):
+        batch_conversion.convert_many([first, second], output_dir)
+    assert list(output_dir.iterdir()) == []
+
+
+def test_conversion_result_zero_duration():
+    """Test throughput properties for a zero-duration result."""
+    result = batch_conversion.ConversionResult(
+        source=Path("a.csv"), output=Path("a.parquet"), rows=1, input_bytes=1, seconds=0
+    )
+    assert result.rows_per_second == 0.0
+    assert result.mb_per_second == 0.0
+
+
+def test_convert_many_skips_up_to_date(raw_dir, output_dir):
+    """Test that a rerun reports unchanged files as skipped."""
+    sources = batch_conversion.resolve_sources(raw_dir)
+    batch_conversion.convert_many(sources, output_dir)
+    results = batch_conversion.convert_many(sources, output_dir)
+    assert all(result.skipped for result in results)
+    assert [result.rows for result in results] == [10, 20, 30]
+
+
+def test_convert_many_compressed_sources(raw_dir, output_dir):
+    """Test that compressed extracts are found and named after their CSV stem."""
+    source = raw_dir / "policies_2024_01.csv"
+    with gzip.open(raw_dir / "policies_2024_04.csv.gz", "wb") as handle:
+        handle.write(source.read_bytes())
+    sources = batch_conversion.resolve_sources(raw_dir)
+    assert sources[-1].name == "policies_2024_04.csv.gz"
+    results = batch_conversion.convert_many(sources[-1:], output_dir)
+    assert results[0].output == output_dir / "policies_2024_04.parquet"
+    assert results[0].rows == 10
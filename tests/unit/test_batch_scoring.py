@@ -0,0 +1,189 @@
+import gzip
+import shutil
+import tempfile
+from pathlib import Path
+import numpy as np
+import polars as pl
+import pytest
+from benchmarks import synthetic
+from src.data_preparation import features
+from src.data_understanding import data_collection, matrix
+from src.deployment import batch_scoring
+from src import score, train
+from src.modeling import logistic
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture(params=["onehot", "target"])
+def trained(request, temp_dir):
+    """Build features, fit a model on processed train and save both."""
+    interim = temp_dir / "interim"
+    processed = temp_dir / "processed"
+    interim.mkdir()
+    processed.mkdir()
+    train_csv = synthetic.write_csv(temp_dir / "train.csv", 800, seed=1)
+    test_csv = synthetic.write_csv(
+        temp_dir / "test.csv", 500, seed=2, include_target=False
+    )
+    data_collection.convert_data(train_csv, interim / "train.parquet")
+    data_collection.convert_data(test_csv, interim / "test.parquet")
+    outputs = features.build_features(
+        interim / "train.parquet",
+        processed,
+        test_paths=[interim / "test.parquet"],
+        encoding=request.param,
+    )
+
+    matrix.export_matrix(outputs["train"])
+    train = matrix.load_matrix(outputs["train"])
+    model = logistic.fit(train.features, train.target, columns=train.columns)
+    model.save(temp_dir / "model.json")
+
+    matrix.export_matrix(outputs["test"])
+    expected = model.predict(matrix.load_matrix(outputs["test"]).features)
+    scorer = batch_scoring.Scorer.load(processed, temp_dir / "model.json")
+    return scorer, test_csv, interim / "test.parquet", expected
+
+
+def test_train_then_score_cli(temp_dir):
+    """Test that the model written by train.py is the one score.py expects."""
+    interim, processed = temp_dir / "interim", temp_dir / "processed"
+    interim.mkdir()
+    processed.mkdir()
+    csv = synthetic.write_csv(temp_dir / "train.csv", 600, seed=3)
+    test_csv = synthetic.write_csv(
+        temp_dir / "test.csv", 300, seed=4, include_target=False
+    )
+    data_collection.convert_data(csv, interim / "train.parquet")
+    data_collection.convert_data(test_csv, interim / "test.parquet")
+    features.build_features(
+        interim / "train.parquet", processed, test_paths=[interim / "test.parquet"]
+    )
+
+    model_path = temp_dir / "models" / "logistic.json"
+    train.main(
+        ["--train", str(processed / "train.parquet"), "--model", str(model_path)]
+    )
+    fitted = logistic.LogisticModel.load(model_path)
+    assert fitted.columns == matrix.load_matrix(processed / "train.parquet").columns
+
+    output = temp_dir / "predictions.csv"
+    score.main(
+        [
+            "--input",
+            str(interim / "test.parquet"),
+            "--output",
+            str(output),
+            "--plan",
+            str(processed),
+            "--model",
+            str(model_path),
+        ]
+    )
+    predictions = read_predictions(output)
+    assert predictions.height == 300
+    matrix.export_matrix(processed / "test.parquet")
+    expected = fitted.predict(matrix.load_matrix(processed / "test.parquet").features)
+    np.testing.assert_allclose(predictions["target"].to_numpy(), expected, rtol=1e-4)
+
+
+def read_predictions(path: Path) -> pl.DataFrame:
+    predictions = pl.read_csv(path)
+    assert predictions.columns == ["id", "target"]
+    return predictions
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_score_parquet_matches_processed_features(trained, temp_dir, workers):
+    """Test that streaming interim batches reproduces the offline pipeline."""
+    scorer, _, test_parquet, expected = trained
+    output = temp_dir / "predictions.csv"
+    report = batch_scoring.score_file(
+        test_parquet, output, scorer, batch_size=64, max_workers=workers
+    )
+
+    predictions = read_predictions(output)
+    assert report.rows == 500
+    assert report.batches == 8
+    assert report.rows_per_second > 0
+    assert predictions["id"].to_list() == pl.read_parquet(test_parquet)["id"].to_list()
+    np.testing.assert_allclose(predictions["target"].to_numpy(), expected, rtol=1e-4)
+    assert not output.with_name("predictions.csv.tmp").exists()
+
+
+def test_score_upper_case_parquet_suffix(trained, temp_dir):
+    """Test that the input format is recognised regardless of suffix case."""
+    scorer, _, test_parquet, expected = trained
+    upper = temp_dir / "TEST.PARQUET"
+    shutil.copyfile(test_parquet, upper)
+    output = temp_dir / "predictions.csv"
+    report = batch_scoring.score_file(upper, output, scorer, batch_size=200)
+    assert report.rows == 500
+    predictions = read_predictions(output)
+    np.testing.assert_allclose(predictions["target"].to_numpy(), expected, rtol=1e-4)
+
+
+def test_score_compressed_csv(trained, temp_dir):
+    """Test that a gzipped raw CSV is scored like its interim Parquet file."""
+    scorer, test_csv, _, expected = trained
+    compressed = temp_dir / "test.csv.gz"
+    with open(test_csv, "rb") as source, gzip.open(compressed, "wb") as target:
+        shutil.copyfileobj(source, target)
+
+    output = temp_dir / "predictions.csv"
+    report = batch_scoring.score_file(
+        compressed, output, scorer, batch_size=1_000, chunk_size=10_000
+    )
+    assert report.batches > 1
+    predictions = read_predictions(output)
+    np.testing.assert_allclose(predictions["target"].to_numpy(), expected, rtol=1e-4)
+
+
+def test_failed_run_leaves_no_output(trained, temp_dir, monkeypatch):
+    """Test that an error while scoring removes the partial output."""
+    scorer, _, test_parquet, _ = trained
+
+    def fail(frame):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(batch_scoring.Scorer, "score", lambda self, frame: fail(frame))
+    output = temp_dir / "predictions.csv"
+    with pytest.raises(RuntimeError, match="boom"):
+        batch_scoring.score_file(test_parquet, output, scorer, batch_size=100)
+    assert list(temp_dir.glob("predictions.csv*")) == []
+
+
+def test_invalid_arguments(trained, temp_dir):
+    """Test the validation of the scoring arguments."""
+    scorer, _, test_parquet, _ = trained
+    output = temp_dir / "predictions.csv"
+    with pytest.raises(FileNotFoundError):
+        batch_scoring.score_file(temp_dir / "missing.parquet", output, scorer)
+    with pytest.raises(ValueError, match="Worker count"):
+        batch_scoring.score_file(test_parquet, output, scorer, max_workers=0)
+    with pytest.raises(ValueError, match="Output directory"):
+        batch_scoring.score_file(test_parquet, temp_dir / "no" / "p.csv", scorer)
+    with pytest.raises(ValueError, match="Batch size"):
+        batch_scoring.score_file(test_parquet, output, scorer, batch_size=0)
+    (temp_dir / "test.json").write_text("{}")
+    with pytest.raises(ValueError, match="Parquet or CSV"):
+        batch_scoring.score_file(temp_dir / "test.json", output, scorer)
+
+
+def test_scorer_load_errors(trained, temp_dir):
+    """Test that missing models and unnamed models are rejected."""
+    scorer, _, _, _ = trained
+    plan_dir = temp_dir / "processed"
+    with pytest.raises(FileNotFoundError, match="Model"):
+        batch_scoring.Scorer.load(plan_dir, temp_dir / "missing.json")
+    unnamed = logistic.LogisticModel([], np.zeros(1), np.ones(1), np.zeros(1), 0.0)
+    unnamed.save(temp_dir / "unnamed.json")
+    with pytest.raises(ValueError, match="feature columns"):
+        batch_scoring.Scorer.load(plan_dir, temp_dir / "unnamed.json")
@@ -0,0 +1,49 @@
+from benchmarks import regression
+
+BASELINE = [
+    {
+        "benchmark": "convert",
+        "rows": 10000,
+        "seconds": 1.0,
+        "peak_rss_mb": 100.0,
+        "rows_per_second": 10000.0,
+        "output_mb": 1.0,
+    }
+]
+
+
+def _result(**changes):
+    return [{**BASELINE[0], **changes}]
+
+
+def test_compare_no_regression():
+    """Test that changes within the threshold pass."""
+    assert regression.compare(_result(seconds=1.1), BASELINE, threshold=0.2) == []
+
+
+def test_compare_slower_and_larger():
+    """Test that higher times and memory are reported."""
+    regressions = regression.compare(
+        _result(seconds=1.5, peak_rss_mb=200.0), BASELINE, threshold=0.2
+    )
+    assert len(regressions) == 2
+    assert "seconds regressed by 50%" in regressions[0]
+    assert "peak_rss_mb" in regressions[1]
+
+
+def test_compare_lower_throughput():
+    """Test that a drop in rows/s is reported while a rise is not."""
+    assert regression.compare(_result(rows_per_second=5000.0), BASELINE)
+    assert not regression.compare(_result(rows_per_second=50000.0), BASELINE)
+
+
+def test_compare_ignores_unmatched_entries():
+    """Test that results without a baseline counterpart are skipped."""
+    assert regression.compare(_result(rows=99, seconds=10.0), BASELINE) == []
+
+
+def test_save_and_load(tmp_path):
+    """Test the JSON round trip of results with metadata."""
+    path = tmp_path / "results" / "baseline.json"
+    regression.save(path, BASELINE, polars="1.32.3")
+    assert regression.load(path) == BASELINE
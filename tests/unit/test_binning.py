@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+import numpy as np
+import polars as pl
+import pytest
+from benchmarks import synthetic
+from src.data_preparation import binning
+from src.data_understanding import data_collection, matrix
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def train_parquet(temp_dir):
+    """Convert a synthetic train CSV to Parquet."""
+    csv = synthetic.write_csv(temp_dir / "train.csv", 3_000, seed=9)
+    output = temp_dir / "train.parquet"
+    data_collection.convert_data(csv, output)
+    return output
+
+
+def test_bin_edges_are_lossless_for_few_levels():
+    """Test that low-cardinality columns get one bin per value."""
+    values = np.array([3, 1, 2, 2, np.nan, 1])
+    edges = binning.bin_edges(values)
+    np.testing.assert_array_equal(edges, [1.5, 2.5])
+    np.testing.assert_array_equal(
+        binning.apply_bins(values, edges), [3, 1, 2, 2, binning.MISSING_BIN, 1]
+    )
+
+
+def test_bin_edges_use_quantiles():
+    """Test that continuous columns get roughly equal-count bins."""
+    values = np.random.default_rng(0).normal(size=100_000)
+    edges = binning.bin_edges(values, max_bins=10)
+    assert len(edges) == 9
+    counts = np.bincount(binning.apply_bins(values, edges))
+    assert counts[0] == 0
+    assert counts[1:].min() > 9_000
+    assert counts[1:].max() < 11_000
+
+
+def test_bin_edges_merge_repeated_quantiles():
+    """Test that a dominant value does not create empty bins."""
+    values = np.concatenate([np.zeros(9_000), np.arange(1_000) / 7])
+    edges = binning.bin_edges(values, max_bins=20)
+    assert np.all(np.diff(edges) > 0)
+    assert len(edges) < 19
+
+
+def test_export_binned_matches_float_matrix(train_parquet):
+    """Test that the binned matrix orders values like the float matrix."""
+    files = binning.export_binned(train_parquet, sketch_size=1_000)
+    binned = binning.load_binned(train_parquet)
+    matrix.export_matrix(train_parquet)
+    floats = matrix.load_matrix(train_parquet)
+
+    assert binned.bins.dtype == np.uint8
+    assert binned.bins.flags.f_contiguous
+    assert binned.bins.shape == floats.features.shape
+    assert binned.columns == floats.columns
+    assert (
+        files.bins.stat().st_size
+        < os.stat(matrix.matrix_files(train_parquet).features).st_size / 3
+    )
+    np.testing.assert_array_equal(binned.target, floats.target)
+    np.testing.assert_array_equal(binned.ids, floats.ids)
+
+    for index, name in enumerate(binned.columns):
+        values, bins = floats.features[:, index], binned.bins[:, index]
+        assert np.all((bins == binning.MISSING_BIN) == np.isnan(values))
+        order = np.argsort(values[~np.isnan(values)], kind="stable")
+        assert np.all(np.diff(bins[~np.isnan(values)][order].astype(int)) >= 0)
+        assert bins.max() <= len(binned.edges[name]) + 1
+
+    # Low-cardinality columns are binned one value per bin
+    flag = binned.columns.index("ps_ind_06_bin")
+    assert set(np.unique(binned.bins[:, flag])) == {1, 2}
+
+
+def test_export_binned_is_reused_when_current(train_parquet):
+    """Test that an up-to-date export is skipped and new options redo it."""
+    files = binning.export_binned(train_parquet, sketch_size=500)
+    mtime = files.bins.stat().st_mtime_ns
+    assert binning.export_binned(train_parquet, sketch_size=500) == files
+    assert files.bins.stat().st_mtime_ns == mtime
+
+    binning.export_binned(train_parquet, columns=["ps_car_13"], max_bins=16)
+    binned = binning.load_binned(train_parquet)
+    assert binned.columns == ["ps_car_13"]
+    assert binned.bins.max() == 16
+
+
+def test_sketch_is_deterministic(train_parquet):
+    """Test that the row sample depends only on the seed."""
+    lf = pl.scan_parquet(train_parquet)
+    first = binning.sketch(lf, ["ps_car_13"], sketch_size=300, seed=2)
+    again = binning.sketch(lf, ["ps_car_13"], sketch_size=300, seed=2)
+    assert first.equals(again)
+    assert 200 < first.height < 400
+    assert binning.sketch(lf, ["ps_car_13"], sketch_size=10_000).height == 3_000
+
+
+def test_export_binned_errors(train_parquet, temp_dir):
+    """Test the argument checks of the binned export."""
+    with pytest.raises(FileNotFoundError):
+        binning.export_binned(temp_dir / "missing.parquet")
+    with pytest.raises(ValueError, match="max_bins"):
+        binning.export_binned(train_parquet, max_bins=256)
+    with pytest.raises(ValueError, match="not found"):
+        binning.export_binned(train_parquet, columns=["nope"])
+    with pytest.raises(FileNotFoundError, match="No binned export"):
+        binning.load_binned(train_parquet)
+
+
+def test_load_binned_rejects_stale_export(train_parquet):
+    """Test that bins computed from an older version of the file are refused."""
+    binning.export_binned(train_parquet, sketch_size=500)
+    pl.read_parquet(train_parquet).head(10).write_parquet(train_parquet)
+    with pytest.raises(ValueError, match="stale"):
+        binning.load_binned(train_parquet)
@@ -0,0 +1,100 @@
+from pathlib import Path
+import numpy as np
+import pytest
+import tempfile
+import shutil
+from benchmarks import synthetic
+from src.data_understanding import data_collection, matrix
+from src.evaluation import gini
+from src.modeling import cross_validation
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def train_parquet(temp_dir):
+    """Convert a synthetic train CSV to Parquet."""
+    csv = synthetic.write_csv(temp_dir / "train.csv", 600, seed=3)
+    output = temp_dir / "train.parquet"
+    data_collection.convert_data(csv, output)
+    return output
+
+
+def first_column(features, target, train, valid):
+    """Score rows by their first feature, ignoring the training rows."""
+    return np.nan_to_num(features[valid, 0], nan=-1.0)
+
+
+def test_stratified_folds_balance_classes():
+    """Test that every fold gets the same share of positives."""
+    target = np.zeros(1_000, dtype=np.int8)
+    target[:40] = 1
+    folds = cross_validation.stratified_folds(target, n_folds=5, n_repeats=3, seed=1)
+
+    assert folds.shape == (3, 1_000)
+    for repeat in folds:
+        assert np.bincount(repeat, minlength=5).tolist() == [200] * 5
+        assert np.bincount(repeat[:40], minlength=5).tolist() == [8] * 5
+    assert not np.array_equal(folds[0], folds[1])
+    np.testing.assert_array_equal(
+        folds, cross_validation.stratified_folds(target, 5, 3, seed=1)
+    )
+
+
+def test_stratified_folds_rejects_small_classes():
+    """Test that classes smaller than the fold count are rejected."""
+    target = np.array([0] * 10 + [1] * 3)
+    with pytest.raises(ValueError, match="at least 5 rows"):
+        cross_validation.stratified_folds(target, n_folds=5)
+    with pytest.raises(ValueError, match="two folds"):
+        cross_validation.stratified_folds(target, n_folds=1)
+
+
+def test_cross_validate_serial(train_parquet):
+    """Test that every row gets exactly one prediction per repeat."""
+    result = cross_validation.cross_validate(
+        train_parquet, first_column, n_folds=3, n_repeats=2, executor="serial"
+    )
+    data = matrix.load_matrix(train_parquet)
+    expected = np.nan_to_num(data.features[:, 0], nan=-1.0)
+
+    assert result.oof.shape == (2, 600)
+    assert result.oof.dtype == np.float32
+    np.testing.assert_array_equal(result.oof[0], expected)
+    np.testing.assert_array_equal(result.mean_oof, expected)
+    assert [(r.repeat, r.fold) for r in result.folds] == [
+        (repeat, fold) for repeat in range(2) for fold in range(3)
+    ]
+    assert sum(r.n_valid for r in result.folds[:3]) == 600
+    assert all(r.n_train + r.n_valid == 600 for r in result.folds)
+    assert result.fold_seconds <= result.seconds
+    np.testing.assert_allclose(
+        result.repeat_gini, [gini.normalized_gini(data.target, expected)] * 2
+    )
+
+
+def test_cross_validate_process_pool_matches_serial(train_parquet):
+    """Test that the process pool fills the same out-of-fold array."""
+    serial = cross_validation.cross_validate(
+        train_parquet, n_folds=3, n_repeats=1, executor="serial"
+    )
+    pooled = cross_validation.cross_validate(
+        train_parquet, n_folds=3, n_repeats=1, max_workers=2
+    )
+
+    np.testing.assert_allclose(pooled.oof, serial.oof, rtol=1e-6)
+    assert [r.gini for r in pooled.folds] == pytest.approx(
+        [r.gini for r in serial.folds]
+    )
+
+
+def test_cross_validate_rejects_unknown_executor(train_parquet):
+    """Test that an unknown executor is rejected."""
+    with pytest.raises(ValueError, match="Executor"):
+        cross_validation.cross_validate(train_parquet, executor="thread")
@@ -0,0 +1,113 @@
+import shutil
+import tempfile
+from pathlib import Path
+import polars as pl
+import pytest
+from benchmarks import synthetic
+from src.data_understanding import data_access, data_collection
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def data_dir(temp_dir):
+    """An interim directory holding a converted train split."""
+    csv = synthetic.write_csv(temp_dir / "train.csv", 2_000, seed=4)
+    interim = temp_dir / "interim"
+    interim.mkdir()
+    data_collection.convert_data(csv, interim / "train.parquet")
+    return interim
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start and end every test with an empty, default-sized cache."""
+    data_access.cache().clear()
+    yield
+    data_access.cache().resize(data_access.DEFAULT_CACHE_BYTES)
+    data_access.cache().clear()
+
+
+def test_load_projects_and_filters(data_dir):
+    """Test that only the requested columns and rows are returned."""
+    full = pl.read_parquet(data_dir / "train.parquet")
+    frame = data_access.load(
+        "train",
+        columns=["id", "ps_car_13"],
+        filter=pl.col("target") == 1,
+        data_dir=data_dir,
+    )
+    expected = full.filter(pl.col("target") == 1).select("id", "ps_car_13")
+    assert frame.equals(expected)
+    assert data_access.load(data_dir / "train.parquet").equals(full)
+
+
+def test_load_sample_is_deterministic(data_dir):
+    """Test that a sample returns the same rows for the same seed."""
+    first = data_access.load("train", ["id"], sample=0.1, data_dir=data_dir)
+    again = data_access.load("train", ["id"], sample=0.1, data_dir=data_dir)
+    other = data_access.load("train", ["id"], sample=0.1, seed=1, data_dir=data_dir)
+    assert 100 < first.height < 300
+    assert first.equals(again)
+    assert not first.equals(other)
+    assert data_access.load("train", sample=1.0, data_dir=data_dir).height == 2_000
+
+
+def test_cache_hits_and_invalidation(data_dir):
+    """Test that repeated loads hit the cache and rewrites invalidate it."""
+    first = data_access.load("train", ["id", "target"], data_dir=data_dir)
+    assert data_access.load("train", ("id", "target"), data_dir=data_dir) is first
+    info = data_access.cache().info()
+    assert (info["hits"], info["misses"], info["entries"]) == (1, 1, 1)
+    assert info["bytes"] == first.estimated_size()
+
+    other = data_access.load(
+        "train", ["id", "target"], filter=pl.col("target") == 0, data_dir=data_dir
+    )
+    assert other is not first
+    uncached = data_access.load("train", ["id"], data_dir=data_dir, use_cache=False)
+    assert uncached.width == 1
+    assert len(data_access.cache()) == 2
+
+    pl.read_parquet(data_dir / "train.parquet").head(5).write_parquet(
+        data_dir / "train.parquet"
+    )
+    assert data_access.load("train", ["id", "target"], data_dir=data_dir).height == 5
+
+
+def test_cache_is_bounded_by_bytes():
+    """Test that the least recently used frames are evicted first."""
+    frames = {key: pl.DataFrame({"x": range(1_000)}) for key in "abc"}
+    size = frames["a"].estimated_size()
+    cache = data_access.FrameCache(max_bytes=2 * size)
+    cache.put("a", frames["a"])
+    cache.put("b", frames["b"])
+    assert cache.get("a") is frames["a"]
+    cache.put("c", frames["c"])
+    assert cache.get("b") is None
+    assert cache.get("a") is frames["a"]
+    assert cache.bytes == 2 * size
+
+    cache.put("big", pl.DataFrame({"x": range(10_000)}))
+    assert cache.get("big") is None
+    cache.put("a", frames["a"])
+    assert cache.bytes == 2 * size
+    cache.resize(size)
+    assert len(cache) == 1
+    assert cache.get("a") is frames["a"]
+
+
+def test_load_errors(data_dir):
+    """Test the errors of the access API."""
+    with pytest.raises(FileNotFoundError, match="Split does not exist"):
+        data_access.load("valid", data_dir=data_dir)
+    with pytest.raises(ValueError, match="Columns not found"):
+        data_access.load("train", ["nope"], data_dir=data_dir)
+    with pytest.raises(ValueError, match="Sample"):
+        data_access.load("train", sample=0, data_dir=data_dir)
@@ -1,9 +1,17 @@
+import bz2
+import gzip
+import io
+import logging
+import os
+import sys
 from pathlib import Path
 import pytest
 import polars as pl
 import tempfile
 import shutil
-from src.data_understanding import data_collection
+from benchmarks import synthetic
+from src.data_understanding import data_collection, schema
+from src.utils import file_cache
 
 
 @pytest.fixture
@@ -42,10 +50,29 @@ def test_convert_data_success(sample_csv, temp_dir):
     df = pl.read_parquet(output_path)
     assert len(df) == 3
     assert df.columns == ["id", "target", "ps_ind_01", "ps_ind_02_cat", "ps_car_13"]
-    assert df["ps_ind_01"].to_list() == [2, 5, -1]  # Check missing value handling
+    assert df["ps_ind_01"].to_list() == [2, 5, None]  # -1 sentinel becomes null
     assert df["target"].to_list() == [0, 1, 0]
 
 
+def test_convert_data_emits_stage_metrics(sample_csv, temp_dir, caplog):
+    """Test that the validation and conversion stages are measured."""
+    caplog.set_level(logging.DEBUG, logger="metrics")
+    output_path = os.path.join(temp_dir, "output.parquet")
+    data_collection.convert_data(sample_csv, output_path)
+
+    stages = {
+        r.metrics["event"]: r.metrics for r in caplog.records if hasattr(r, "metrics")
+    }
+    assert set(stages) == {
+        "convert_data",
+        "convert_data.validation",
+        "convert_data.convert",
+    }
+    assert stages["convert_data.convert"]["rows"] == 3
+    assert stages["convert_data"]["output_bytes"] == os.path.getsize(output_path)
+    assert stages["convert_data"]["input_bytes"] == os.path.getsize(sample_csv)
+
+
 def test_convert_data_nonexistent_input(temp_dir):
     """Test error when input file does not exist."""
     nonexistent_path = temp_dir / "nonexistent.csv"
@@ -114,3 +141,368 @@ def test_convert_data_large_porto_seguro_like(temp_dir):
     df_out = pl.read_parquet(output_path)
     assert len(df_out) == n_rows
     assert df_out.columns == ["id", "target", "ps_ind_01", "ps_ind_02_cat", "ps_car_13"]
+
+
+def test_convert_data_declared_dtypes(sample_csv, temp_dir):
+    """Test that Porto Seguro columns are stored with compact declared dtypes."""
+    output_path = temp_dir / "output.parquet"
+    data_collection.convert_data(sample_csv, output_path)
+    result_schema = pl.read_parquet_schema(output_path)
+    assert result_schema["id"] == pl.Int32
+    assert result_schema["target"] == pl.Int8
+    assert result_schema["ps_ind_01"] == pl.Int8
+    assert result_schema["ps_ind_02_cat"] == pl.Int8
+    assert result_schema["ps_car_13"] == pl.Float32
+
+
+def test_convert_data_keep_sentinel(sample_csv, temp_dir):
+    """Test that the -1 sentinel can be preserved."""
+    output_path = temp_dir / "output.parquet"
+    data_collection.convert_data(sample_csv, output_path, sentinel_to_null=False)
+    df = pl.read_parquet(output_path)
+    assert df["ps_ind_02_cat"].to_list() == [1, -1, 3]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_convert_data_strict_keeps_sentinel_except_in_flags(temp_dir, streaming):
+    """Test that strict mode accepts -1 in flags when the sentinel is kept."""
+    csv_path = synthetic.write_csv(temp_dir / "train.csv", 20, seed=3)
+    frame = pl.read_csv(csv_path).with_columns(
+        pl.when(pl.col("id") == pl.col("id").first())
+        .then(-1)
+        .otherwise(pl.col("ps_ind_06_bin"))
+        .alias("ps_ind_06_bin")
+    )
+    frame.write_csv(csv_path)
+    output_path = temp_dir / "output.parquet"
+    data_collection.convert_data(
+        csv_path,
+        output_path,
+        strict=True,
+        sentinel_to_null=False,
+        streaming=streaming,
+    )
+    df = pl.read_parquet(output_path)
+    assert df["ps_ind_06_bin"][0] is None
+    assert df["ps_ind_06_bin"].null_count() == 1
+    assert df["ps_ind_02_cat"].to_list() == frame["ps_ind_02_cat"].to_list()
+
+
+def test_convert_data_binary_flags(temp_dir):
+    """Test that binary flags are stored as Boolean with nulls for bad values."""
+    csv_path = temp_dir / "bin.csv"
+    pl.DataFrame(
+        {"id": [1, 2, 3], "ps_ind_06_bin": [0, 1, 2], "extra": ["a", "b", "c"]}
+    ).write_csv(csv_path)
+    output_path = temp_dir / "output.parquet"
+    data_collection.convert_data(csv_path, output_path)
+    df = pl.read_parquet(output_path)
+    assert df["ps_ind_06_bin"].dtype == pl.Boolean
+    assert df["ps_ind_06_bin"].to_list() == [False, True, None]
+    assert df["extra"].to_list() == ["a", "b", "c"]
+
+
+def test_convert_data_strict_missing_column(sample_csv, temp_dir):
+    """Test that strict mode rejects a header missing Porto Seguro columns."""
+    output_path = temp_dir / "output.parquet"
+    with pytest.raises(ValueError, match="Missing expected columns"):
+        data_collection.convert_data(sample_csv, output_path, strict=True)
+    assert not output_path.exists()
+
+
+def test_convert_data_strict_out_of_domain(temp_dir):
+    """Test that strict mode fails on a binary flag outside {0, 1}."""
+    csv_path = temp_dir / "full.csv"
+    columns = schema.expected_columns()
+    row = {name: [0] for name in columns}
+    row["ps_ind_06_bin"] = [2]
+    pl.DataFrame(row).write_csv(csv_path)
+    with pytest.raises(pl.exceptions.PolarsError, match="Failed to convert"):
+        data_collection.convert_data(csv_path, temp_dir / "output.parquet", strict=True)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_convert_data_counts_invalid_flags(temp_dir, caplog, streaming):
+    """Test that non-strict mode nulls out-of-domain flags and reports them."""
+    csv_path = temp_dir / "full.csv"
+    columns = schema.expected_columns()
+    rows = {name: [0] * 4 for name in columns}
+    rows["ps_ind_06_bin"] = [0, 2, -1, 9]
+    pl.DataFrame(rows).write_csv(csv_path)
+    caplog.set_level(logging.WARNING, logger=data_collection.__name__)
+    output_path = temp_dir / "output.parquet"
+    data_collection.convert_data(csv_path, output_path, streaming=streaming)
+
+    flags = pl.read_parquet(output_path)["ps_ind_06_bin"].to_list()
+    assert flags == [False, None, None, None]
+    warnings = [r.getMessage() for r in caplog.records if r.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert "2 values of ps_ind_06_bin outside {0, 1} read as null" in warnings[0]
+
+
+def test_convert_data_out_of_range_value(temp_dir):
+    """Test that a value that does not fit its declared dtype fails the scan."""
+    csv_path = temp_dir / "range.csv"
+    pl.DataFrame({"id": [1], "ps_ind_01": [300]}).write_csv(csv_path)
+    with pytest.raises(pl.exceptions.PolarsError, match="Failed to convert"):
+        data_collection.convert_data(csv_path, temp_dir / "output.parquet")
+
+
+def test_convert_data_writes_manifest(sample_csv, temp_dir):
+    """Test that a manifest describing the conversion is written."""
+    output_path = temp_dir / "output.parquet"
+    assert data_collection.convert_data(sample_csv, output_path) is True
+    manifest = data_collection.manifest_path(output_path)
+    assert manifest.name == "output.parquet.manifest.json"
+    assert manifest.exists()
+
+
+def test_convert_data_skips_up_to_date(sample_csv, temp_dir):
+    """Test that an unchanged source is not converted again."""
+    output_path = temp_dir / "output.parquet"
+    data_collection.convert_data(sample_csv, output_path)
+    mtime = output_path.stat().st_mtime_ns
+    assert data_collection.convert_data(sample_csv, output_path) is False
+    assert output_path.stat().st_mtime_ns == mtime
+    assert data_collection.convert_data(sample_csv, output_path, force=True) is True
+
+
+def test_convert_data_reconverts_on_change(sample_csv, temp_dir):
+    """Test that a changed source or changed options trigger a conversion."""
+    output_path = temp_dir / "output.parquet"
+    data_collection.convert_data(sample_csv, output_path)
+    assert not data_collection.is_stale(sample_csv, output_path)
+    assert data_collection.is_stale(sample_csv, output_path, sentinel_to_null=False)
+
+    with open(sample_csv, "a") as handle:
+        handle.write("4,1,3,2,0.5\n")
+    assert data_collection.is_stale(sample_csv, output_path)
+    assert data_collection.convert_data(sample_csv, output_path) is True
+    assert len(pl.read_parquet(output_path)) == 4
+
+
+def test_stale_outputs(sample_csv, temp_dir):
+    """Test reporting of stale outputs across several conversions."""
+    fresh = temp_dir / "fresh.parquet"
+    missing = temp_dir / "missing.parquet"
+    data_collection.convert_data(sample_csv, fresh)
+    assert data_collection.stale_outputs(
+        [(sample_csv, fresh), (sample_csv, missing)]
+    ) == [missing]
+
+    fresh.write_bytes(b"")
+    assert data_collection.stale_outputs([(sample_csv, fresh)]) == [fresh]
+
+
+def test_is_stale_missing_input(temp_dir):
+    """Test error when checking a missing input."""
+    with pytest.raises(FileNotFoundError, match="Input file does not exist"):
+        data_collection.is_stale(temp_dir / "missing.csv", temp_dir / "o.parquet")
+
+
+def test_convert_data_skips_touched_source(sample_csv, temp_dir, monkeypatch):
+    """Test that a touched but unchanged source is still up to date."""
+    output_path = temp_dir / "output.parquet"
+    data_collection.convert_data(sample_csv, output_path)
+    stat = sample_csv.stat()
+    os.utime(sample_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    hashed = []
+    content_hash = file_cache.content_hash
+    monkeypatch.setattr(
+        file_cache,
+        "content_hash",
+        lambda path: hashed.append(path) or content_hash(path),
+    )
+    assert data_collection.convert_data(sample_csv, output_path) is False
+    # Hashed once to compare, and the new mtime is recorded for the next check
+    assert len(hashed) == 1
+    assert not data_collection.is_stale(sample_csv, output_path)
+    assert len(hashed) == 1
+
+
+def test_convert_data_parquet_options(sample_csv, temp_dir):
+    """Test that Parquet write options are applied and tracked in the manifest."""
+    output_path = temp_dir / "output.parquet"
+    data_collection.convert_data(
+        sample_csv,
+        output_path,
+        compression="lz4",
+        row_group_size=2,
+        statistics=False,
+    )
+    assert len(pl.read_parquet(output_path)) == 3
+    assert not data_collection.is_stale(
+        sample_csv, output_path, compression="lz4", row_group_size=2, statistics=False
+    )
+    assert data_collection.is_stale(sample_csv, output_path, compression="zstd")
+
+
+def test_convert_data_partitioned(sample_csv, temp_dir):
+    """Test hive-style partitioned output by target."""
+    output_path = temp_dir / "output.parquet"
+    data_collection.convert_data(sample_csv, output_path, partition_by="target")
+    assert output_path.is_dir()
+    assert sorted(p.name for p in output_path.iterdir()) == ["target=0", "target=1"]
+    df = pl.scan_parquet(output_path).filter(pl.col("target") == 0).collect()
+    assert sorted(df["id"].to_list()) == [1, 3]
+    assert not data_collection.is_stale(sample_csv, output_path, partition_by="target")
+
+    # Switching back to a single file replaces the partition directory
+    data_collection.convert_data(sample_csv, output_path)
+    assert output_path.is_file()
+
+
+def test_convert_data_unknown_partition_column(sample_csv, temp_dir):
+    """Test error when partitioning by a column the input does not have."""
+    with pytest.raises(ValueError, match="Partition columns not found"):
+        data_collection.convert_data(
+            sample_csv, temp_dir / "output.parquet", partition_by=["ps_car_11_cat"]
+        )
+
+
+@pytest.fixture
+def compressed_sources(sample_csv):
+    """Write gzip and bz2 copies of the sample CSV."""
+    data = sample_csv.read_bytes()
+    gz_path = sample_csv.with_name("sample.csv.gz")
+    bz2_path = sample_csv.with_name("sample.csv.bz2")
+    with gzip.open(gz_path, "wb") as handle:
+        handle.write(data)
+    with bz2.open(bz2_path, "wb") as handle:
+        handle.write(data)
+    return [gz_path, bz2_path]
+
+
+def test_convert_data_compressed(compressed_sources, sample_csv, temp_dir):
+    """Test that compressed CSVs convert to the same frame as the plain file."""
+    expected_path = temp_dir / "expected.parquet"
+    data_collection.convert_data(sample_csv, expected_path)
+    expected = pl.read_parquet(expected_path)
+    for source in compressed_sources:
+        output_path = temp_dir / f"{data_collection.csv_stem(source)}.parquet"
+        assert data_collection.convert_data(source, output_path, force=True)
+        assert pl.read_parquet(output_path).equals(expected)
+        assert not data_collection.is_stale(source, output_path)
+
+
+def test_convert_data_zstd(sample_csv, temp_dir):
+    """Test conversion of a zstd-compressed CSV."""
+    zstandard = pytest.importorskip("zstandard")
+    source = temp_dir / "sample.csv.zst"
+    source.write_bytes(zstandard.ZstdCompressor().compress(sample_csv.read_bytes()))
+    output_path = temp_dir / "output.parquet"
+    data_collection.convert_data(source, output_path)
+    assert pl.read_parquet(output_path)["id"].to_list() == [1, 2, 3]
+
+
+def test_estimate_size(compressed_sources, sample_csv, temp_dir, monkeypatch):
+    """Test the decompressed size estimate of plain and compressed CSVs."""
+    size = sample_csv.stat().st_size
+    assert data_collection.estimate_size(sample_csv) == size
+    for source in compressed_sources:
+        assert data_collection.estimate_size(source) == size
+
+    # Larger than the sample: extrapolated from the sample's ratio
+    large = synthetic.write_csv(temp_dir / "large.csv", 5_000, seed=4)
+    with (
+        open(large, "rb") as source,
+        gzip.open(temp_dir / "large.csv.gz", "wb") as target,
+    ):
+        shutil.copyfileobj(source, target)
+    monkeypatch.setattr(data_collection, "SIZE_SAMPLE_BYTES", 64 * 1024)
+    monkeypatch.setattr(file_cache, "CHUNK_SIZE", 4 * 1024)
+    estimate = data_collection.estimate_size(temp_dir / "large.csv.gz")
+    assert estimate == pytest.approx(large.stat().st_size, rel=0.1)
+    assert estimate > 2 * (temp_dir / "large.csv.gz").stat().st_size
+
+    zstandard = pytest.importorskip("zstandard")
+    zst_path = temp_dir / "sample.csv.zst"
+    zst_path.write_bytes(zstandard.ZstdCompressor().compress(sample_csv.read_bytes()))
+    assert data_collection.estimate_size(zst_path) == size
+
+
+def test_convert_data_stdin(sample_csv, temp_dir, monkeypatch):
+    """Test conversion from standard input, which is never cached."""
+    monkeypatch.setattr(
+        sys, "stdin", io.TextIOWrapper(io.BytesIO(sample_csv.read_bytes()))
+    )
+    output_path = temp_dir / "output.parquet"
+    assert data_collection.convert_data("-", output_path) is True
+    assert pl.read_parquet(output_path)["ps_ind_01"].to_list() == [2, 5, None]
+    assert not data_collection.manifest_path(output_path).exists()
+
+
+def test_convert_data_streaming_progress(temp_dir):
+    """Test batched conversion with a small chunk size and progress reporting."""
+    csv_path = temp_dir / "batched.csv"
+    n_rows = 1000
+    pl.DataFrame(
+        {
+            "id": range(n_rows),
+            "ps_ind_06_bin": [i % 2 for i in range(n_rows)],
+            "ps_reg_03": [-1.0 if i % 5 == 0 else i / 10 for i in range(n_rows)],
+            "region": ["north" if i % 3 else "south" for i in range(n_rows)],
+        }
+    ).write_csv(csv_path)
+    calls = []
+    output_path = temp_dir / "output.parquet"
+    data_collection.convert_data(
+        csv_path,
+        output_path,
+        chunk_size=1000,
+        progress=lambda n_bytes, rows: calls.append((n_bytes, rows)),
+    )
+    df = pl.read_parquet(output_path)
+    assert len(calls) > 1
+    assert calls[-1] == (csv_path.stat().st_size, n_rows)
+    assert df["id"].to_list() == list(range(n_rows))
+    assert df["ps_ind_06_bin"].dtype == pl.Boolean
+    assert df["ps_reg_03"].null_count() == n_rows // 5
+    assert df["region"].dtype == pl.String
+
+
+def test_convert_data_streaming_strict(temp_dir):
+    """Test that strict mode fails on out-of-domain values in a later batch."""
+    csv_path = temp_dir / "full.csv"
+    columns = schema.expected_columns()
+    rows = {name: [0] * 100 for name in columns}
+    rows["ps_ind_06_bin"] = [0] * 99 + [2]
+    pl.DataFrame(rows).write_csv(csv_path)
+    with pytest.raises(pl.exceptions.PolarsError):
+        data_collection.convert_data(
+            csv_path,
+            temp_dir / "output.parquet",
+            strict=True,
+            streaming=True,
+            chunk_size=4096,
+        )
+
+
+def test_convert_data_streaming_header_only(temp_dir):
+    """Test that a header-only input produces an empty file with the schema."""
+    csv_path = temp_dir / "empty.csv"
+    csv_path.write_text("id,ps_car_13,note\n")
+    output_path = temp_dir / "output.parquet"
+    data_collection.convert_data(csv_path, output_path, streaming=True)
+    df = pl.read_parquet(output_path)
+    assert len(df) == 0
+    assert df.schema == {"id": pl.Int32, "ps_car_13": pl.Float32, "note": pl.String}
+
+
+def test_scan_csv_stream_pushdown(temp_dir):
+    """Test that projections, filters and limits apply to streamed batches."""
+    stream = io.BytesIO(b"".join(f"{i},{i % 2}\n".encode() for i in range(50)))
+    lf = data_collection.scan_csv_stream(stream, ["id", "ps_ind_06_bin"], chunk_size=64)
+    df = lf.filter(pl.col("ps_ind_06_bin")).select("id").head(3).collect()
+    assert df["id"].to_list() == [1, 3, 5]
+
+
+def test_csv_path_helpers():
+    """Test recognition and stems of plain and compressed CSV names."""
+    assert data_collection.is_csv_path("a.csv")
+    assert data_collection.is_csv_path("a.CSV.GZ")
+    assert not data_collection.is_csv_path("a.json.gz")
+    assert not data_collection.is_csv_path("a.gz")
+    assert data_collection.csv_stem("dir/policies.csv.bz2") == "policies"
+    assert data_collection.csv_stem("policies.csv") == "policies"
@@ -0,0 +1,153 @@
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+import numpy as np
+import polars as pl
+import pytest
+from benchmarks import synthetic
+from src.data_understanding import data_collection, drift
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+def convert(temp_dir: Path, name: str, rows: int, seed: int) -> Path:
+    csv = synthetic.write_csv(temp_dir / f"{name}.csv", rows, seed=seed)
+    parquet = temp_dir / f"{name}.parquet"
+    data_collection.convert_data(csv, parquet)
+    return parquet
+
+
+def test_sketch_summarises_every_column(temp_dir):
+    """Test that flags get tables, fine continuous columns quantiles."""
+    path = convert(temp_dir, "train", 3_000, seed=1)
+    frame = pl.read_parquet(path)
+    result = drift.sketch(path)
+
+    assert result.rows == 3_000
+    assert "id" not in result.columns and "target" not in result.columns
+    flag = result.columns["ps_ind_06_bin"]
+    assert flag.kind == "levels"
+    assert flag.missing == frame["ps_ind_06_bin"].null_count()
+    assert flag.counts.sum() + flag.missing == 3_000
+
+    continuous = result.columns["ps_car_13"]
+    assert continuous.kind == "quantiles"
+    assert len(continuous.values) == drift.N_QUANTILES
+    observed = frame["ps_car_13"].drop_nulls()
+    assert continuous.values[0] == pytest.approx(observed.min())
+    assert continuous.values[-1] == pytest.approx(observed.max())
+    assert continuous.missing_rate == pytest.approx(
+        frame["ps_car_13"].null_count() / 3_000
+    )
+
+
+def test_sentinel_counts_as_missing():
+    """Test that -1 is counted as missing in unconverted numeric columns."""
+    lf = pl.LazyFrame({"ps_car_11": [-1, 1, 2, 2, None]}, schema={"ps_car_11": pl.Int8})
+    column = drift.sketch(lf).columns["ps_car_11"]
+    assert column.missing == 2
+    assert column.values.tolist() == [1.0, 2.0]
+    assert column.counts.tolist() == [1, 2]
+
+
+def test_identical_files_do_not_drift(temp_dir):
+    """Test that a file compared with itself is stable everywhere."""
+    result = drift.sketch(convert(temp_dir, "train", 2_000, seed=2))
+    report = drift.compare(result, result)
+    assert report["psi"].max() == pytest.approx(0.0, abs=1e-9)
+    assert report["ks"].max() == pytest.approx(0.0, abs=1e-9)
+    assert set(report["status"]) == {"stable"}
+
+
+def test_shifted_column_is_flagged(temp_dir):
+    """Test that a shifted and a re-weighted column stand out."""
+    path = convert(temp_dir, "train", 4_000, seed=3)
+    frame = pl.read_parquet(path)
+    shifted = frame.with_columns(
+        pl.col("ps_car_13") + 2.0,
+        pl.lit(True).alias("ps_ind_06_bin"),
+    )
+    report = drift.compare(drift.sketch(path), drift.sketch(shifted.lazy()))
+    by_column = {row["column"]: row for row in report.iter_rows(named=True)}
+
+    assert by_column["ps_car_13"]["status"] == "significant"
+    assert by_column["ps_car_13"]["ks"] > 0.5
+    assert by_column["ps_ind_06_bin"]["status"] == "significant"
+    assert by_column["ps_reg_01"]["status"] == "stable"
+    assert report["column"][0] in ("ps_car_13", "ps_ind_06_bin")
+
+
+def test_independent_samples_stay_stable(temp_dir):
+    """Test that two draws of the same distribution show little drift."""
+    reference = drift.sketch(convert(temp_dir, "train", 5_000, seed=4))
+    current = drift.sketch(convert(temp_dir, "new", 5_000, seed=5))
+    report = drift.compare(reference, current)
+    assert report["psi"].max() < drift.PSI_THRESHOLDS[0]
+    assert report["ks"].max() < 0.1
+
+
+def test_mixed_kinds_are_compared_as_quantiles():
+    """Test that a table and a quantile sketch of one column can be compared."""
+    values = np.arange(1_000, dtype=np.float64) % 300
+    reference = drift.sketch(pl.LazyFrame({"x": values}), max_levels=500)
+    current = drift.sketch(pl.LazyFrame({"x": values}), max_levels=10)
+    assert reference.columns["x"].kind == "levels"
+    assert current.columns["x"].kind == "quantiles"
+    value, ks = drift.column_drift(reference.columns["x"], current.columns["x"])
+    assert value < 0.01
+    assert ks < 0.01
+
+
+def test_psi_matches_definition():
+    """Test the PSI formula and the floor on empty bins."""
+    reference, current = np.array([0.5, 0.5]), np.array([0.25, 0.75])
+    expected = (0.25 - 0.5) * np.log(0.5) + (0.75 - 0.5) * np.log(1.5)
+    assert drift.psi(reference, current) == pytest.approx(expected)
+    assert np.isfinite(drift.psi([1.0, 0.0], [0.0, 1.0]))
+
+
+def test_schema_changes():
+    """Test that added, removed and retyped columns are reported."""
+    reference = drift.sketch(
+        pl.LazyFrame(
+            {"a": [1, 2], "b": [1.0, 2.0]}, schema={"a": pl.Int8, "b": pl.Float32}
+        )
+    )
+    current = drift.sketch(
+        pl.LazyFrame({"a": [1, 2], "c": [1, 2]}, schema={"a": pl.Int32, "c": pl.Int8})
+    )
+    assert drift.schema_changes(reference, current) == {
+        "added": ["c"],
+        "removed": ["b"],
+        "retyped": [("a", "Int8", "Int32")],
+    }
+    assert drift.compare(reference, current)["column"].to_list() == ["a"]
+
+
+def test_sketch_file_caches_by_content(temp_dir):
+    """Test that a sketch is computed once per content and survives a round trip."""
+    path = convert(temp_dir, "train", 1_000, seed=6)
+    cache_dir = temp_dir / "cache"
+    first = drift.sketch_file(path, cache_dir)
+    assert len(list(cache_dir.glob("train-*.sketch.json"))) == 1
+
+    with patch.object(drift, "sketch") as sketch:
+        second = drift.sketch_file(path, cache_dir)
+    sketch.assert_not_called()
+    assert second.rows == first.rows
+    for name, column in first.columns.items():
+        assert second.columns[name].kind == column.kind
+        np.testing.assert_allclose(second.columns[name].values, column.values)
+    assert drift.compare(first, second)["psi"].max() == pytest.approx(0.0, abs=1e-9)
+
+    uncached = drift.sketch_file(path)
+    assert uncached.rows == first.rows
+    with pytest.raises(FileNotFoundError):
+        drift.sketch_file(temp_dir / "missing.parquet", cache_dir)
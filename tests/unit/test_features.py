@@ -0,0 +1,143 @@
+import json
+from pathlib import Path
+import pytest
+import polars as pl
+import tempfile
+import shutil
+from benchmarks import synthetic
+from src.data_preparation import features
+from src.data_understanding import data_collection
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def interim_splits(temp_dir):
+    """Convert synthetic train and test CSVs to interim Parquet files."""
+    paths = []
+    for name, include_target, seed in (("train", True, 0), ("test", False, 1)):
+        csv_path = synthetic.write_csv(
+            temp_dir / f"{name}.csv", 2_000, seed=seed, include_target=include_target
+        )
+        output = temp_dir / f"{name}.parquet"
+        data_collection.convert_data(csv_path, output)
+        paths.append(output)
+    return paths
+
+
+def test_onehot_features(interim_splits, temp_dir):
+    """Test one-hot encoding, engineered columns and the dropped calc block."""
+    train, _ = interim_splits
+    plan = features.fit(train, encoding="onehot")
+    frame = features.transform(train, plan).collect()
+
+    assert not any(name.startswith("ps_calc_") for name in frame.columns)
+    assert "ps_ind_02_cat" not in frame.columns
+    assert frame["ps_ind_04_cat_0"].dtype == pl.Boolean
+    # Missing values get their own level
+    assert "ps_car_03_cat_m1" in frame.columns
+    assert frame.select(
+        pl.sum_horizontal(pl.col("^ps_car_03_cat_.*$")).eq(1).all()
+    ).item()
+
+    raw = pl.read_parquet(train)
+    bins = [c for c in raw.columns if c.startswith("ps_ind_") and c.endswith("_bin")]
+    expected = raw.select(pl.sum_horizontal(pl.col(bins).cast(pl.Int8)))
+    assert (
+        frame[features.IND_BIN_SUM_COLUMN].to_list() == expected.to_series().to_list()
+    )
+    kept = [c for c in raw.columns if c.startswith("ps_") and "_calc_" not in c]
+    expected_missing = raw.select(
+        pl.sum_horizontal(pl.col(kept).is_null().cast(pl.Int8))
+    ).to_series()
+    assert frame[features.MISSING_COUNT_COLUMN].to_list() == expected_missing.to_list()
+
+
+def test_keep_calc_columns(interim_splits):
+    """Test that the calc block can be kept."""
+    plan = features.fit(interim_splits[0], drop_calc=False)
+    assert "ps_calc_01" in plan.feature_columns
+
+
+def test_target_encoding(interim_splits):
+    """Test that categorical levels are replaced by smoothed positive rates."""
+    train, test = interim_splits
+    plan = features.fit(train, encoding="target", smoothing=0.0)
+    frame = features.transform(train, plan).collect()
+
+    raw = pl.read_parquet(train)
+    rates = raw.group_by("ps_car_04_cat").agg(pl.col("target").mean())
+    joined = raw.select("id", "ps_car_04_cat").join(rates, on="ps_car_04_cat")
+    encoded = frame.select("id", "ps_car_04_cat_te").join(joined, on="id")
+    assert (encoded["ps_car_04_cat_te"] - encoded["target"]).abs().max() < 1e-6
+    assert 0 < plan.prior < 1
+    document = json.loads(json.dumps(plan.to_dict()))
+    assert features.FeaturePlan.from_dict(document) == plan
+
+
+def test_target_encoding_unseen_level_uses_prior(temp_dir):
+    """Test that a level missing from train falls back to the prior."""
+    train = pl.LazyFrame(
+        {"id": [1, 2], "target": [0, 1], "ps_ind_02_cat": [1, 1]},
+        schema_overrides={"ps_ind_02_cat": pl.Int8},
+    )
+    test = pl.LazyFrame(
+        {"id": [3], "ps_ind_02_cat": [2]},
+        schema={"id": pl.Int64, "ps_ind_02_cat": pl.Int8},
+    )
+    plan = features.fit(train, encoding="target")
+    frame = features.transform(test, plan).collect()
+    assert frame["ps_ind_02_cat_te"].item() == pytest.approx(plan.prior)
+
+
+def test_target_encoding_requires_target(interim_splits):
+    """Test that target encoding cannot be fitted on the test split."""
+    with pytest.raises(ValueError, match="needs the target column"):
+        features.fit(interim_splits[1], encoding="target")
+
+
+def test_unknown_encoding(interim_splits):
+    """Test that an unknown encoding is rejected."""
+    with pytest.raises(ValueError, match="Encoding must be one of"):
+        features.fit(interim_splits[0], encoding="hashing")
+
+
+def test_build_features_train_and_test(interim_splits, temp_dir):
+    """Test that train and test share the plan and the feature columns."""
+    train, test = interim_splits
+    output_dir = temp_dir / "processed"
+    output_dir.mkdir()
+    outputs = features.build_features(train, output_dir, test_paths=[test])
+
+    train_frame = pl.read_parquet(outputs["train"])
+    test_frame = pl.read_parquet(outputs["test"])
+    assert train_frame.columns == ["id", "target", *test_frame.columns[1:]]
+    assert train_frame.schema["missing_count"] == test_frame.schema["missing_count"]
+    assert len(test_frame) == 2_000
+
+    plan = features.load_plan(output_dir)
+    assert plan == features.fit(train)
+
+
+def test_build_features_errors(interim_splits, temp_dir):
+    """Test missing inputs, output directories and plans."""
+    with pytest.raises(ValueError, match="Output directory does not exist"):
+        features.build_features(interim_splits[0], temp_dir / "missing")
+    with pytest.raises(FileNotFoundError):
+        features.build_features(temp_dir / "missing.parquet", temp_dir)
+    with pytest.raises(FileNotFoundError, match="Feature plan does not exist"):
+        features.load_plan(temp_dir / "nowhere")
+
+
+def test_transform_missing_column(interim_splits):
+    """Test that a split lacking a planned column is rejected."""
+    plan = features.fit(interim_splits[0])
+    lf = pl.scan_parquet(interim_splits[1]).drop("ps_reg_01")
+    with pytest.raises(ValueError, match="Missing feature columns"):
+        features.transform(lf, plan)
@@ -0,0 +1,56 @@
+import os
+import pytest
+from src.utils import file_cache
+
+
+@pytest.fixture
+def sample_file(tmp_path):
+    """Create a small file to fingerprint."""
+    path = tmp_path / "data.csv"
+    path.write_text("id,target\n1,0\n")
+    return path
+
+
+def test_content_hash_is_stable(sample_file, tmp_path):
+    """Test that equal contents hash equally and different contents do not."""
+    copy = tmp_path / "copy.csv"
+    copy.write_bytes(sample_file.read_bytes())
+    assert file_cache.content_hash(sample_file) == file_cache.content_hash(copy)
+    copy.write_text("id,target\n1,1\n")
+    assert file_cache.content_hash(sample_file) != file_cache.content_hash(copy)
+
+
+def test_fingerprint_without_hash(sample_file):
+    """Test that the hash can be left out of a fingerprint."""
+    assert set(file_cache.fingerprint(sample_file, with_hash=False)) == {
+        "size",
+        "mtime_ns",
+    }
+
+
+def test_matches_unchanged_and_touched(sample_file):
+    """Test that touching a file without changing it still matches."""
+    recorded = file_cache.fingerprint(sample_file)
+    assert file_cache.matches(sample_file, recorded)
+    stat = sample_file.stat()
+    os.utime(sample_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert file_cache.matches(sample_file, recorded)
+
+
+def test_matches_changed_or_missing(sample_file, tmp_path):
+    """Test that a modified or missing file does not match."""
+    recorded = file_cache.fingerprint(sample_file)
+    sample_file.write_text("id,target\n2,0\n")
+    assert not file_cache.matches(sample_file, recorded)
+    sample_file.write_text("id,target\n1,0\n\n")
+    assert not file_cache.matches(sample_file, recorded)
+    assert not file_cache.matches(tmp_path / "missing.csv", recorded)
+
+
+def test_json_round_trip(tmp_path):
+    """Test writing and reading a JSON document."""
+    path = tmp_path / "manifest.json"
+    assert file_cache.read_json(path) is None
+    file_cache.write_json(path, {"a": 1})
+    assert file_cache.read_json(path) == {"a": 1}
+    assert not (tmp_path / "manifest.json.tmp").exists()
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+from src.evaluation import gini
+
+
+def _pairwise_auc(y, score, weights=None):
+    """Brute-force AUC over every positive/negative pair."""
+    weights = np.ones(len(y)) if weights is None else weights
+    pos, neg = y == 1, y == 0
+    diff = score[pos][:, None] - score[neg][None, :]
+    pair_weights = weights[pos][:, None] * weights[neg][None, :]
+    wins = (diff > 0) + 0.5 * (diff == 0)
+    return (wins * pair_weights).sum() / pair_weights.sum()
+
+
+@pytest.fixture
+def data():
+    """Small labelled sample with tied scores and three models."""
+    rng = np.random.default_rng(0)
+    y = (rng.random(300) < 0.2).astype(int)
+    scores = np.round(rng.random((3, 300)) + 0.5 * y, 1)
+    weights = rng.uniform(0.1, 3.0, 300)
+    return y, scores, weights
+
+
+def test_auc_matches_pairwise_with_ties(data):
+    """Test tied scores against the pairwise definition."""
+    y, scores, _ = data
+    expected = [_pairwise_auc(y, row) for row in scores]
+    np.testing.assert_allclose(gini.auc(y, scores), expected, rtol=1e-12)
+
+
+def test_weighted_auc_matches_pairwise(data):
+    """Test sample weights against the pairwise definition."""
+    y, scores, weights = data
+    expected = [_pairwise_auc(y, row, weights) for row in scores]
+    np.testing.assert_allclose(gini.auc(y, scores, weights), expected, rtol=1e-12)
+
+
+def test_gini_matches_competition_reference():
+    """Test untied scores against the competition's lexsort implementation."""
+    rng = np.random.default_rng(1)
+    y = (rng.random(1000) < 0.1).astype(int)
+    score = rng.random(1000) + 0.2 * y
+
+    def raw(actual, pred):
+        table = np.c_[actual, pred, np.arange(len(actual))].astype(float)
+        table = table[np.lexsort((table[:, 2], -1 * table[:, 1]))]
+        cumulative = table[:, 0].cumsum().sum() / table[:, 0].sum()
+        return (cumulative - (len(actual) + 1) / 2.0) / len(actual)
+
+    expected = raw(y, score) / raw(y, y)
+    assert gini.normalized_gini(y, score) == pytest.approx(expected, abs=1e-12)
+
+
+def test_gini_bounds(data):
+    """Test perfect, inverted and 1D inputs."""
+    y, _, _ = data
+    assert gini.normalized_gini(y, y.astype(float)) == pytest.approx(1.0)
+    assert gini.normalized_gini(y, -y.astype(float)) == pytest.approx(-1.0)
+    assert isinstance(gini.normalized_gini(y, y.astype(float)), float)
+
+
+def test_invalid_inputs(data):
+    """Test the validation errors."""
+    y, scores, weights = data
+    with pytest.raises(ValueError, match="Scores must have shape"):
+        gini.auc(y, scores[:, :-1])
+    with pytest.raises(ValueError, match="Labels must be 0 or 1"):
+        gini.auc(y * 2, scores)
+    with pytest.raises(ValueError, match="Labels must be one-dimensional"):
+        gini.auc(y[None, :], scores)
+    with pytest.raises(ValueError, match="Weights must have shape"):
+        gini.auc(y, scores, weights[:-1])
+    with pytest.raises(ValueError, match="both positive and negative"):
+        gini.auc(np.zeros(300, dtype=int), scores)
+
+
+def test_bootstrap_replays_resamples(data):
+    """Test that each bootstrap sample equals the Gini of its resample."""
+    y, scores, _ = data
+    result = gini.bootstrap_gini(y, scores, n_resamples=5, seed=3, batch_size=2)
+    assert result.samples.shape == (3, 5)
+    np.testing.assert_allclose(result.estimate, gini.normalized_gini(y, scores))
+
+    rng = np.random.default_rng(3)
+    uniform = np.full(len(y), 1 / len(y))
+    counts = np.concatenate(
+        [rng.multinomial(len(y), uniform, size=size) for size in (2, 2, 1)]
+    )
+    for index, count in enumerate(counts):
+        rows = np.repeat(np.arange(len(y)), count)
+        expected = gini.normalized_gini(y[rows], scores[:, rows])
+        np.testing.assert_allclose(result.samples[:, index], expected, rtol=1e-12)
+
+
+def test_bootstrap_interval_contains_estimate(data):
+    """Test the interval ordering and its reproducibility."""
+    y, scores, weights = data
+    first = gini.bootstrap_gini(y, scores[0], n_resamples=200, sample_weight=weights)
+    second = gini.bootstrap_gini(y, scores[0], n_resamples=200, sample_weight=weights)
+    assert first.lower[0] <= first.estimate[0] <= first.upper[0]
+    np.testing.assert_array_equal(first.samples, second.samples)
+    with pytest.raises(ValueError, match="Confidence must be in"):
+        gini.bootstrap_gini(y, scores, confidence=1.5)
+
+
+def test_bootstrap_redraws_single_class_resamples(caplog):
+    """Test that a tiny, imbalanced sample still yields every resample."""
+    y = np.array([1] + [0] * 9)
+    scores = np.linspace(0, 1, 10)[::-1]
+    result = gini.bootstrap_gini(y, scores, n_resamples=200, seed=1)
+    assert result.redrawn > 0
+    assert result.degenerate == 0
+    assert not np.isnan(result.samples).any()
+    np.testing.assert_allclose(result.samples, 1.0)
+
+    weights = np.array([0.0] + [1.0] * 9)
+    with caplog.at_level("WARNING", logger=gini.__name__):
+        result = gini.bootstrap_gini(
+            y, scores, n_resamples=20, sample_weight=weights, batch_size=8
+        )
+    assert result.degenerate == 20
+    assert np.isnan(result.samples).all()
+    assert "20 of 20 resamples hold a single class" in caplog.text
@@ -158,7 +158,18 @@ import pytest
 import logging
 import io
 from unittest.mock import patch, MagicMock
-from src.utils.log_config import ElegantFormatter, setup_logging
+import json
+import queue
+import subprocess
+import sys
+from src.utils import log_config, metrics
+from src.utils.log_config import (
+    BoundedQueueHandler,
+    ElegantFormatter,
+    configure_worker_logging,
+    setup_logging,
+    worker_log_queue,
+)
 
 # Define a sample emoji map for testing
 TEST_EMOJI_MAP = {
@@ -257,6 +268,64 @@ class TestElegantFormatter:
         assert output.startswith(TEST_EMOJI_MAP["completed"])
         assert output == f"{TEST_EMOJI_MAP['completed']} {message}"
 
+    def test_record_is_not_modified(self, logger, log_capture_string):
+        """Verify that a second handler formatting the same record adds no emoji."""
+        formatter = ElegantFormatter(emoji_map=TEST_EMOJI_MAP)
+        logger.handlers[0].setFormatter(formatter)
+        second = logging.StreamHandler(log_capture_string)
+        second.setFormatter(formatter)
+        logger.addHandler(second)
+
+        message = "Starting data processing..."
+        logger.info(message)
+
+        lines = log_capture_string.getvalue().strip().splitlines()
+        assert lines == [f"{TEST_EMOJI_MAP['starting']} {message}"] * 2
+
+    def test_emoji_follows_map_order(self):
+        """Verify that the first keyword of the map wins, wherever it appears."""
+        formatter = ElegantFormatter(emoji_map=TEST_EMOJI_MAP)
+        record = logging.makeLogRecord(
+            {"msg": "error while completed step starting", "levelno": logging.INFO}
+        )
+        assert formatter.format(record).startswith(TEST_EMOJI_MAP["starting"])
+        assert record.msg == "error while completed step starting"
+
+    def test_emoji_with_template_arguments(self, logger, log_capture_string):
+        """Verify that templated messages are decorated and formatted once."""
+        formatter = ElegantFormatter(emoji_map=TEST_EMOJI_MAP)
+        logger.handlers[0].setFormatter(formatter)
+
+        logger.info("Completed %d files", 3)
+        logger.info("Completed %d files", 4)
+
+        lines = log_capture_string.getvalue().strip().splitlines()
+        assert lines == [
+            f"{TEST_EMOJI_MAP['completed']} Completed 3 files",
+            f"{TEST_EMOJI_MAP['completed']} Completed 4 files",
+        ]
+
+    def test_custom_info_format(self, logger, log_capture_string):
+        """Verify that the emoji is placed on the message within a custom format."""
+        formatter = ElegantFormatter(
+            info_fmt="[%(levelname)s] %(message)s", emoji_map=TEST_EMOJI_MAP
+        )
+        logger.handlers[0].setFormatter(formatter)
+
+        logger.info("Starting")
+
+        output = log_capture_string.getvalue().strip()
+        assert output == f"[INFO] {TEST_EMOJI_MAP['starting']} Starting"
+
+    def test_info_without_emoji_map(self, logger, log_capture_string):
+        """Verify INFO logs are left plain when no emoji map is given."""
+        logger.handlers[0].setFormatter(ElegantFormatter())
+
+        logger.info("Starting data processing...")
+
+        output = log_capture_string.getvalue().strip()
+        assert output == "Starting data processing..."
+
 
 class TestSetupLogging:
     """Tests for the setup_logging function."""
@@ -329,3 +398,196 @@ class TestSetupLogging:
             isinstance(h, logging.FileHandler) for h in root.handlers
         )
         assert not has_file_handler
+
+    def test_async_mode_uses_queue_handler(self):
+        """Verify asynchronous mode routes records through a listener thread."""
+        root = logging.getLogger()
+        stream = io.StringIO()
+        console = logging.StreamHandler(stream)
+        with patch("src.utils.log_config.logging.StreamHandler") as mock_stream:
+            mock_stream.return_value = console
+            listener = setup_logging(asynchronous=True, emoji_map=TEST_EMOJI_MAP)
+        try:
+            assert any(isinstance(h, BoundedQueueHandler) for h in root.handlers)
+            assert not any(
+                isinstance(h.formatter, ElegantFormatter) for h in root.handlers
+            )
+            assert worker_log_queue() is None
+            logging.getLogger("async").info("Processing starting")
+            logging.getLogger("async").debug("hidden")
+        finally:
+            log_config._stop_listener()
+        assert listener is not None
+        assert stream.getvalue() == "⏳ Processing starting\n"
+
+    def test_async_mode_returns_none_when_sync(self):
+        """Verify synchronous mode has no listener."""
+        assert setup_logging() is None
+
+    def test_multiprocess_mode_exposes_worker_queue(self):
+        """Verify the multiprocessing queue is handed out to workers."""
+        setup_logging(asynchronous=True, multiprocess=True, queue_size=10)
+        try:
+            assert worker_log_queue() is not None
+        finally:
+            log_config._stop_listener()
+        assert worker_log_queue() is None
+
+
+class TestBoundedQueueHandler:
+    """Tests for the overflow policies of BoundedQueueHandler."""
+
+    @staticmethod
+    def _record(message):
+        return logging.makeLogRecord({"msg": message, "levelno": logging.INFO})
+
+    def test_drop_discards_new_records(self):
+        log_queue = queue.Queue(1)
+        handler = BoundedQueueHandler(log_queue, overflow="drop")
+        handler.handle(self._record("first"))
+        handler.handle(self._record("second"))
+        assert log_queue.get_nowait().msg == "first"
+        assert handler.dropped == 1
+
+    def test_drop_oldest_keeps_new_records(self):
+        log_queue = queue.Queue(1)
+        handler = BoundedQueueHandler(log_queue, overflow="drop_oldest")
+        handler.handle(self._record("first"))
+        handler.handle(self._record("second"))
+        assert log_queue.get_nowait().msg == "second"
+        assert handler.dropped == 1
+
+    def test_block_enqueues(self):
+        log_queue = queue.Queue(2)
+        handler = BoundedQueueHandler(log_queue)
+        handler.handle(self._record("first"))
+        assert log_queue.qsize() == 1
+        assert handler.dropped == 0
+
+    def test_invalid_overflow(self):
+        with pytest.raises(ValueError, match="Overflow must be one of"):
+            BoundedQueueHandler(queue.Queue(), overflow="spill")
+
+    def test_configure_worker_logging(self):
+        root = logging.getLogger()
+        original_handlers, original_level = root.handlers[:], root.level
+        log_queue = queue.Queue()
+        try:
+            configure_worker_logging(log_queue, level=logging.INFO)
+            assert [type(h) for h in root.handlers] == [BoundedQueueHandler]
+            root.handlers[0].setLevel(logging.NOTSET)
+            logging.getLogger("worker").info("from worker")
+            logging.getLogger("worker").debug("filtered")
+        finally:
+            root.handlers = original_handlers
+            root.setLevel(original_level)
+        assert log_queue.get_nowait().getMessage() == "from worker"
+        assert log_queue.empty()
+
+
+class TestSetupLoggingIdempotence:
+    """Tests for repeated and keyed setup_logging calls."""
+
+    @pytest.fixture(autouse=True)
+    def reset_root_logger(self):
+        root = logging.getLogger()
+        original_handlers, original_level = root.handlers[:], root.level
+        root.handlers.clear()
+        yield
+        log_config._stop_listener()
+        log_config._installed.clear()
+        root.handlers = original_handlers
+        root.setLevel(original_level)
+
+    @staticmethod
+    def _handlers():
+        """Root handlers, without the capture handlers pytest adds."""
+        return [
+            h
+            for h in logging.getLogger().handlers
+            if type(h).__name__ != "LogCaptureHandler"
+        ]
+
+    def test_repeated_calls_do_not_stack(self):
+        setup_logging()
+        setup_logging(console_level=logging.WARNING)
+        assert len(self._handlers()) == 1
+        assert self._handlers()[0].level == logging.WARNING
+
+    def test_keys_are_independent(self):
+        setup_logging(key="console")
+        setup_logging(key="other")
+        setup_logging(key="console")
+        assert len(self._handlers()) == 2
+
+    def test_foreign_handlers_are_kept(self):
+        root = logging.getLogger()
+        foreign = logging.NullHandler()
+        root.addHandler(foreign)
+        setup_logging()
+        setup_logging()
+        assert root.handlers.count(foreign) == 1
+        assert len(self._handlers()) == 2
+
+    def test_switching_to_sync_stops_listener(self):
+        root = logging.getLogger()
+        listener = setup_logging(asynchronous=True)
+        setup_logging()
+        assert listener._thread is None
+        assert not any(isinstance(h, BoundedQueueHandler) for h in root.handlers)
+        assert len(self._handlers()) == 1
+
+    def test_new_listener_replaces_other_key(self):
+        root = logging.getLogger()
+        setup_logging(asynchronous=True, key="first")
+        setup_logging(asynchronous=True, key="second")
+        queue_handlers = [
+            h for h in root.handlers if isinstance(h, BoundedQueueHandler)
+        ]
+        assert len(queue_handlers) == 1
+        assert log_config._async_state["key"] == "second"
+
+
+def test_import_does_not_configure_logging():
+    """Importing the data modules must leave the root logger untouched."""
+    code = (
+        "import logging; import src.data_understanding.batch_conversion; "
+        "print(len(logging.getLogger().handlers))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert output.stdout.strip() == "0"
+
+
+def test_metrics_file_receives_json_lines(tmp_path):
+    """Metric records are written as JSON lines; other records are filtered."""
+    root = logging.getLogger()
+    original_handlers, original_level = root.handlers[:], root.level
+    metrics_file = tmp_path / "metrics.jsonl"
+    log_file = tmp_path / "detailed.log"
+    try:
+        setup_logging(
+            console_level=logging.CRITICAL,
+            log_file=str(log_file),
+            metrics_file=str(metrics_file),
+        )
+        logging.getLogger("plain").info("not a metric")
+        with metrics.stage("unit", source="x.csv") as current:
+            current.count("rows", 3)
+    finally:
+        log_config._remove_handlers(log_config.DEFAULT_KEY)
+        root.handlers = original_handlers
+        root.setLevel(original_level)
+
+    lines = metrics_file.read_text().splitlines()
+    assert len(lines) == 1
+    document = json.loads(lines[0])
+    assert document["event"] == "unit"
+    assert document["rows"] == 3
+    assert document["logger"] == "metrics"
+    assert "time" in document
+    # The detailed log keeps ordinary records but not the metric ones
+    detailed = log_file.read_text()
+    assert "not a metric" in detailed
+    assert "unit" not in detailed
@@ -0,0 +1,85 @@
+from pathlib import Path
+import numpy as np
+import pytest
+import tempfile
+import shutil
+from src.evaluation import gini
+from src.modeling import logistic
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def data():
+    """Features with one informative column, a constant and missing values."""
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(2_000, 3)).astype(np.float32)
+    target = (rng.random(2_000) < 1 / (1 + np.exp(-2 * features[:, 0]))).astype(np.int8)
+    features[:, 2] = 1.0
+    features[::7, 1] = np.nan
+    return features, target
+
+
+def test_fit_learns_informative_column(data):
+    """Test that the model ranks rows by the informative feature."""
+    features, target = data
+    model = logistic.fit(features, target, columns=["a", "b", "c"])
+
+    assert model.coef[0] == pytest.approx(2.0, abs=0.3)
+    assert abs(model.coef[1]) < 0.2
+    assert model.coef[2] == 0.0
+    scores = model.predict(features)
+    assert np.isfinite(scores).all()
+    assert gini.normalized_gini(target, scores) > 0.5
+
+
+def test_save_and_load_round_trip(data, temp_dir):
+    """Test that a saved model scores identically after loading."""
+    features, target = data
+    model = logistic.fit(features, target, columns=["a", "b", "c"])
+    model.save(temp_dir / "model.json")
+    loaded = logistic.LogisticModel.load(temp_dir / "model.json")
+
+    assert loaded.columns == ["a", "b", "c"]
+    np.testing.assert_allclose(loaded.predict(features), model.predict(features))
+
+
+def test_fit_predict_scores_validation_rows(data):
+    """Test that fit_predict returns one score per validation row."""
+    features, target = data
+    train, valid = np.arange(1_500), np.arange(1_500, 2_000)
+    scores = logistic.fit_predict(features, target, train, valid)
+    assert scores.shape == (500,)
+    expected = logistic.fit(features[:1_500], target[:1_500]).predict(features[1_500:])
+    np.testing.assert_allclose(scores, expected, rtol=1e-6)
+
+
+def test_fit_in_chunks_matches_one_block(data, temp_dir):
+    """Test that blockwise fitting on memmapped rows equals a single block."""
+    features, target = data
+    np.save(temp_dir / "features.npy", features)
+    shared = np.load(temp_dir / "features.npy", mmap_mode="r")
+    rows = np.flatnonzero(np.arange(2_000) % 3 != 0)
+
+    chunked = logistic.fit(shared, target, rows=rows, chunk_rows=97)
+    whole = logistic.fit(features[rows], target[rows], chunk_rows=len(rows))
+    selected = features[rows].astype(np.float64)
+    np.testing.assert_allclose(chunked.mean, np.nanmean(selected, axis=0))
+    np.testing.assert_allclose(chunked.scale[:2], np.nanstd(selected, axis=0)[:2])
+    np.testing.assert_allclose(chunked.coef, whole.coef, rtol=1e-8, atol=1e-10)
+    assert chunked.intercept == pytest.approx(whole.intercept)
+
+
+def test_fit_rejects_no_iterations(data):
+    """Test that max_iter must allow at least one Newton step."""
+    features, target = data
+    with pytest.raises(ValueError, match="max_iter"):
+        logistic.fit(features, target, max_iter=0)
+    with pytest.raises(ValueError, match="zero rows"):
+        logistic.fit(features, target, rows=np.array([], dtype=np.int64))
@@ -0,0 +1,128 @@
+import os
+from pathlib import Path
+import numpy as np
+import pytest
+import polars as pl
+import tempfile
+import shutil
+from benchmarks import synthetic
+from src.data_understanding import data_collection, matrix
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def train_csv(temp_dir):
+    """Write a synthetic train CSV."""
+    return synthetic.write_csv(temp_dir / "train.csv", 1_000, seed=5)
+
+
+def test_convert_data_exports_matrix(train_csv, temp_dir):
+    """Test that the exported arrays match the Parquet columns."""
+    output = temp_dir / "train.parquet"
+    data_collection.convert_data(train_csv, output, export_matrix=True)
+
+    loaded = matrix.load_matrix(output)
+    frame = pl.read_parquet(output)
+    assert isinstance(loaded.features, np.memmap)
+    assert loaded.features.flags.f_contiguous
+    assert loaded.features.dtype == np.float32
+    assert loaded.features.shape == (1_000, 57)
+    assert loaded.columns[0] == "ps_ind_01"
+    np.testing.assert_array_equal(loaded.target, frame["target"].to_numpy())
+    np.testing.assert_array_equal(loaded.ids, frame["id"].to_numpy())
+
+    column = loaded.columns.index("ps_reg_03")
+    expected = frame["ps_reg_03"].cast(pl.Float32).to_numpy()
+    np.testing.assert_array_equal(loaded.features[:, column], expected)
+    assert np.isnan(loaded.features[:, column]).any()
+    flag = loaded.columns.index("ps_ind_06_bin")
+    assert set(np.unique(loaded.features[:, flag])) <= {0.0, 1.0}
+
+
+def test_export_is_reused_when_current(train_csv, temp_dir):
+    """Test that an up-to-date export is skipped and a changed one redone."""
+    output = temp_dir / "train.parquet"
+    data_collection.convert_data(train_csv, output)
+    files = matrix.export_matrix(output)
+    mtime = os.stat(files.features).st_mtime_ns
+
+    assert matrix.export_matrix(output) == files
+    assert os.stat(files.features).st_mtime_ns == mtime
+
+    data_collection.convert_data(train_csv, output, export_matrix=True)
+    assert os.stat(files.features).st_mtime_ns == mtime
+
+    matrix.export_matrix(output, columns=["ps_car_13", "ps_reg_01"])
+    assert matrix.load_matrix(output).features.shape == (1_000, 2)
+
+
+def test_export_without_target(temp_dir):
+    """Test that the test split gets no target vector."""
+    csv_path = synthetic.write_csv(temp_dir / "test.csv", 100, include_target=False)
+    output = temp_dir / "test.parquet"
+    data_collection.convert_data(csv_path, output, export_matrix=True)
+    loaded = matrix.load_matrix(output)
+    assert loaded.target is None
+    assert not matrix.matrix_files(output).target.exists()
+
+
+def test_export_errors(train_csv, temp_dir):
+    """Test missing files, unknown columns and partitioned outputs."""
+    output = temp_dir / "train.parquet"
+    with pytest.raises(FileNotFoundError):
+        matrix.export_matrix(output)
+    with pytest.raises(FileNotFoundError, match="No matrix export"):
+        matrix.load_matrix(output)
+    with pytest.raises(ValueError, match="not partitions"):
+        data_collection.convert_data(
+            train_csv, output, partition_by="target", export_matrix=True
+        )
+    data_collection.convert_data(train_csv, output)
+    with pytest.raises(ValueError, match="Columns not found"):
+        matrix.export_matrix(output, columns=["nope"])
+
+
+def test_load_rejects_stale_export(train_csv, temp_dir):
+    """Test that arrays exported from an older version of the file are refused."""
+    output = temp_dir / "train.parquet"
+    data_collection.convert_data(train_csv, output, export_matrix=True)
+    pl.read_parquet(output).head(10).write_parquet(output)
+    with pytest.raises(ValueError, match="stale"):
+        matrix.load_matrix(output)
+    matrix.export_matrix(output)
+    assert matrix.load_matrix(output).features.shape[0] == 10
+
+
+def test_interrupted_export_is_not_loaded(train_csv, temp_dir, monkeypatch):
+    """Test that a forced export that fails midway leaves nothing to load."""
+    output = temp_dir / "train.parquet"
+    data_collection.convert_data(train_csv, output, export_matrix=True)
+
+    def fail(lf, files):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(matrix, "write_labels", fail)
+    with pytest.raises(OSError):
+        matrix.export_matrix(output, force=True)
+    with pytest.raises(FileNotFoundError, match="No matrix export"):
+        matrix.load_matrix(output)
+
+
+def test_reexport_keeps_mapped_arrays_intact(train_csv, temp_dir):
+    """Test that arrays mapped before a re-export can still be read."""
+    output = temp_dir / "train.parquet"
+    data_collection.convert_data(train_csv, output, export_matrix=True)
+    before = matrix.load_matrix(output)
+    expected = np.array(before.features[:, :2])
+
+    matrix.export_matrix(output, columns=["ps_car_13"], force=True)
+    np.testing.assert_array_equal(before.features[:, :2], expected)
+    assert matrix.load_matrix(output).features.shape == (1_000, 1)
+    assert not list(temp_dir.glob("*.tmp"))
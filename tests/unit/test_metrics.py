@@ -0,0 +1,56 @@
+import logging
+import pytest
+from src.utils import metrics
+
+
+@pytest.fixture
+def records(caplog):
+    """Capture metric records at DEBUG level."""
+    caplog.set_level(logging.DEBUG, logger=metrics.METRICS_LOGGER)
+    return caplog
+
+
+def test_stage_emits_timing_and_counters(records):
+    """Test that a stage reports its duration, memory and counters."""
+    with metrics.stage("load", source="a.csv") as current:
+        current.count("rows", 10)
+        current.count("rows", 5)
+        current.set(partitions=2)
+
+    (record,) = records.records
+    values = record.metrics
+    assert values["event"] == "load"
+    assert values["status"] == "ok"
+    assert values["rows"] == 15
+    assert values["partitions"] == 2
+    assert values["source"] == "a.csv"
+    assert values["seconds"] >= 0
+    assert values["peak_rss_mb"] > 0
+    assert "rows_per_second" in values
+
+
+def test_stage_records_errors(records):
+    """Test that a failing block is reported with an error status."""
+    with pytest.raises(RuntimeError):
+        with metrics.stage("fail"):
+            raise RuntimeError("boom")
+    assert records.records[0].metrics["status"] == "error"
+
+
+def test_timed_decorator(records):
+    """Test that decorated calls are measured and still return their result."""
+
+    @metrics.timed("square")
+    def square(value):
+        return value * value
+
+    assert square(4) == 16
+    assert records.records[0].metrics["event"] == "square"
+
+
+def test_emit_is_skipped_when_disabled(caplog):
+    """Test that nothing is built when the metrics logger is disabled."""
+    caplog.set_level(logging.INFO, logger=metrics.METRICS_LOGGER)
+    with metrics.stage("quiet"):
+        pass
+    assert not caplog.records
@@ -0,0 +1,112 @@
+from pathlib import Path
+import pytest
+import polars as pl
+import tempfile
+import shutil
+from src.data_understanding import data_collection, profiling
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def interim_parquet(temp_dir):
+    """Convert a small Porto Seguro-like CSV to an interim Parquet file."""
+    csv_path = temp_dir / "train.csv"
+    pl.DataFrame(
+        {
+            "id": [1, 2, 3, 4, 5, 6],
+            "target": [0, 0, 0, 0, 1, 1],
+            "ps_ind_01": [1, 2, 3, 4, -1, 6],
+            "ps_ind_06_bin": [0, 1, 1, 0, 1, 1],
+            "ps_reg_03": [0.5, -1, -1, 1.5, 2.0, -1],
+        }
+    ).write_csv(csv_path)
+    output_path = temp_dir / "train.parquet"
+    data_collection.convert_data(csv_path, output_path)
+    return output_path
+
+
+def _row(report, column, target=None):
+    if target is None:
+        rows = report.filter(pl.col("column") == column, pl.col("target").is_null())
+    else:
+        rows = report.filter(pl.col("column") == column, pl.col("target") == target)
+    return rows.row(0, named=True)
+
+
+def test_profile_overall_statistics(interim_parquet):
+    """Test overall missing rates, cardinalities and ranges."""
+    report = profiling.profile(interim_parquet)
+    assert set(report["column"]) == {"ps_ind_01", "ps_ind_06_bin", "ps_reg_03"}
+    row = _row(report, "ps_ind_01")
+    assert row["count"] == 6
+    assert row["missing"] == 1
+    assert row["missing_rate"] == pytest.approx(1 / 6)
+    assert row["n_unique"] == 5
+    assert (row["min"], row["max"], row["p50"]) == (1.0, 6.0, 3.0)
+    assert _row(report, "ps_reg_03")["missing"] == 3
+    assert _row(report, "ps_ind_06_bin")["mean"] == pytest.approx(4 / 6)
+
+
+def test_profile_per_target_class(interim_parquet):
+    """Test that statistics are split by target class."""
+    report = profiling.profile(interim_parquet)
+    assert len(report) == 3 * 3
+    negatives = _row(report, "ps_reg_03", target=0)
+    positives = _row(report, "ps_reg_03", target=1)
+    assert (negatives["count"], negatives["missing"]) == (4, 2)
+    assert (positives["count"], positives["missing"]) == (2, 1)
+
+
+def test_profile_kept_sentinel(temp_dir):
+    """Test that a -1 sentinel kept in the data counts as missing."""
+    lf = pl.LazyFrame({"ps_ind_01": [-1, 2, 4]})
+    row = _row(profiling.profile(lf), "ps_ind_01")
+    assert row["missing"] == 1
+    assert row["min"] == 2.0
+
+
+def test_profile_overall_only(interim_parquet):
+    """Test profiling selected columns without the per-class split."""
+    report = profiling.profile(interim_parquet, columns=["ps_ind_01"], by_target=False)
+    assert report["column"].to_list() == ["ps_ind_01"]
+    assert report["target"].to_list() == [None]
+
+
+def test_profile_file_cache(interim_parquet, temp_dir):
+    """Test that reports are cached against the file's content hash."""
+    cache_dir = temp_dir / "cache"
+    report = profiling.profile_file(interim_parquet, cache_dir=cache_dir)
+    cached = list(cache_dir.glob("train-*.parquet"))
+    assert len(cached) == 1
+    assert profiling.profile_file(interim_parquet, cache_dir=cache_dir).equals(report)
+    assert profiling.profile_file(interim_parquet).equals(report)
+
+    profiling.profile_file(interim_parquet, cache_dir=cache_dir, by_target=False)
+    assert len(list(cache_dir.glob("train-*.parquet"))) == 2
+
+
+def test_profile_file_missing(temp_dir):
+    """Test error when the file does not exist."""
+    with pytest.raises(FileNotFoundError, match="Input file does not exist"):
+        profiling.profile_file(temp_dir / "missing.parquet")
+
+
+@pytest.mark.parametrize("name", ["report.parquet", "report.json"])
+def test_write_report(interim_parquet, temp_dir, name):
+    """Test saving a report as Parquet or JSON."""
+    path = temp_dir / name
+    profiling.write_report(profiling.profile(interim_parquet), path)
+    assert path.exists()
+
+
+def test_write_report_invalid_suffix(interim_parquet, temp_dir):
+    """Test error for an unsupported report format."""
+    with pytest.raises(ValueError, match="Report must be"):
+        profiling.write_report(profiling.profile(interim_parquet), temp_dir / "r.csv")
@@ -0,0 +1,110 @@
+from pathlib import Path
+import numpy as np
+import pytest
+import polars as pl
+import tempfile
+import shutil
+from benchmarks import synthetic
+from src.data_understanding import data_collection, sampling
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def train_parquet(temp_dir):
+    """Convert a synthetic train CSV to Parquet."""
+    csv = synthetic.write_csv(temp_dir / "train.csv", 5_000, seed=11)
+    output = temp_dir / "train.parquet"
+    data_collection.convert_data(csv, output)
+    return output
+
+
+def test_stratified_keeps_class_shares(train_parquet):
+    """Test that each class is sampled at the same rate with matching weights."""
+    full = pl.read_parquet(train_parquet)
+    sample = sampling.stratified(pl.scan_parquet(train_parquet), 0.1).collect()
+
+    for label in (0, 1):
+        size = (full["target"] == label).sum()
+        rows = sample.filter(pl.col("target") == label)
+        assert rows.height == max(1, round(0.1 * size))
+        assert rows["sample_weight"].sum() == pytest.approx(size, rel=1e-5)
+    assert sample.columns == [*full.columns, "sample_weight"]
+    assert sample["id"].is_unique().all()
+
+
+def test_stratified_is_deterministic_and_nested(train_parquet):
+    """Test that a seed fixes the sample and larger fractions contain smaller."""
+    lf = pl.scan_parquet(train_parquet)
+    small = sampling.stratified(lf, 0.1, seed=4).collect()["id"]
+    again = sampling.stratified(lf, 0.1, seed=4).collect()["id"]
+    large = sampling.stratified(lf, 0.3, seed=4).collect()["id"]
+    other = sampling.stratified(lf, 0.1, seed=5).collect()["id"]
+
+    assert small.sort().to_list() == again.sort().to_list()
+    assert small.is_in(large.implode()).all()
+    assert set(small) != set(other)
+
+
+def test_downsample_negatives_keeps_positives(train_parquet):
+    """Test that all positives are kept and negatives are reweighted."""
+    full = pl.read_parquet(train_parquet)
+    sample = sampling.downsample_negatives(
+        pl.scan_parquet(train_parquet), 0.2
+    ).collect()
+
+    positives = sample.filter(pl.col("target") == 1)
+    negatives = sample.filter(pl.col("target") == 0)
+    assert positives.height == (full["target"] == 1).sum()
+    assert (positives["sample_weight"] == 1).all()
+    assert (negatives["sample_weight"] == 5).all()
+    assert negatives.height == pytest.approx(
+        0.2 * (full["target"] == 0).sum(), rel=0.15
+    )
+
+
+def test_recalibrate_inverts_downsampling():
+    """Test that recalibration restores the full-data probability."""
+    true = np.array([0.01, 0.036, 0.5])
+    odds = true / (1 - true) / 0.25
+    downsampled = odds / (1 + odds)
+    np.testing.assert_allclose(sampling.recalibrate(downsampled, 0.25), true)
+
+
+def test_sample_file_is_cached(train_parquet, temp_dir):
+    """Test that a sample is written once per parameters and source content."""
+    cache = temp_dir / "samples"
+    first = sampling.sample_file(train_parquet, cache, fraction=0.1, seed=1)
+    mtime = first.stat().st_mtime_ns
+
+    assert sampling.sample_file(train_parquet, cache, fraction=0.1, seed=1) == first
+    assert first.stat().st_mtime_ns == mtime
+    other = sampling.sample_file(
+        train_parquet, cache, method="downsample", fraction=0.1
+    )
+    assert other != first
+    assert "downsample-f0.1-s0" in other.name
+    assert pl.read_parquet(first).height == pytest.approx(500, abs=2)
+
+
+def test_sample_file_rejects_invalid_input(train_parquet, temp_dir):
+    """Test the errors of sample_file."""
+    with pytest.raises(FileNotFoundError):
+        sampling.sample_file(temp_dir / "missing.parquet", temp_dir)
+    with pytest.raises(ValueError, match="Method"):
+        sampling.sample_file(train_parquet, temp_dir, method="reservoir")
+    with pytest.raises(ValueError, match="Fraction"):
+        sampling.sample_file(train_parquet, temp_dir, fraction=0)
+    with pytest.raises(ValueError, match="Negative rate"):
+        sampling.sample_file(train_parquet, temp_dir, method="downsample", fraction=2)
+    pl.read_parquet(train_parquet).drop("target").write_parquet(
+        temp_dir / "test.parquet"
+    )
+    with pytest.raises(ValueError, match="target"):
+        sampling.sample_file(temp_dir / "test.parquet", temp_dir)
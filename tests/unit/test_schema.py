@@ -0,0 +1,91 @@
+import polars as pl
+import pytest
+from src.data_understanding import schema
+
+
+def test_expected_columns_layout():
+    """Test the train and test headers of the registry."""
+    train = schema.expected_columns()
+    test = schema.expected_columns(include_target=False)
+    assert len(train) == 59
+    assert len(test) == 58
+    assert train[:2] == ["id", "target"]
+    assert "target" not in test
+
+
+@pytest.mark.parametrize(
+    "name, family",
+    [
+        ("id", "id"),
+        ("target", "target"),
+        ("ps_ind_06_bin", "bin"),
+        ("ps_car_11_cat", "cat"),
+        ("ps_reg_03", "continuous"),
+        ("ps_car_11", "ordinal"),
+        ("ps_calc_14", "ordinal"),
+        ("policy_month", None),
+    ],
+)
+def test_column_family(name, family):
+    """Test that column names map to their family."""
+    assert schema.column_family(name) == family
+
+
+def test_parse_and_storage_schema():
+    """Test parsing and storage dtypes for a mixed header."""
+    columns = ["id", "ps_ind_06_bin", "ps_car_13", "other"]
+    assert schema.parse_schema(columns) == {
+        "id": pl.Int32,
+        "ps_ind_06_bin": pl.Int8,
+        "ps_car_13": pl.Float32,
+    }
+    assert schema.storage_schema(columns)["ps_ind_06_bin"] == pl.Boolean
+
+
+def test_check_columns_unknown():
+    """Test that an unknown column is rejected."""
+    with pytest.raises(ValueError, match="Unknown columns"):
+        schema.check_columns(schema.expected_columns() + ["other"])
+
+
+def test_check_columns_test_split():
+    """Test that a header without the target passes."""
+    schema.check_columns(schema.expected_columns(include_target=False))
+
+
+def test_read_header(tmp_path):
+    """Test that the header is read from the first line only."""
+    path = tmp_path / "data.csv"
+    path.write_text('"id",target,ps_ind_01\r\n1,0,2\n')
+    assert schema.read_header(path) == ["id", "target", "ps_ind_01"]
+
+
+def test_strict_casts_check_flags_and_category_levels():
+    """Test that strict casting rejects unknown flags and category levels."""
+    columns = ["ps_ind_06_bin", "ps_ind_02_cat", "ps_ind_01"]
+    valid = pl.DataFrame(
+        {"ps_ind_06_bin": [0, 1], "ps_ind_02_cat": [4, -1], "ps_ind_01": [3, -5]},
+        schema=dict.fromkeys(columns, pl.Int8),
+    )
+    cast = valid.with_columns(schema.cast_expressions(columns, strict=True))
+    assert cast["ps_ind_06_bin"].to_list() == [False, True]
+    assert cast["ps_ind_02_cat"].to_list() == [4, -1]
+    # Ordinals are only checked by their parsing dtype
+    assert cast["ps_ind_01"].to_list() == [3, -5]
+
+    unknown_level = valid.with_columns(pl.lit(5, dtype=pl.Int8).alias("ps_ind_02_cat"))
+    with pytest.raises(pl.exceptions.InvalidOperationError):
+        unknown_level.with_columns(schema.cast_expressions(columns, strict=True))
+    # Non-strict casting leaves category levels alone
+    relaxed = unknown_level.with_columns(schema.cast_expressions(columns))
+    assert relaxed["ps_ind_02_cat"].to_list() == [5, 5]
+
+
+def test_invalid_flag_counts():
+    """Test that only flags other than 0, 1 and -1 are counted."""
+    frame = pl.DataFrame(
+        {"ps_ind_06_bin": [0, 1, -1, None, 2, 7], "ps_ind_01": [9] * 6},
+        schema={"ps_ind_06_bin": pl.Int8, "ps_ind_01": pl.Int8},
+    )
+    counts = frame.select(schema.invalid_flag_counts(frame.columns))
+    assert counts.to_dicts() == [{"ps_ind_06_bin": 2}]
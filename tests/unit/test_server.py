@@ -0,0 +1,239 @@
+import http.client
+import json
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+import numpy as np
+import polars as pl
+import pytest
+from benchmarks import synthetic
+from src.data_preparation import features
+from src.data_understanding import data_collection, matrix
+from src.deployment import batch_scoring, server
+from src.modeling import logistic
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture(params=["onehot", "target"])
+def artifacts(request, temp_dir):
+    """Save a feature plan and model, and return raw test records."""
+    processed = temp_dir / "processed"
+    processed.mkdir()
+    train_csv = synthetic.write_csv(temp_dir / "train.csv", 600, seed=1)
+    test_csv = synthetic.write_csv(
+        temp_dir / "test.csv", 200, seed=2, include_target=False
+    )
+    data_collection.convert_data(train_csv, temp_dir / "train.parquet")
+    data_collection.convert_data(test_csv, temp_dir / "test.parquet")
+    outputs = features.build_features(
+        temp_dir / "train.parquet", processed, encoding=request.param
+    )
+    matrix.export_matrix(outputs["train"])
+    train = matrix.load_matrix(outputs["train"])
+    model = logistic.fit(train.features, train.target, columns=train.columns)
+    model.save(temp_dir / "model.json")
+
+    records = pl.read_csv(test_csv).to_dicts()
+    scorer = batch_scoring.Scorer.load(processed, temp_dir / "model.json")
+    expected = scorer.score(pl.read_parquet(temp_dir / "test.parquet"))
+    return processed, temp_dir / "model.json", records, expected["target"].to_numpy()
+
+
+@pytest.fixture
+def service(artifacts):
+    """A loaded scoring service, closed after the test."""
+    plan_path, model_path, _, _ = artifacts
+    service = server.ScoringService.load(plan_path, model_path, max_wait_ms=1.0)
+    yield service
+    service.close()
+
+
+def test_encoder_matches_batch_pipeline(artifacts, service):
+    """Test that the NumPy path scores raw records like the Polars pipeline."""
+    _, _, records, expected = artifacts
+    np.testing.assert_allclose(service.score(records), expected, rtol=1e-5)
+    single = [service.score([record])[0] for record in records[:20]]
+    np.testing.assert_allclose(single, expected[:20], rtol=1e-5)
+
+
+def test_encoder_treats_sentinels_and_nulls_as_missing(artifacts, service):
+    """Test that -1, null and out-of-domain flags encode the same way."""
+    _, _, records, _ = artifacts
+    record = dict(records[0])
+    flag = next(name for name in service.encoder.inputs if name.endswith("_bin"))
+    category = next(name for name in service.encoder.inputs if name.endswith("_cat"))
+    variants = [
+        {**record, "ps_reg_03": -1, flag: -1, category: -1},
+        {**record, "ps_reg_03": None, flag: None, category: None},
+        {**record, "ps_reg_03": None, flag: 7, category: None},
+    ]
+    encoded = service.encoder.encode(variants)
+    np.testing.assert_array_equal(encoded[0], encoded[1])
+    np.testing.assert_array_equal(encoded[0], encoded[2])
+
+
+def test_encoder_rejects_invalid_records(service):
+    """Test that malformed records raise ValueError."""
+    with pytest.raises(ValueError, match="Missing feature columns"):
+        service.encoder.encode([{"id": 1}])
+    with pytest.raises(ValueError, match="JSON object"):
+        service.encoder.encode([[1, 2]])
+    record = {name: 0 for name in service.encoder.inputs}
+    with pytest.raises(ValueError, match="ps_reg_03 must be a number"):
+        service.encoder.encode([{**record, "ps_reg_03": "high"}])
+
+
+@pytest.mark.parametrize(
+    "column, value, message",
+    [
+        ("ps_car_01_cat", 2.7, "must be an integer"),
+        ("ps_car_01_cat", "3", "must be an integer"),
+        ("ps_ind_06_bin", True, "must be an integer"),
+        ("ps_reg_03", "0.5", "must be a number"),
+        ("ps_ind_01", 200, "out of range"),
+        ("ps_car_11_cat", -129, "out of range"),
+    ],
+)
+def test_encoder_applies_batch_parsing_rules(service, column, value, message):
+    """Test that values the batch path cannot parse are rejected."""
+    record = {name: 0 for name in service.encoder.inputs}
+    with pytest.raises(ValueError, match=message):
+        service.encoder.encode([{**record, column: value}])
+    # Integers are valid continuous values, and flags outside {0, 1} missing
+    valid = {**record, "ps_reg_03": 1, "ps_ind_06_bin": 7, "ps_car_13": 0.5}
+    assert service.encoder.encode([valid]).shape == (1, len(service.encoder.columns))
+
+
+def test_encoder_rejects_unknown_model_columns(artifacts):
+    """Test that a model trained on other features is rejected."""
+    plan_path, _, _, _ = artifacts
+    with pytest.raises(ValueError, match="not produced by the plan"):
+        server.RecordEncoder(features.load_plan(plan_path), ["other"])
+
+
+def test_micro_batcher_groups_concurrent_requests(artifacts):
+    """Test that concurrent requests share model calls and keep their order."""
+    plan_path, model_path, records, expected = artifacts
+    service = server.ScoringService.load(
+        plan_path, model_path, max_batch_size=64, max_wait_ms=50.0
+    )
+    results = [None] * 40
+    barrier = threading.Barrier(40)
+
+    def call(index):
+        barrier.wait()
+        results[index] = service.score([records[index]])[0]
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    service.close()
+
+    np.testing.assert_allclose(results, expected[:40], rtol=1e-5)
+    assert service.batcher.rows == 40
+    assert service.batcher.batches < 40
+
+
+def test_micro_batcher_propagates_errors():
+    """Test that a failing prediction fails every request of its batch."""
+    model = logistic.LogisticModel(["a"], np.zeros(1), np.ones(1), np.zeros(1), 0.0)
+    batcher = server.MicroBatcher(model, max_wait_ms=0)
+    future = batcher.submit(np.zeros((1, 3)))
+    with pytest.raises(ValueError):
+        future.result(timeout=5)
+    batcher.close()
+    with pytest.raises(ValueError, match="Batch size"):
+        server.MicroBatcher(model, max_batch_size=0)
+
+
+def test_latency_tracker_percentiles():
+    """Test the latency summary of the tracker."""
+    tracker = server.LatencyTracker(window=100)
+    assert tracker.summary()["p50_ms"] is None
+    for millisecond in range(1, 201):
+        tracker.record(millisecond / 1000)
+    summary = tracker.summary()
+    assert summary["requests"] == 200
+    assert summary["p50_ms"] == pytest.approx(150.5)
+    assert summary["p99_ms"] == pytest.approx(199.01)
+    assert summary["max_ms"] == 200
+
+
+def request(port, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    connection.request(method, path, body=body, headers=headers or {})
+    response = connection.getresponse()
+    document = json.loads(response.read())
+    connection.close()
+    return response.status, document
+
+
+def test_http_endpoints(artifacts, service):
+    """Test scoring, metrics, health and errors over HTTP."""
+    _, _, records, expected = artifacts
+    httpd = server.make_server(service, port=0)
+    port = httpd.server_address[1]
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        status, single = request(port, "POST", "/score", json.dumps(records[0]))
+        assert status == 200
+        assert single["id"] == records[0]["id"]
+        assert single["target"] == pytest.approx(expected[0], rel=1e-5)
+
+        status, many = request(port, "POST", "/score", json.dumps(records[:5]))
+        assert [p["id"] for p in many] == [r["id"] for r in records[:5]]
+
+        assert request(port, "POST", "/score", json.dumps({"id": 1}))[0] == 400
+        assert request(port, "POST", "/score", "not json")[0] == 400
+        assert request(port, "POST", "/score", "3")[0] == 400
+        assert request(port, "POST", "/other", "{}")[0] == 404
+        assert request(port, "GET", "/other")[0] == 404
+        big = json.dumps([records[0]] * 2_000)
+        assert request(port, "POST", "/score", big)[0] == 400
+        for length in ("-1", "ten"):
+            status, error = request(
+                port, "POST", "/score", "{}", headers={"Content-Length": length}
+            )
+            assert status == 400
+            assert "Content-Length" in error["error"]
+        assert request(port, "GET", "/health") == (200, {"status": "ok"})
+
+        status, metrics = request(port, "GET", "/metrics")
+        assert metrics["requests"] == 2
+        assert metrics["p99_ms"] >= metrics["p50_ms"] > 0
+        assert metrics["batches"] >= 1
+        assert metrics["mean_batch_rows"] >= 1
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_http_model_failure_returns_500(service, monkeypatch, caplog):
+    """Test that an unexpected scoring error is logged and answered with 500."""
+
+    def fail(records):
+        raise RuntimeError("model exploded")
+
+    monkeypatch.setattr(service, "score", fail)
+    httpd = server.make_server(service, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        status, error = request(httpd.server_address[1], "POST", "/score", "{}")
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    assert status == 500
+    assert error == {"error": "Scoring failed"}
+    assert "model exploded" in caplog.text
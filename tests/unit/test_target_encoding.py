@@ -0,0 +1,155 @@
+from pathlib import Path
+import pytest
+import polars as pl
+import tempfile
+import shutil
+from benchmarks import synthetic
+from src.data_preparation import features, target_encoding
+from src.data_understanding import data_collection
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def train_parquet(temp_dir):
+    """Convert a synthetic train CSV to an interim Parquet file."""
+    csv_path = synthetic.write_csv(temp_dir / "train.csv", 3_000, seed=3)
+    output = temp_dir / "train.parquet"
+    data_collection.convert_data(csv_path, output)
+    return output
+
+
+def _naive_out_of_fold(frame: pl.DataFrame, column: str, n_folds, seed, smoothing):
+    """Recompute the out-of-fold encoding fold by fold from the raw rows."""
+    frame = frame.with_columns(
+        target_encoding.fold_expression(n_folds, seed),
+        level=pl.col(column).fill_null(-1),
+    )
+    parts = []
+    for fold in range(n_folds):
+        rest = frame.filter(pl.col("fold") != fold)
+        prior = rest["target"].mean()
+        rates = rest.group_by("level").agg(
+            encoded=(pl.col("target").sum() + prior * smoothing)
+            / (pl.len() + smoothing)
+        )
+        parts.append(
+            frame.filter(pl.col("fold") == fold)
+            .join(rates, on="level", how="left")
+            .select("id", pl.col("encoded").fill_null(prior))
+        )
+    return pl.concat(parts).sort("id")
+
+
+def test_fit_counts_every_row_once_per_column(train_parquet):
+    """Test that the grouped pass counts each row once per column and fold."""
+    fold_stats = target_encoding.fit(train_parquet, n_folds=4, seed=1)
+    stats = fold_stats.stats
+    assert stats["fold"].n_unique() == 4
+    per_column = stats.group_by("column").agg(pl.col("count").sum())
+    assert per_column["count"].to_list() == [3_000] * len(per_column)
+    assert set(stats["column"]) == {name for name in synthetic.CATEGORY_LEVELS}
+
+
+def test_out_of_fold_matches_naive(train_parquet):
+    """Test that subtraction from the totals matches refitting per fold."""
+    fold_stats = target_encoding.fit(train_parquet, n_folds=5, seed=7)
+    (expression,) = target_encoding.out_of_fold_expressions(
+        fold_stats, smoothing=10.0, columns=["ps_car_11_cat"]
+    )
+    frame = pl.read_parquet(train_parquet)
+    encoded = frame.select("id", expression).sort("id")
+    expected = _naive_out_of_fold(frame, "ps_car_11_cat", 5, 7, 10.0)
+    difference = (encoded["ps_car_11_cat_te"] - expected["encoded"]).abs().max()
+    assert difference < 1e-6
+
+
+def test_noise_is_bounded_and_reproducible(train_parquet):
+    """Test that the noise stays within its amplitude and is deterministic."""
+    fold_stats = target_encoding.fit(train_parquet)
+    frame = pl.read_parquet(train_parquet)
+    plain = frame.select(
+        target_encoding.out_of_fold_expressions(fold_stats, columns=["ps_car_01_cat"])
+    )
+    noisy = [
+        frame.select(
+            target_encoding.out_of_fold_expressions(
+                fold_stats, noise=0.1, columns=["ps_car_01_cat"]
+            )
+        )
+        for _ in range(2)
+    ]
+    ratio = noisy[0].to_series() / plain.to_series()
+    assert ratio.min() >= 0.9 - 1e-6 and ratio.max() <= 1.1 + 1e-6
+    assert ratio.std() > 0
+    assert noisy[0].equals(noisy[1])
+
+
+def test_full_encodings_for_test_split(train_parquet):
+    """Test that the test-time encodings use all folds."""
+    fold_stats = target_encoding.fit(train_parquet)
+    encodings, prior = target_encoding.encodings(fold_stats, smoothing=0.0)
+    frame = pl.read_parquet(train_parquet)
+    assert prior == pytest.approx(frame["target"].mean())
+    rates = frame.group_by("ps_car_04_cat").agg(pl.col("target").mean())
+    for level, rate in rates.iter_rows():
+        assert encodings["ps_car_04_cat"][level] == pytest.approx(rate)
+
+
+def test_fit_file_uses_cache(train_parquet, temp_dir, monkeypatch):
+    """Test that cached statistics are reused for an unchanged file."""
+    cache_dir = temp_dir / "cache"
+    first = target_encoding.fit_file(train_parquet, cache_dir, n_folds=3, seed=2)
+    assert len(list(cache_dir.glob("train-*-target-k3-s2.parquet"))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("statistics were recomputed")
+
+    monkeypatch.setattr(target_encoding, "fit", fail)
+    second = target_encoding.fit_file(train_parquet, cache_dir, n_folds=3, seed=2)
+    assert second.stats.equals(first.stats)
+    assert (second.n_folds, second.seed) == (3, 2)
+
+
+def test_fit_file_without_cache(train_parquet):
+    """Test fitting without a cache directory."""
+    fold_stats = target_encoding.fit_file(train_parquet)
+    assert fold_stats.n_folds == 5
+
+
+def test_fit_errors(train_parquet, temp_dir):
+    """Test invalid fold counts, missing targets and missing files."""
+    with pytest.raises(ValueError, match="At least two folds"):
+        target_encoding.fit(train_parquet, n_folds=1)
+    with pytest.raises(ValueError, match="needs the target column"):
+        target_encoding.fit(pl.scan_parquet(train_parquet).drop("target"))
+    with pytest.raises(FileNotFoundError):
+        target_encoding.fit_file(temp_dir / "missing.parquet")
+
+
+def test_build_features_encodes_train_out_of_fold(train_parquet, temp_dir):
+    """Test that build_features encodes train out of fold and caches the stats."""
+    output_dir = temp_dir / "processed"
+    output_dir.mkdir()
+    test_path = temp_dir / "test.parquet"
+    pl.read_parquet(train_parquet).drop("target").write_parquet(test_path)
+
+    outputs = features.build_features(
+        train_parquet, output_dir, test_paths=[test_path], encoding="target"
+    )
+    train = pl.read_parquet(outputs["train"]).sort("id")
+    test = pl.read_parquet(outputs["test"]).sort("id")
+    # Same rows: only the train split is encoded out of fold
+    assert not train["ps_car_11_cat_te"].equals(test["ps_car_11_cat_te"])
+    assert len(list(output_dir.glob("train-*-target-k5-s0.parquet"))) == 1
+
+    plan = features.load_plan(output_dir)
+    assert (plan.n_folds, plan.seed) == (5, 0)
+    again = features.transform(train_parquet, plan).collect().sort("id")
+    assert again["ps_car_11_cat_te"].equals(test["ps_car_11_cat_te"])
@@ -0,0 +1,184 @@
+import gzip
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+import polars as pl
+import pytest
+from benchmarks import synthetic
+from src.data_understanding import data_collection, schema, validation
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for test files."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def frame():
+    """A valid synthetic train frame with -1 sentinels."""
+    return synthetic.make_frame(2_000, seed=7)
+
+
+def write(frame: pl.DataFrame, path: Path) -> Path:
+    frame.write_csv(path)
+    return path
+
+
+def test_valid_file_passes(frame, temp_dir):
+    """Test that a well-formed extract passes, gzipped or not."""
+    path = write(frame, temp_dir / "train.csv")
+    report = validation.validate(path, expected_rows=2_000, chunk_size=20_000)
+    assert report.passed
+    assert report.complete
+    assert report.rows == 2_000
+    assert report.columns == schema.expected_columns()
+
+    compressed = temp_dir / "train.csv.gz"
+    with open(path, "rb") as source, gzip.open(compressed, "wb") as target:
+        shutil.copyfileobj(source, target)
+    assert validation.validate(compressed).passed
+
+    test = write(frame.drop("target"), temp_dir / "test.csv")
+    assert validation.validate(test).passed
+
+
+def test_header_problems_stop_before_the_body(frame, temp_dir):
+    """Test that missing and unknown columns are reported without a scan."""
+    path = write(
+        frame.drop("ps_car_13").with_columns(extra=pl.lit(1)), temp_dir / "bad.csv"
+    )
+    with patch.object(data_collection, "iter_csv_batches") as batches:
+        report = validation.validate(path)
+    batches.assert_not_called()
+    assert not report.complete
+    assert report.violations == [
+        "Missing expected columns: ['ps_car_13']",
+        "Unknown columns: ['extra']",
+    ]
+
+
+def test_duplicated_header_columns():
+    """Test that a repeated column name is reported."""
+    columns = schema.expected_columns() + ["ps_reg_01"]
+    assert validation.header_violations(columns) == [
+        "Duplicated columns: ['ps_reg_01']"
+    ]
+
+
+@pytest.mark.parametrize(
+    "column, value, message",
+    [
+        ("ps_ind_06_bin", 2, "values of ps_ind_06_bin outside {0, 1, -1}"),
+        ("ps_car_04_cat", 12, "values of ps_car_04_cat outside 0..9 or -1"),
+        ("ps_ind_01", -3, "values of ps_ind_01 outside non-negative integers or -1"),
+        ("ps_reg_03", -0.5, "values of ps_reg_03 outside non-negative or -1"),
+        ("target", 2, "values of target outside {0, 1}"),
+        ("id", -4, "values of id outside non-negative integers"),
+        ("ps_car_13", None, "empty values of ps_car_13"),
+    ],
+)
+def test_domain_violations(frame, temp_dir, column, value, message):
+    """Test that out-of-domain and empty values are reported."""
+    dtype = pl.Float64 if column in schema.CONTINUOUS_COLUMNS else pl.Int64
+    broken = frame.with_columns(
+        pl.when(pl.col("id") == 1500)
+        .then(pl.lit(value, dtype=dtype))
+        .otherwise(pl.col(column).cast(dtype))
+        .alias(column)
+    )
+    report = validation.validate(write(broken, temp_dir / "train.csv"))
+    assert len(report.violations) == 1
+    assert message in report.violations[0]
+    assert report.violations[0].startswith("1 ")
+
+
+def test_fail_fast_stops_at_first_bad_batch(frame, temp_dir):
+    """Test that the scan stops early unless every problem is wanted."""
+    broken = frame.with_columns(
+        pl.when(pl.col("id") % 500 == 0)
+        .then(5)
+        .otherwise(pl.col("ps_ind_06_bin"))
+        .alias("ps_ind_06_bin")
+    )
+    path = write(broken, temp_dir / "train.csv")
+
+    report = validation.validate(path, chunk_size=50_000)
+    assert not report.complete
+    assert len(report.violations) == 1
+    assert report.rows < 2_000
+
+    report = validation.validate(path, fail_fast=False, chunk_size=50_000)
+    assert report.complete
+    assert report.rows == 2_000
+    assert len(report.violations) > 1
+
+
+def test_duplicate_ids_and_row_counts(frame, temp_dir):
+    """Test that duplicate ids across batches and wrong row counts are reported."""
+    duplicated = pl.concat([frame, frame.head(3)])
+    path = write(duplicated, temp_dir / "train.csv")
+    report = validation.validate(path, chunk_size=1_000_000)
+    assert report.violations == ["Duplicate ids in rows 1-2,003"]
+
+    report = validation.validate(path, chunk_size=50_000)
+    assert report.violations == ["3 duplicate ids, e.g. [0, 1, 2]"]
+
+    path = write(frame, temp_dir / "train.csv")
+    report = validation.validate(path, expected_rows=10)
+    assert report.violations == ["Expected 10 rows, found 2,000"]
+    empty = write(frame.head(0), temp_dir / "empty.csv")
+    assert validation.validate(empty).violations == ["No data rows"]
+
+
+def test_unparseable_values(frame, temp_dir):
+    """Test that text in a numeric column is reported instead of raised."""
+    broken = frame.with_columns(
+        pl.when(pl.col("id") == 10)
+        .then(pl.lit("abc"))
+        .otherwise(pl.col("ps_ind_01").cast(pl.String))
+        .alias("ps_ind_01")
+    )
+    report = validation.validate(write(broken, temp_dir / "train.csv"))
+    assert not report.complete
+    assert report.violations[0].startswith("Unparseable values after row 0")
+
+
+def test_validate_file_caches_reports(frame, temp_dir):
+    """Test that an unchanged file reuses its cached report."""
+    path = write(frame, temp_dir / "train.csv")
+    cache = temp_dir / "cache"
+    first = validation.validate_file(path, cache_dir=cache)
+    assert (cache / "train.csv.validation.json").exists()
+
+    with patch.object(validation, "validate") as revalidate:
+        assert validation.validate_file(path, cache_dir=cache) == first
+    revalidate.assert_not_called()
+
+    # Other options and changed content are validated again
+    assert not validation.validate_file(path, cache_dir=cache, expected_rows=5).passed
+    write(frame.head(10), path)
+    assert validation.validate_file(path, cache_dir=cache).rows == 10
+    with pytest.raises(FileNotFoundError):
+        validation.validate_file(temp_dir / "missing.csv")
+    with pytest.raises(FileNotFoundError):
+        validation.validate(temp_dir / "missing.csv")
+
+
+def test_convert_data_validates_first(frame, temp_dir):
+    """Test that convert_data refuses an invalid extract before converting."""
+    broken = frame.with_columns(pl.col("ps_ind_06_bin").replace(1, 3))
+    path = write(broken, temp_dir / "train.csv")
+    output = temp_dir / "train.parquet"
+    with pytest.raises(ValueError, match="Validation of train.csv failed"):
+        data_collection.convert_data(path, output, validate=True)
+    assert not output.exists()
+
+    write(frame, path)
+    assert data_collection.convert_data(path, output, validate=True)
+    assert (temp_dir / "train.csv.validation.json").exists()
+    with pytest.raises(ValueError, match="standard input"):
+        data_collection.convert_data("-", output, validate=True)